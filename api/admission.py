@@ -0,0 +1,285 @@
+"""Bounded admission control with priority lanes for ``/ask`` traffic.
+
+Interactive chat and batch/eval traffic share the same OpenAI and Postgres
+capacity. The controller caps in-flight requests per lane and overall, queues
+the excess with a per-lane wait limit, and always dispatches queued interactive
+requests before batch ones. When a queue is full or a request waits too long the
+caller is shed immediately with a 503 instead of piling onto the backends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, Request, status
+
+from atticus.logging import log_event
+from core.config import AppSettings
+
+from .dependencies import LoggerDep, SettingsDep
+
+INTERACTIVE_LANE = "interactive"
+BATCH_LANE = "batch"
+LANE_HEADER = "X-Atticus-Lane"
+LANE_PRIORITY: tuple[str, ...] = (INTERACTIVE_LANE, BATCH_LANE)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, lane: str, reason: str, retry_after: int) -> None:
+        super().__init__(f"{lane} lane rejected request ({reason})")
+        self.lane = lane
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class LaneLimits:
+    max_in_flight: int
+    max_queue: int
+    queue_timeout_seconds: float
+
+
+@dataclass(slots=True)
+class _LaneState:
+    limits: LaneLimits
+    in_flight: int = 0
+    waiters: deque[asyncio.Future[None]] = field(default_factory=deque)
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.limits.max_in_flight,
+            "queued": sum(1 for waiter in self.waiters if not waiter.done()),
+            "max_queue": self.limits.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait_ms / self.admitted, 2) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+class AdmissionController:
+    """Per-lane in-flight limits and bounded wait queues for one event loop."""
+
+    def __init__(self, *, max_in_flight: int, lanes: dict[str, LaneLimits]) -> None:
+        self.max_in_flight = max_in_flight
+        self._lanes = {name: _LaneState(limits) for name, limits in lanes.items()}
+        self._order = [name for name in LANE_PRIORITY if name in self._lanes] + [
+            name for name in self._lanes if name not in LANE_PRIORITY
+        ]
+
+    @property
+    def config(self) -> tuple[object, ...]:
+        return (
+            self.max_in_flight,
+            tuple((name, state.limits) for name, state in self._lanes.items()),
+        )
+
+    def resolve_lane(self, requested: str | None) -> str:
+        lane = (requested or "").strip().lower()
+        return lane if lane in self._lanes else INTERACTIVE_LANE
+
+    async def acquire(self, lane: str) -> float:
+        """Wait for a slot in ``lane``; return the queue wait in milliseconds."""
+
+        state = self._lanes[lane]
+        if self._can_start(lane) and not self._queued_ahead(lane):
+            self._start(state)
+            self._record_wait(state, 0.0)
+            return 0.0
+
+        if self._queue_depth(state) >= state.limits.max_queue:
+            state.rejected += 1
+            raise AdmissionRejected(lane, "queue_full", self._retry_after(state))
+
+        started = time.monotonic()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        try:
+            async with asyncio.timeout(state.limits.queue_timeout_seconds):
+                await waiter
+        except TimeoutError:
+            if not self._granted(waiter):
+                self._discard(state, waiter)
+                state.timed_out += 1
+                raise AdmissionRejected(lane, "queue_timeout", self._retry_after(state)) from None
+        except asyncio.CancelledError:
+            if self._granted(waiter):
+                self.release(lane)
+            else:
+                self._discard(state, waiter)
+            raise
+
+        wait_ms = (time.monotonic() - started) * 1000
+        self._record_wait(state, wait_ms)
+        return wait_ms
+
+    def release(self, lane: str) -> None:
+        state = self._lanes[lane]
+        state.in_flight = max(0, state.in_flight - 1)
+        self._dispatch()
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        lanes = {name: self._lanes[name].snapshot() for name in self._order}
+        lanes["total"] = {
+            "in_flight": self._total_in_flight(),
+            "max_in_flight": self.max_in_flight,
+            "queued": sum(lane["queued"] for lane in lanes.values()),
+        }
+        return lanes
+
+    def _total_in_flight(self) -> int:
+        return sum(state.in_flight for state in self._lanes.values())
+
+    def _can_start(self, lane: str) -> bool:
+        state = self._lanes[lane]
+        return (
+            state.in_flight < state.limits.max_in_flight
+            and self._total_in_flight() < self.max_in_flight
+        )
+
+    def _queued_ahead(self, lane: str) -> bool:
+        """True when a queued request must be served before a new one in ``lane``.
+
+        That is any waiter in the same lane, or waiters in a higher-priority lane that
+        only the global limit holds back. A higher lane stopped by its own cap cannot
+        use a free slot, so it does not block lower lanes.
+        """
+
+        for name in self._order:
+            state = self._lanes[name]
+            if name == lane:
+                return bool(self._queue_depth(state))
+            if self._queue_depth(state) and not self._lane_full(state):
+                return True
+        return False
+
+    def _dispatch(self) -> None:
+        for name in self._order:
+            state = self._lanes[name]
+            while state.waiters and self._can_start(name):
+                waiter = state.waiters.popleft()
+                if waiter.done():
+                    continue
+                self._start(state)
+                waiter.set_result(None)
+            if self._queue_depth(state) and not self._lane_full(state):
+                # Waiters held back by the global limit get the next free slot, so lower
+                # lanes must not overtake them.
+                return
+
+    @staticmethod
+    def _lane_full(state: _LaneState) -> bool:
+        return state.in_flight >= state.limits.max_in_flight
+
+    def _start(self, state: _LaneState) -> None:
+        state.in_flight += 1
+        state.admitted += 1
+
+    def _discard(self, state: _LaneState, waiter: asyncio.Future[None]) -> None:
+        try:
+            state.waiters.remove(waiter)
+        except ValueError:
+            pass
+        waiter.cancel()
+
+    @staticmethod
+    def _granted(waiter: asyncio.Future[None]) -> bool:
+        return waiter.done() and not waiter.cancelled()
+
+    @staticmethod
+    def _queue_depth(state: _LaneState) -> int:
+        return sum(1 for waiter in state.waiters if not waiter.done())
+
+    @staticmethod
+    def _record_wait(state: _LaneState, wait_ms: float) -> None:
+        state.total_wait_ms += wait_ms
+        state.max_wait_ms = max(state.max_wait_ms, wait_ms)
+
+    @staticmethod
+    def _retry_after(state: _LaneState) -> int:
+        return max(1, math.ceil(state.limits.queue_timeout_seconds))
+
+
+def admission_limits(settings: AppSettings) -> tuple[int, dict[str, LaneLimits]]:
+    return settings.admission_max_in_flight, {
+        INTERACTIVE_LANE: LaneLimits(
+            max_in_flight=settings.admission_interactive_max_in_flight,
+            max_queue=settings.admission_interactive_max_queue,
+            queue_timeout_seconds=settings.admission_interactive_queue_timeout_seconds,
+        ),
+        BATCH_LANE: LaneLimits(
+            max_in_flight=settings.admission_batch_max_in_flight,
+            max_queue=settings.admission_batch_max_queue,
+            queue_timeout_seconds=settings.admission_batch_queue_timeout_seconds,
+        ),
+    }
+
+
+def build_admission_controller(settings: AppSettings) -> AdmissionController:
+    max_in_flight, lanes = admission_limits(settings)
+    return AdmissionController(max_in_flight=max_in_flight, lanes=lanes)
+
+
+def get_admission_controller(request: Request, settings: AppSettings) -> AdmissionController:
+    """Return the app-wide controller, rebuilding it when the limits change."""
+
+    max_in_flight, lanes = admission_limits(settings)
+    controller = getattr(request.app.state, "admission", None)
+    if controller is None or controller.config != (max_in_flight, tuple(lanes.items())):
+        controller = AdmissionController(max_in_flight=max_in_flight, lanes=lanes)
+        request.app.state.admission = controller
+    return controller
+
+
+async def admit_ask_request(
+    request: Request,
+    settings: SettingsDep,
+    logger: LoggerDep,
+) -> AsyncIterator[None]:
+    """Route dependency holding an admission slot for the lifetime of the request."""
+
+    if not settings.admission_control_enabled:
+        yield
+        return
+
+    controller = get_admission_controller(request, settings)
+    lane = controller.resolve_lane(request.headers.get(LANE_HEADER))
+    request_id = getattr(request.state, "request_id", "unknown")
+    try:
+        wait_ms = await controller.acquire(lane)
+    except AdmissionRejected as exc:
+        log_event(
+            logger,
+            "admission_rejected",
+            request_id=request_id,
+            trace_id=getattr(request.state, "trace_id", request_id),
+            lane=exc.lane,
+            reason=exc.reason,
+            retry_after=exc.retry_after,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is busy. Please retry shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+    request.state.admission_lane = lane
+    request.state.queue_wait_ms = round(wait_ms, 2)
+    try:
+        yield
+    finally:
+        controller.release(lane)
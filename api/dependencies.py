@@ -11,9 +11,19 @@ from atticus.metrics import MetricsRecorder
 from core.config import AppSettings, load_settings
 
 
+class _EnsuredDirectories:
+    """Remember which settings instance already had its directories created."""
+
+    settings: AppSettings | None = None
+
+
 def get_settings() -> AppSettings:
     settings = load_settings()
-    settings.ensure_directories()
+    # load_settings returns the same instance until a source changes, so the
+    # mkdir calls only run once per (re)load instead of once per dependency.
+    if _EnsuredDirectories.settings is not settings:
+        settings.ensure_directories()
+        _EnsuredDirectories.settings = settings
     return settings
 
 
@@ -42,7 +52,11 @@ class _MetricsSingleton:
         return metrics
 
 
-def get_metrics(settings: SettingsDep) -> MetricsRecorder:
+def get_metrics(request: Request, settings: SettingsDep) -> MetricsRecorder:
+    # Prefer the recorder the middleware writes to so admin views see live data.
+    metrics = getattr(request.app.state, "metrics", None)
+    if isinstance(metrics, MetricsRecorder):
+        return metrics
     return _MetricsSingleton.get(settings)
 
 
@@ -71,3 +85,10 @@ def require_admin_token(request: Request, settings: SettingsDep) -> None:
 
 
 AdminGuard = Annotated[None, Depends(require_admin_token)]
+
+
+def is_admin_request(request: Request, settings: AppSettings) -> bool:
+    """Return whether the request carries the configured admin token, without raising."""
+
+    token = getattr(settings, "admin_api_token", None)
+    return bool(token) and request.headers.get("X-Admin-Token") == token
@@ -50,6 +50,7 @@ def _build_response(
     error: str,
     detail: str,
     fields: dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
 ) -> JSONResponse:
     request_id = getattr(request.state, "request_id", "unknown")
     trace_id = getattr(request.state, "trace_id", request_id)
@@ -59,7 +60,7 @@ def _build_response(
         request_id=request_id,
         fields=fields,
     ).model_dump(exclude_none=True)
-    response = JSONResponse(status_code=status_code, content=payload)
+    response = JSONResponse(status_code=status_code, content=payload, headers=headers)
     response.headers["X-Request-ID"] = request_id
     response.headers["X-Trace-ID"] = trace_id
     return response
@@ -84,6 +85,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
         status_code=exc.status_code,
         error=error_code,
         detail=detail,
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -11,9 +11,11 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from atticus.logging import configure_logging
+from atticus.logging import configure_logging, flush_logging
 from atticus.metrics import MetricsRecorder
+from atticus.openai_client import reset_openai_clients
 
+from .admission import build_admission_controller
 from .dependencies import get_settings
 from .errors import (
     http_exception_handler,
@@ -21,9 +23,10 @@ from .errors import (
     validation_exception_handler,
 )
 from .middleware import RequestContextMiddleware
-from .rate_limit import RateLimiter
+from .rate_limit import build_rate_limiter
 from .routes import admin, chat, contact, eval, health, ingest, ui
 from .security import TrustedGatewayMiddleware
+from .warmup import Warmup
 
 
 @asynccontextmanager
@@ -34,20 +37,26 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.settings = settings
     app.state.logger = logger
     app.state.metrics = metrics
-    app.state.rate_limiter = RateLimiter(
-        limit=settings.rate_limit_requests,
-        window_seconds=settings.rate_limit_window_seconds,
-    )
+    app.state.rate_limiter = build_rate_limiter(settings)
+    app.state.admission = build_admission_controller(settings)
     # Warn when critical secrets are missing (non-fatal in dev/test)
     if not (settings.openai_api_key or "").strip():
         logger.warning(
             "OPENAI_API_KEY not set; embeddings/generation may fail",
             extra={"extra_payload": {"env": ".env", "key": "OPENAI_API_KEY"}},
         )
+    # Warm caches off the event loop; /ready flips once this finishes.
+    app.state.warmup = Warmup(settings, logger)
+    app.state.warmup.start()
     try:
         yield
     finally:
+        app.state.warmup.stop()
         metrics.flush()
+        metrics.withdraw()
+        app.state.rate_limiter.close()
+        reset_openai_clients()
+        flush_logging()
 
 
 def _load_version() -> str:
@@ -5,49 +5,57 @@ from __future__ import annotations
 import hashlib
 import time
 import uuid
-from collections.abc import Awaitable, Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from atticus.logging import log_error, log_event
+from atticus.stages import collect_stages
+from atticus.tracing import start_trace
 from core.config import load_settings
 
-from .rate_limit import RateLimiter
+from .rate_limit import build_rate_limiter, rate_limiter_matches
 
 
-class RequestContextMiddleware(BaseHTTPMiddleware):
-    """Attach a request ID to each call and emit structured logs."""
+class RequestContextMiddleware:
+    """Attach a request ID to each call and emit structured logs.
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    Implemented as pure ASGI middleware so response bodies (including SSE streams)
+    pass straight through without the task and stream wrapping of
+    ``BaseHTTPMiddleware``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
         request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
         trace_id = request.headers.get("X-Trace-ID") or request_id
         request.state.request_id = request_id
         request.state.trace_id = trace_id
 
         start = time.perf_counter()
-        logger = getattr(request.app.state, "logger", None)
+        app_state = request.app.state
+        logger = getattr(app_state, "logger", None)
 
-        limiter = getattr(request.app.state, "rate_limiter", None)
+        # load_settings() is a stat-only cache hit unless a source changed, so the
+        # limiter is only rebuilt when the configured limit or window actually differs.
         settings = load_settings()
-        if (
-            limiter is None
-            or limiter.limit != settings.rate_limit_requests
-            or limiter.window_seconds != settings.rate_limit_window_seconds
-        ):
-            limiter = RateLimiter(
-                limit=settings.rate_limit_requests,
-                window_seconds=settings.rate_limit_window_seconds,
-            )
-            request.app.state.rate_limiter = limiter
-        request.app.state.settings = settings
+        limiter = getattr(app_state, "rate_limiter", None)
+        if limiter is None or not rate_limiter_matches(limiter, settings):
+            if limiter is not None:
+                limiter.close()
+            limiter = build_rate_limiter(settings)
+            app_state.rate_limiter = limiter
+        app_state.settings = settings
 
-        decision = None
         if request.method != "OPTIONS":
             identifier = (
                 request.headers.get("X-User-ID")
@@ -80,12 +88,50 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Limit": str(limiter.limit),
                     "X-RateLimit-Remaining": "0",
                 }
-                return JSONResponse(payload, status_code=429, headers=headers)
+                response = JSONResponse(payload, status_code=429, headers=headers)
+                await response(scope, receive, send)
+                return
             request.state.rate_limit_limit = limiter.limit
             request.state.rate_limit_remaining = decision.remaining
 
+        status_code = 500
+
+        async def send_with_context(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Trace-ID"] = trace_id
+                limit_value = getattr(request.state, "rate_limit_limit", limiter.limit)
+                headers["X-RateLimit-Limit"] = str(limit_value)
+                remaining_value = getattr(request.state, "rate_limit_remaining", None)
+                if remaining_value is not None:
+                    headers["X-RateLimit-Remaining"] = str(max(0, remaining_value))
+                profile_id = getattr(request.state, "profile_id", None)
+                if profile_id is not None:
+                    headers["X-Atticus-Profile-Id"] = profile_id
+            await send(message)
+
         try:
-            response = await call_next(request)
+            with (
+                start_trace(
+                    f"{request.method} {request.url.path}",
+                    trace_id=trace_id,
+                    settings=settings,
+                    logger=logger,
+                    **{"http.method": request.method, "http.target": request.url.path},
+                ) as root_span,
+                collect_stages() as stage_timings,
+            ):
+                try:
+                    await self.app(scope, receive, send_with_context)
+                finally:
+                    if root_span is not None:
+                        route_path = getattr(scope.get("route"), "path", None)
+                        if route_path:
+                            root_span.name = f"{request.method} {route_path}"
+                        root_span.set(**{"http.status_code": status_code})
         except Exception as exc:  # pragma: no cover - runtime error path
             if logger is not None:
                 log_error(
@@ -100,15 +146,6 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raise
 
         elapsed_ms = (time.perf_counter() - start) * 1000
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Trace-ID"] = trace_id
-        if limiter is not None:
-            limit_value = getattr(request.state, "rate_limit_limit", limiter.limit)
-            response.headers["X-RateLimit-Limit"] = str(limit_value)
-            remaining_value = getattr(request.state, "rate_limit_remaining", None)
-            if remaining_value is not None:
-                response.headers["X-RateLimit-Remaining"] = str(max(0, remaining_value))
-
         if logger is not None:
             log_event(
                 logger,
@@ -117,11 +154,15 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
                 trace_id=trace_id,
                 method=request.method,
                 path=request.url.path,
-                status=response.status_code,
+                status=status_code,
                 latency_ms=round(elapsed_ms, 2),
             )
 
-        metrics = getattr(request.app.state, "metrics", None)
+        metrics = getattr(app_state, "metrics", None)
+        if metrics is not None:
+            # Label by route template (not raw path) to keep the series bounded.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics.record_request(route, elapsed_ms, stage_timings.durations_ms)
         if (
             metrics is not None
             and request.url.path == "/ask"
@@ -138,5 +179,3 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
                 answer_tokens=int(answer_tokens) if answer_tokens is not None else 0,
                 logger=logger,
             )
-
-        return response
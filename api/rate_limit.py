@@ -1,10 +1,22 @@
-"""Simple in-memory rate limiter for API requests."""
+"""GCRA rate limiter for API requests.
+
+Each identifier is tracked by a single theoretical arrival time (TAT), so memory is
+O(1) per key regardless of the limit. A key whose TAT has passed carries no state
+worth keeping and is evicted by a periodic sweep. The optional SQLite (WAL) store
+keeps TATs in a file shared by every worker on the host, so ``RATE_LIMIT_REQUESTS``
+holds across uvicorn workers instead of multiplying by the worker count.
+"""
 
 from __future__ import annotations
 
+import math
+import sqlite3
+import threading
 import time
-from collections import deque
 from dataclasses import dataclass, field
+from pathlib import Path
+
+from core.config import AppSettings
 
 
 @dataclass(slots=True)
@@ -14,26 +26,52 @@ class RateLimitDecision:
     retry_after: int | None = None
 
 
+def _gcra(
+    tat: float | None, now: float, limit: int, window: float
+) -> tuple[RateLimitDecision, float | None]:
+    """Return the decision and the new TAT (``None`` when the request is rejected)."""
+
+    interval = window / limit
+    new_tat = max(tat if tat is not None else now, now) + interval
+    backlog = new_tat - now
+    if backlog > window:
+        retry_after = max(1, math.ceil(backlog - window))
+        return RateLimitDecision(allowed=False, remaining=0, retry_after=retry_after), None
+    # Small epsilon keeps float drift from under-reporting a whole request.
+    remaining = max(0, int((window - backlog) / interval + 1e-9))
+    return RateLimitDecision(allowed=True, remaining=remaining), new_tat
+
+
 @dataclass(slots=True)
 class RateLimiter:
     limit: int
     window_seconds: int
     blocked: int = 0
-    _buckets: dict[str, deque[float]] = field(default_factory=dict)
+    evicted: int = 0
+    _buckets: dict[str, float] = field(default_factory=dict)
+    _next_sweep: float = 0.0
+
+    @property
+    def store_path(self) -> Path | None:
+        return None
 
     def allow(self, key: str) -> RateLimitDecision:
         now = time.monotonic()
-        bucket = self._buckets.setdefault(key, deque())
-        cutoff = now - self.window_seconds
-        while bucket and bucket[0] <= cutoff:
-            bucket.popleft()
-        if len(bucket) >= self.limit:
+        if now >= self._next_sweep:
+            self._sweep(now)
+        decision, new_tat = _gcra(self._buckets.get(key), now, self.limit, self.window_seconds)
+        if new_tat is None:
             self.blocked += 1
-            retry_after = int(max(1, round(bucket[0] + self.window_seconds - now)))
-            return RateLimitDecision(allowed=False, remaining=0, retry_after=retry_after)
-        bucket.append(now)
-        remaining = max(0, self.limit - len(bucket))
-        return RateLimitDecision(allowed=True, remaining=remaining)
+        else:
+            self._buckets[key] = new_tat
+        return decision
+
+    def _sweep(self, now: float) -> None:
+        idle = [key for key, tat in self._buckets.items() if tat <= now]
+        for key in idle:
+            del self._buckets[key]
+        self.evicted += len(idle)
+        self._next_sweep = now + self.window_seconds
 
     def snapshot(self) -> dict[str, int]:
         return {
@@ -41,8 +79,136 @@ class RateLimiter:
             "window_seconds": self.window_seconds,
             "active_keys": len(self._buckets),
             "blocked": self.blocked,
+            "evicted": self.evicted,
+            "shared": 0,
         }
 
     def reset(self) -> None:
         self.blocked = 0
+        self.evicted = 0
         self._buckets.clear()
+        self._next_sweep = 0.0
+
+    def close(self) -> None:
+        return None
+
+
+class SharedRateLimiter:
+    """GCRA limiter whose TATs live in a SQLite WAL file shared across workers.
+
+    Each decision is one ``BEGIN IMMEDIATE`` read-modify-write, so concurrent
+    workers serialise on the row update. Wall-clock time is used because
+    ``time.monotonic`` is not comparable between processes.
+    """
+
+    def __init__(self, *, limit: int, window_seconds: int, path: Path) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.blocked = 0
+        self.evicted = 0
+        self._path = path
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit (
+                key TEXT PRIMARY KEY,
+                tat REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+
+    @property
+    def store_path(self) -> Path | None:
+        return self._path
+
+    def allow(self, key: str) -> RateLimitDecision:
+        with self._lock:
+            now = time.time()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now >= self._next_sweep:
+                    self._sweep(now)
+                row = conn.execute("SELECT tat FROM rate_limit WHERE key = ?", (key,)).fetchone()
+                decision, new_tat = _gcra(
+                    float(row[0]) if row else None, now, self.limit, self.window_seconds
+                )
+                if new_tat is not None:
+                    conn.execute(
+                        "INSERT INTO rate_limit (key, tat) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                        (key, new_tat),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if new_tat is None:
+                self.blocked += 1
+            return decision
+
+    def _sweep(self, now: float) -> None:
+        cursor = self._conn.execute("DELETE FROM rate_limit WHERE tat <= ?", (now,))
+        self.evicted += max(0, cursor.rowcount)
+        self._next_sweep = now + self.window_seconds
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            (active,) = self._conn.execute("SELECT COUNT(*) FROM rate_limit").fetchone()
+        return {
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+            "active_keys": int(active),
+            "blocked": self.blocked,
+            "evicted": self.evicted,
+            "shared": 1,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limit")
+            self.blocked = 0
+            self.evicted = 0
+            self._next_sweep = 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _store_path(settings: AppSettings) -> Path | None:
+    path = getattr(settings, "rate_limit_store_path", None)
+    return Path(path).resolve() if path else None
+
+
+def rate_limiter_matches(limiter: RateLimiter | SharedRateLimiter, settings: AppSettings) -> bool:
+    """Return whether ``limiter`` was built for the current rate-limit settings."""
+
+    return (
+        limiter.limit == settings.rate_limit_requests
+        and limiter.window_seconds == settings.rate_limit_window_seconds
+        and limiter.store_path == _store_path(settings)
+    )
+
+
+def build_rate_limiter(settings: AppSettings) -> RateLimiter | SharedRateLimiter:
+    """Create the limiter selected by ``RATE_LIMIT_STORE_PATH`` (in-memory when unset)."""
+
+    path = _store_path(settings)
+    if path is None:
+        return RateLimiter(
+            limit=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window_seconds,
+        )
+    return SharedRateLimiter(
+        limit=settings.rate_limit_requests,
+        window_seconds=settings.rate_limit_window_seconds,
+        path=path,
+    )
@@ -3,13 +3,26 @@
 import json
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse
 
-from atticus.logging import log_event
+from atticus.circuit_breaker import circuit_breaker_snapshot
+from atticus.glossary import reset_glossary_cache
+from atticus.log_store import LogQuery, get_log_store
+from atticus.logging import log_event, logging_queue_stats
+from retriever.answer_cache import get_answer_cache
+from retriever.query_splitter import ANSWER_FLIGHTS
 
-from ..dependencies import AdminGuard, LoggerDep, MetricsDep, SettingsDep
+from ..admission import admit_ask_request
+from ..dependencies import (
+    AdminGuard,
+    LoggerDep,
+    MetricsDep,
+    SettingsDep,
+    require_admin_token,
+)
 from ..schemas import (
+    AskRequest,
     DictionaryEntry,
     DictionaryPayload,
     ErrorLogEntry,
@@ -17,6 +30,8 @@ from ..schemas import (
     EvalSeedPayload,
     MetricsDashboard,
     MetricsHistogram,
+    ProfileResponse,
+    QueryProfileReport,
     SessionLogEntry,
     SessionLogResponse,
 )
@@ -28,6 +43,7 @@ from ..utils import (
     save_dictionary,
     save_eval_seeds,
 )
+from .chat import ask_endpoint
 
 router = APIRouter(prefix="/admin")
 
@@ -52,6 +68,8 @@ async def write_dictionary(
         settings.dictionary_path,
         [entry.model_dump(by_alias=True) for entry in payload.entries],
     )
+    # mtime alone can miss a rewrite within the filesystem's timestamp granularity.
+    reset_glossary_cache()
     log_event(logger, "dictionary_updated", entries=len(payload.entries))
     return payload
 
@@ -98,29 +116,56 @@ async def write_eval_seeds(
     return EvalSeedPayload(seeds=payload.seeds)
 
 
+def _parse_window_bound(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid ISO timestamp") from exc
+
+
+def _entry_timestamp(entry: dict[str, object]) -> float | None:
+    try:
+        return datetime.fromisoformat(str(entry.get("time") or entry.get("timestamp"))).timestamp()
+    except ValueError:
+        return None
+
+
+def _in_window(entry: dict[str, object], since: float | None, until: float | None) -> bool:
+    if since is None and until is None:
+        return True
+    timestamp = _entry_timestamp(entry)
+    if timestamp is None:
+        return False
+    return (since is None or timestamp >= since) and (until is None or timestamp <= until)
+
+
 @router.get("/errors", response_model=list[ErrorLogEntry])
 async def get_errors(
     _: AdminGuard,
     settings: SettingsDep,
+    *,
     since: str | None = Query(default=None, description="Return errors since ISO timestamp"),
+    until: str | None = Query(default=None, description="Return errors up to ISO timestamp"),
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0, description="Skip this many newer errors (pagination)"),
 ) -> list[ErrorLogEntry]:
-    entries = load_error_logs(settings.errors_path, limit=100)
+    since_ts = _parse_window_bound(since)
+    until_ts = _parse_window_bound(until)
+    store = get_log_store(settings)
+    if store is not None:
+        entries = store.errors(LogQuery(since=since_ts, until=until_ts, limit=limit, offset=offset))
+    else:
+        entries = [
+            entry
+            for entry in load_error_logs(settings.errors_path, limit=limit + offset)
+            if _in_window(entry, since_ts, until_ts)
+        ]
+        entries = entries[: len(entries) - offset] if offset else entries
     filtered: list[ErrorLogEntry] = []
-    cutoff = None
-    if since:
-        try:
-            cutoff = datetime.fromisoformat(since)
-        except ValueError as exc:
-            raise HTTPException(status_code=400, detail="Invalid ISO timestamp") from exc
     for entry in entries:
         timestamp = entry.get("time") or entry.get("timestamp")
-        if cutoff and timestamp:
-            try:
-                entry_time = datetime.fromisoformat(str(timestamp))
-            except ValueError:
-                continue
-            if entry_time < cutoff:
-                continue
         filtered.append(
             ErrorLogEntry(
                 time=str(timestamp),
@@ -173,9 +218,26 @@ async def get_sessions(
     _: AdminGuard,
     settings: SettingsDep,
     format: str = Query("json", pattern="^(json|html)$", description="Return JSON or HTML"),
+    *,
     limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0, description="Skip this many newer sessions (pagination)"),
+    since: str | None = Query(default=None, description="Only sessions since ISO timestamp"),
+    until: str | None = Query(default=None, description="Only sessions up to ISO timestamp"),
 ) -> SessionLogResponse | HTMLResponse:
-    entries = load_session_logs(settings.logs_path, limit=limit)
+    since_ts = _parse_window_bound(since)
+    until_ts = _parse_window_bound(until)
+    store = get_log_store(settings)
+    if store is not None:
+        entries = store.sessions(
+            LogQuery(since=since_ts, until=until_ts, limit=limit, offset=offset)
+        )
+    else:
+        entries = [
+            entry
+            for entry in load_session_logs(settings.logs_path, limit=limit + offset)
+            if _in_window(entry, since_ts, until_ts)
+        ]
+        entries = entries[: len(entries) - offset] if offset else entries
     if format.lower() == "html":
         html = _render_session_html(entries)
         return HTMLResponse(html)
@@ -187,15 +249,19 @@ async def get_sessions(
 async def get_metrics_dashboard(
     _: AdminGuard,
     metrics: MetricsDep,
+    settings: SettingsDep,
     request: Request,
 ) -> MetricsDashboard:
     data = metrics.dashboard()
+    quantiles = metrics.quantile_summary()
     histogram = [
         MetricsHistogram(bucket=bucket, count=int(count))
         for bucket, count in data.get("latency_histogram", {}).items()
     ]
     limiter = getattr(request.app.state, "rate_limiter", None)
     rate_limit = limiter.snapshot() if limiter else None
+    answer_cache = get_answer_cache(settings)
+    admission = getattr(request.app.state, "admission", None)
     return MetricsDashboard(
         queries=int(data.get("queries", 0)),
         avg_confidence=float(data.get("avg_confidence", 0.0)),
@@ -205,4 +271,76 @@ async def get_metrics_dashboard(
         histogram=histogram,
         recent_trace_ids=list(data.get("recent_trace_ids", [])),
         rate_limit=rate_limit,
+        answer_cache=answer_cache.snapshot() if answer_cache else None,
+        coalescing=ANSWER_FLIGHTS.snapshot(),
+        admission=admission.snapshot() if admission else None,
+        circuit_breakers=circuit_breaker_snapshot() or None,
+        logging=logging_queue_stats(),
+        routes=quantiles["routes"] or None,
+        stages=quantiles["stages"] or None,
+    )
+
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_prometheus_metrics(_: AdminGuard, metrics: MetricsDep) -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.prometheus_text(), media_type="text/plain; version=0.0.4; charset=utf-8"
     )
+
+
+_PROFILE_ID = Path(pattern=r"^[0-9a-f]{32}$")
+
+
+def _load_profile_report(settings: SettingsDep, profile_id: str) -> QueryProfileReport:
+    report_path = settings.profile_output_dir / f"{profile_id}.json"
+    if not report_path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return QueryProfileReport(**json.loads(report_path.read_text(encoding="utf-8")))
+
+
+# Profiled runs take an ``/ask`` admission slot, after the admin check, so they cannot
+# bypass the limits and unauthenticated calls never queue.
+@router.post(
+    "/profile",
+    response_model=ProfileResponse,
+    dependencies=[Depends(require_admin_token), Depends(admit_ask_request)],
+)
+async def profile_ask(
+    _: AdminGuard,
+    payload: AskRequest,
+    request: Request,
+    settings: SettingsDep,
+    logger: LoggerDep,
+    *,
+    profiler: str = Query("sample", pattern="^(sample|cprofile)$"),
+) -> ProfileResponse:
+    """Run one ``/ask`` under a profiler and return the answer with its profile."""
+
+    request.state.profile_requested = profiler
+    answer = await ask_endpoint(payload, request, settings, logger)
+    report = getattr(request.state, "profile", None)
+    if report is None:
+        raise HTTPException(
+            status_code=409,
+            detail="The question needs model clarification; nothing was profiled.",
+        )
+    return ProfileResponse(answer=answer, profile=QueryProfileReport(**report.to_dict()))
+
+
+@router.get("/profile/{profile_id}", response_model=QueryProfileReport)
+async def get_profile(
+    _: AdminGuard, settings: SettingsDep, profile_id: str = _PROFILE_ID
+) -> QueryProfileReport:
+    return _load_profile_report(settings, profile_id)
+
+
+@router.get("/profile/{profile_id}/artifact", response_class=FileResponse)
+async def get_profile_artifact(
+    _: AdminGuard, settings: SettingsDep, profile_id: str = _PROFILE_ID
+) -> FileResponse:
+    report = _load_profile_report(settings, profile_id)
+    suffix = {"collapsed": ".collapsed", "pstats": ".prof"}.get(report.artifact_format or "")
+    artifact = settings.profile_output_dir / f"{profile_id}{suffix}" if suffix else None
+    if artifact is None or not artifact.exists():
+        raise HTTPException(status_code=404, detail="Profile artifact not found.")
+    return FileResponse(artifact, filename=artifact.name, media_type="application/octet-stream")
@@ -2,18 +2,24 @@
 
 import re
 import time
+import uuid
 from collections.abc import Iterable, Sequence
+from functools import partial
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 
-from atticus.glossary import find_glossary_hits, load_glossary_entries
+from atticus.glossary import find_glossary_hits, load_glossary_matcher
 from atticus.logging import log_event
+from atticus.profiling import PROFILERS, SAMPLE_PROFILER, ProfileReport, profile_call
 from atticus.tokenization import count_tokens, truncate_text
+from retriever.deadline import Deadline
 from retriever.models import Citation
 from retriever.query_splitter import run_rag_for_each
 from retriever.resolver import ModelResolution, ModelScope, resolve_models
 
-from ..dependencies import LoggerDep, SettingsDep
+from ..admission import admit_ask_request
+from ..dependencies import LoggerDep, SettingsDep, is_admin_request
 from ..schemas import (
     AskAnswer,
     AskRequest,
@@ -27,6 +33,7 @@ from ..schemas import (
 router = APIRouter()
 _Q_PLACEHOLDERS = {"string", "test", "example"}
 _Q_MIN_LEN = 4
+PROFILE_HEADER = "X-Atticus-Profile"
 _CLARIFICATION_MESSAGE = "Which model are you referring to? If you like, I can provide a list of product families that I can assist with."
 
 
@@ -89,6 +96,8 @@ def _build_answer_payloads(
     payload: AskRequest,
     settings: SettingsDep,
     logger: LoggerDep,
+    *,
+    deadline: Deadline | None = None,
 ) -> list[AskAnswer]:
     query_answers = run_rag_for_each(
         question=question,
@@ -98,6 +107,7 @@ def _build_answer_payloads(
         filters=payload.filters or {},
         top_k=payload.top_k,
         context_hints=payload.context_hints or [],
+        deadline=deadline,
     )
     answers: list[AskAnswer] = []
     for item in query_answers:
@@ -114,6 +124,7 @@ def _build_answer_payloads(
                 family=getattr(answer, "family", scope.family_id or None),
                 family_label=getattr(answer, "family_label", scope.family_label or None),
                 sources=ask_sources,
+                degraded=bool(getattr(answer, "degraded", False)),
             )
         )
     return answers
@@ -150,7 +161,19 @@ def _clarification_response(resolution: ModelResolution, request_id: str) -> Ask
     )
 
 
-@router.post("/ask", response_model=AskResponse)
+def _requested_profiler(request: Request, settings: SettingsDep) -> str | None:
+    """Profiler for this ask: set by ``/admin/profile`` or the admin-only profile header."""
+
+    requested = getattr(request.state, "profile_requested", None)
+    if requested is None:
+        header = getattr(request, "headers", {}).get(PROFILE_HEADER)
+        if not header or not is_admin_request(request, settings):
+            return None
+        requested = header.strip().lower()
+    return requested if requested in PROFILERS else SAMPLE_PROFILER
+
+
+@router.post("/ask", response_model=AskResponse, dependencies=[Depends(admit_ask_request)])
 async def ask_endpoint(
     payload: AskRequest,
     request: Request,
@@ -197,23 +220,63 @@ async def ask_endpoint(
         )
         return response
 
+    deadline: Deadline | None = None
+    budget_seconds = float(getattr(settings, "answer_deadline_seconds", 0.0) or 0.0)
+    if budget_seconds > 0:
+        # The budget is end-to-end, so time already spent in the admission queue counts.
+        queue_wait_seconds = float(getattr(request.state, "queue_wait_ms", 0.0)) / 1000
+        deadline = Deadline.after(budget_seconds - queue_wait_seconds)
+
     scopes: Sequence[ModelScope]
     if resolution.scopes:
         scopes = resolution.scopes
     else:
         scopes = [ModelScope(family_id="", family_label="", model=None)]
 
-    answers = _build_answer_payloads(
-        question=question,
-        scopes=scopes,
-        payload=payload,
-        settings=settings,
-        logger=logger,
-    )
+    profiler = _requested_profiler(request, settings)
+    report: ProfileReport | None = None
+    # Run the blocking pipeline off the event loop so identical concurrent
+    # questions can overlap and be coalesced by the retriever's single-flight layer.
+    if profiler is None:
+        answers = await run_in_threadpool(
+            _build_answer_payloads,
+            question=question,
+            scopes=scopes,
+            payload=payload,
+            settings=settings,
+            logger=logger,
+            deadline=deadline,
+        )
+    else:
+        # Profiled runs skip the answer cache and coalescing so the full pipeline executes.
+        profile_settings = settings.model_copy(
+            update={"answer_cache_enabled": False, "request_coalescing_enabled": False}
+        )
+        try:
+            answers, report = await run_in_threadpool(
+                profile_call,
+                partial(
+                    _build_answer_payloads,
+                    question=question,
+                    scopes=scopes,
+                    payload=payload,
+                    settings=profile_settings,
+                    logger=logger,
+                    deadline=deadline,
+                ),
+                profile_id=uuid.uuid4().hex,
+                trace_id=getattr(request.state, "trace_id", request_id),
+                profiler=profiler,
+                sample_interval_ms=settings.profile_sample_interval_ms,
+                artifact_dir=settings.profile_output_dir,
+            )
+        except RuntimeError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
 
     confidence_values = [entry.confidence for entry in answers if entry.confidence is not None]
     aggregated_confidence = min(confidence_values) if confidence_values else 0.0
     aggregated_escalation = any(entry.should_escalate for entry in answers)
+    degraded = any(entry.degraded for entry in answers)
     flattened_sources = [source for entry in answers for source in entry.sources]
     aggregated_answer = _aggregate_answer_text(answers)
     if aggregated_answer:
@@ -224,11 +287,16 @@ async def ask_endpoint(
     if len(answers) == 1:
         base_answer_text = answers[0].answer
 
-    glossary_entries = load_glossary_entries(settings)
-    glossary_matches = find_glossary_hits(
-        answer=base_answer_text,
-        question=question,
-        entries=glossary_entries,
+    glossary_matcher = load_glossary_matcher(settings)
+    glossary_matches = (
+        find_glossary_hits(
+            answer=base_answer_text,
+            question=question,
+            entries=glossary_matcher.entries,
+            matcher=glossary_matcher,
+        )
+        if glossary_matcher is not None
+        else []
     )
     glossary_payloads = [
         GlossaryHit(
@@ -253,6 +321,20 @@ async def ask_endpoint(
     request.state.answer_tokens = answer_tokens or 0
 
     elapsed_ms = (time.perf_counter() - start) * 1000
+    if report is not None:
+        report.tokens = {"question": prompt_tokens or 0, "answer": answer_tokens or 0}
+        report.write(settings.profile_output_dir)
+        request.state.profile = report
+        request.state.profile_id = report.profile_id
+        log_event(
+            logger,
+            "ask_profiled",
+            request_id=request_id,
+            trace_id=getattr(request.state, "trace_id", request_id),
+            profile_id=report.profile_id,
+            profiler=report.profiler,
+            wall_ms=report.wall_ms,
+        )
 
     if len(answers) == 1:
         primary = answers[0]
@@ -263,6 +345,7 @@ async def ask_endpoint(
             request_id=request_id,
             sources=primary.sources,
             answers=list(answers),
+            degraded=degraded or None,
             glossary_hits=glossary_payloads or None,
         )
     else:
@@ -273,6 +356,7 @@ async def ask_endpoint(
             request_id=request_id,
             sources=flattened_sources,
             answers=list(answers),
+            degraded=degraded or None,
             glossary_hits=glossary_payloads or None,
         )
 
@@ -283,6 +367,7 @@ async def ask_endpoint(
         trace_id=getattr(request.state, "trace_id", request_id),
         confidence=aggregated_confidence,
         escalate=aggregated_escalation,
+        degraded=degraded,
         latency_ms=round(elapsed_ms, 2),
         filters=payload.filters or {},
         models=payload.models or [],
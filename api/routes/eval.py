@@ -3,7 +3,6 @@
 from fastapi import APIRouter, HTTPException
 
 from atticus.logging import log_event
-from eval.runner import run_evaluation
 
 from ..dependencies import LoggerDep, SettingsDep
 from ..schemas import EvalResponse
@@ -13,6 +12,8 @@ router = APIRouter()
 
 @router.post("/eval/run", response_model=EvalResponse)
 async def run_eval(settings: SettingsDep, logger: LoggerDep) -> EvalResponse:
+    from eval.runner import run_evaluation  # noqa: PLC0415
+
     result = run_evaluation(settings=settings)
     log_event(logger, "eval_api_complete", metrics=result.metrics, deltas=result.deltas)
     threshold = settings.eval_regression_threshold / 100.0
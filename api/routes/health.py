@@ -1,18 +1,20 @@
 """Health endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
-from core.config import load_manifest
+from atticus.circuit_breaker import circuit_breaker_snapshot
+from core.config import load_manifest_cached
 
 from ..dependencies import SettingsDep
-from ..schemas import HealthResponse
+from ..schemas import HealthResponse, ReadyResponse, WarmupStepStatus
 
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health(settings: SettingsDep) -> HealthResponse:
-    manifest = load_manifest(settings.manifest_path)
+    # Liveness: served from the cached manifest, re-read only after an ingest rewrites it.
+    manifest = load_manifest_cached(settings.manifest_path)
     return HealthResponse(
         status="ok",
         manifest_present=manifest is not None,
@@ -22,4 +24,36 @@ async def health(settings: SettingsDep) -> HealthResponse:
         embedding_model_version=(
             manifest.embedding_model_version if manifest else settings.embedding_model_version
         ),
+        circuit_breakers={
+            name: str(snapshot["state"]) for name, snapshot in circuit_breaker_snapshot().items()
+        }
+        or None,
+    )
+
+
+@router.get(
+    "/ready",
+    response_model=ReadyResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadyResponse}},
+)
+async def ready(request: Request, response: Response) -> ReadyResponse:
+    """Readiness: 503 until this worker's startup warm-up has finished."""
+
+    warmup = getattr(request.app.state, "warmup", None)
+    if warmup is None or not warmup.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ReadyResponse(status="warming", ready=False)
+    return ReadyResponse(
+        status="ready",
+        ready=True,
+        duration_ms=warmup.duration_ms,
+        steps=[
+            WarmupStepStatus(
+                name=step.name,
+                status=step.status,
+                duration_ms=step.duration_ms,
+                detail=step.detail,
+            )
+            for step in warmup.steps
+        ],
     )
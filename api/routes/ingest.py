@@ -1,7 +1,6 @@
 from fastapi import APIRouter
 
 from atticus.logging import log_event
-from ingest.pipeline import IngestionOptions, ingest_corpus
 
 from ..dependencies import LoggerDep, SettingsDep
 from ..schemas import IngestRequest, IngestResponse
@@ -15,6 +14,9 @@ async def trigger_ingestion(
     settings: SettingsDep,
     logger: LoggerDep,
 ) -> IngestResponse:
+    # Ingestion pulls in the document parsers; chat-only workers never import them.
+    from ingest.pipeline import IngestionOptions, ingest_corpus  # noqa: PLC0415
+
     options = IngestionOptions(full_refresh=payload.full_refresh, paths=payload.paths)
     summary = ingest_corpus(settings=settings, options=options)
     log_event(
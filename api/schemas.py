@@ -16,6 +16,21 @@ class HealthResponse(BaseModel):
     chunk_count: int
     embedding_model: str | None = None
     embedding_model_version: str | None = None
+    circuit_breakers: dict[str, str] | None = None
+
+
+class WarmupStepStatus(BaseModel):
+    name: str
+    status: str
+    duration_ms: float
+    detail: str | None = None
+
+
+class ReadyResponse(BaseModel):
+    status: str
+    ready: bool
+    duration_ms: float | None = None
+    steps: list[WarmupStepStatus] = Field(default_factory=list)
 
 
 class IngestRequest(BaseModel):
@@ -97,6 +112,7 @@ class AskResponse(BaseModel):
     sources: list[AskSource] | None = None
     answers: list[AskAnswer] | None = None
     clarification: ClarificationPayload | None = None
+    degraded: bool | None = None
     glossary_hits: list[GlossaryHit] | None = Field(default=None, alias="glossaryHits")
 
 
@@ -108,6 +124,7 @@ class AskAnswer(BaseModel):
     family: str | None = None
     family_label: str | None = None
     sources: list[AskSource]
+    degraded: bool = False
 
 
 class ClarificationOption(BaseModel):
@@ -238,6 +255,32 @@ class MetricsDashboard(BaseModel):
     histogram: list[MetricsHistogram]
     recent_trace_ids: list[str]
     rate_limit: dict[str, int] | None = None
+    answer_cache: dict[str, int] | None = None
+    coalescing: dict[str, int] | None = None
+    admission: dict[str, dict[str, float]] | None = None
+    circuit_breakers: dict[str, dict[str, float | str]] | None = None
+    logging: dict[str, int] | None = None
+    routes: dict[str, dict[str, float]] | None = None
+    stages: dict[str, dict[str, float]] | None = None
+
+
+class QueryProfileReport(BaseModel):
+    profile_id: str
+    profiler: str
+    wall_ms: float
+    stages_ms: dict[str, float]
+    retrieval: list[dict[str, Any]]
+    tokens: dict[str, int]
+    memory: dict[str, dict[str, int]]
+    top_functions: list[dict[str, Any]]
+    spans: list[dict[str, Any]]
+    artifact_path: str | None = None
+    artifact_format: str | None = None
+
+
+class ProfileResponse(BaseModel):
+    answer: AskResponse
+    profile: QueryProfileReport
 
 
 AskResponse.model_rebuild()
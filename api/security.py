@@ -4,15 +4,15 @@ from __future__ import annotations
 
 import hashlib
 import uuid
-from ipaddress import ip_address
-from typing import Awaitable, Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse, Response
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from atticus.logging import log_event
-from core.config import load_settings
+from core.config import AppSettings, load_settings
+
+from .subnets import ALLOW, TRUSTED, GatewayPolicy
 
 
 def _hash_identifier(value: str | None) -> str | None:
@@ -21,59 +21,68 @@ def _hash_identifier(value: str | None) -> str | None:
     return hashlib.sha256(value.encode("utf-8")).hexdigest()[:12]
 
 
-class TrustedGatewayMiddleware(BaseHTTPMiddleware):
+class TrustedGatewayMiddleware:
     """Ensure requests originate from the enterprise gateway or loopback."""
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._policy: GatewayPolicy | None = None
+        self._policy_settings: AppSettings | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        rejection = self._rejection_reason(request)
+        if rejection is None:
+            await self.app(scope, receive, send)
+            return
+        reason, client_host = rejection
+        response = self._reject(request, reason=reason, client_host=client_host)
+        await response(scope, receive, send)
+
+    def _policy_for(self, settings: AppSettings) -> GatewayPolicy:
+        # Settings instances are immutable and replaced on reload, so identity is
+        # the settings version: the trie and decision cache are rebuilt only then.
+        if self._policy is None or self._policy_settings is not settings:
+            self._policy = GatewayPolicy(
+                settings.trusted_gateway_networks,
+                allow_loopback=settings.allow_loopback_requests,
+            )
+            self._policy_settings = settings
+        return self._policy
+
+    def _rejection_reason(self, request: Request) -> tuple[str, str | None] | None:
         settings = getattr(request.app.state, "settings", None) or load_settings()
 
         if not settings.enforce_gateway_boundary:
-            return await call_next(request)
+            return None
 
         client_host = request.client.host if request.client else None
-        rejection_reason: str | None = None
-
         if client_host is None:
             if settings.allow_loopback_requests:
-                return await call_next(request)
-            rejection_reason = "missing_client_ip"
-        else:
-            try:
-                client_ip = ip_address(client_host)
-            except ValueError:
-                if settings.allow_loopback_requests and client_host in {"testclient", "localhost"}:
-                    return await call_next(request)
-                rejection_reason = "invalid_client_ip"
-            else:
-                if client_ip.is_loopback and settings.allow_loopback_requests:
-                    return await call_next(request)
-
-                networks = settings.trusted_gateway_networks
-                if not networks:
-                    rejection_reason = "no_trusted_networks"
-                elif not any(client_ip in network for network in networks):
-                    rejection_reason = "untrusted_source"
-                elif settings.require_forwarded_for_header and not request.headers.get(
-                    "X-Forwarded-For"
-                ):
-                    rejection_reason = "missing_forwarded_for"
-                elif settings.require_https_forward_proto:
-                    proto = request.headers.get("X-Forwarded-Proto", "").lower()
-                    if proto != "https":
-                        rejection_reason = "non_https_forwarded_proto"
-
-        if rejection_reason is not None:
-            return self._reject(
-                request,
-                reason=rejection_reason,
-                client_host=client_host,
-            )
-
-        return await call_next(request)
+                return None
+            return "missing_client_ip", None
+
+        decision = self._policy_for(settings).classify(client_host)
+        if decision == ALLOW:
+            return None
+        if decision != TRUSTED:
+            return decision, client_host
+        reason = self._forwarded_header_reason(request, settings)
+        return (reason, client_host) if reason else None
+
+    @staticmethod
+    def _forwarded_header_reason(request: Request, settings: AppSettings) -> str | None:
+        if settings.require_forwarded_for_header and not request.headers.get("X-Forwarded-For"):
+            return "missing_forwarded_for"
+        if settings.require_https_forward_proto:
+            proto = request.headers.get("X-Forwarded-Proto", "").lower()
+            if proto != "https":
+                return "non_https_forwarded_proto"
+        return None
 
     def _reject(
         self,
@@ -0,0 +1,114 @@
+"""Precompiled trusted-gateway matching for the boundary middleware."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address
+
+# Bounded LRU of recent per-host decisions; gateway traffic comes from few addresses.
+DECISION_CACHE_SIZE = 4096
+
+ALLOW = "allow"
+TRUSTED = "trusted"
+
+
+class _Node:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self) -> None:
+        self.children: list[_Node | None] = [None, None]
+        self.terminal = False
+
+
+class SubnetTrie:
+    """Binary radix trie over address bits; lookups cost O(prefix length)."""
+
+    __slots__ = ("_roots", "size")
+
+    def __init__(self, networks: Iterable[IPv4Network | IPv6Network] = ()) -> None:
+        self._roots: dict[int, _Node] = {4: _Node(), 6: _Node()}
+        self.size = 0
+        for network in networks:
+            self.add(network)
+
+    def add(self, network: IPv4Network | IPv6Network) -> None:
+        node = self._roots[network.version]
+        width = network.max_prefixlen
+        value = int(network.network_address)
+        for depth in range(network.prefixlen):
+            if node.terminal:
+                return  # already covered by a shorter prefix
+            bit = (value >> (width - 1 - depth)) & 1
+            child = node.children[bit]
+            if child is None:
+                child = node.children[bit] = _Node()
+            node = child
+        # A terminal prefix covers everything beneath it, so longer prefixes are dropped.
+        node.children = [None, None]
+        node.terminal = True
+        self.size += 1
+
+    def contains(self, address: IPv4Address | IPv6Address) -> bool:
+        node = self._roots[address.version]
+        width = address.max_prefixlen
+        value = int(address)
+        for depth in range(width):
+            if node.terminal:
+                return True
+            child = node.children[(value >> (width - 1 - depth)) & 1]
+            if child is None:
+                return False
+            node = child
+        return node.terminal
+
+
+class GatewayPolicy:
+    """Host-level boundary decisions for one settings version.
+
+    ``classify`` returns :data:`ALLOW` (loopback/test client, skip further checks),
+    :data:`TRUSTED` (inside a trusted subnet; header checks still apply), or the
+    rejection reason. Results are memoised per host in a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        networks: Iterable[IPv4Network | IPv6Network],
+        *,
+        allow_loopback: bool,
+        cache_size: int = DECISION_CACHE_SIZE,
+    ) -> None:
+        self.trie = SubnetTrie(networks)
+        self.allow_loopback = allow_loopback
+        self.cache_size = cache_size
+        self._decisions: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, host: str) -> str:
+        decision = self._decisions.get(host)
+        if decision is not None:
+            self._decisions.move_to_end(host)
+            self.hits += 1
+            return decision
+        self.misses += 1
+        decision = self._decide(host)
+        self._decisions[host] = decision
+        if len(self._decisions) > self.cache_size:
+            self._decisions.popitem(last=False)
+        return decision
+
+    def _decide(self, host: str) -> str:
+        try:
+            client_ip = ip_address(host)
+        except ValueError:
+            if self.allow_loopback and host in {"testclient", "localhost"}:
+                return ALLOW
+            return "invalid_client_ip"
+        if client_ip.is_loopback and self.allow_loopback:
+            return ALLOW
+        if not self.trie.size:
+            return "no_trusted_networks"
+        if not self.trie.contains(client_ip):
+            return "untrusted_source"
+        return TRUSTED
@@ -0,0 +1,217 @@
+"""Per-process startup warm-up and readiness state.
+
+Right after a deploy, the first requests used to pay for loading the tokenizer, the
+model catalog, the glossary matcher, the manifest and the retrieval index, and they
+all found the answer cache empty. The ``lifespan`` now starts a :class:`Warmup` on a
+background thread. It loads each of these and then replays the most frequent
+questions from the recent logs through the chat pipeline, so those answers are
+cached before real traffic asks them. ``/health`` answers throughout (liveness).
+``/ready`` returns 503 until the warm-up has finished. Steps that fail or do not
+apply are recorded and do not block readiness.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from atticus.glossary import load_glossary_matcher
+from atticus.log_store import LogQuery, recent_events
+from atticus.logging import log_error, log_event
+from atticus.tokenization import count_tokens
+from core.config import AppSettings, load_manifest_cached
+from retriever.answer_cache import get_answer_cache, normalize_question
+from retriever.models import load_model_catalog
+from retriever.query_splitter import original_question, run_rag_for_each
+from retriever.resolver import ModelScope, resolve_models
+from retriever.vector_store import VectorStore
+
+QUESTION_EVENTS = ("chat_turn", "retrieval_query")
+# Most recent question records read when ranking questions for replay.
+SCAN_LIMIT = 5_000
+_MIN_QUESTION_LEN = 4
+
+
+class _Skipped(Exception):
+    """Raised by a warm-up step that does not apply to this configuration."""
+
+
+@dataclass(slots=True)
+class WarmupStep:
+    name: str
+    status: str
+    duration_ms: float
+    detail: str | None = None
+
+
+def recent_questions(settings: AppSettings, limit: int, *, now: float | None = None) -> list[str]:
+    """The ``limit`` most frequent questions logged within the replay lookback window.
+
+    ``chat_turn`` records carry the question exactly as asked, but they are only written
+    when ``LOG_VERBOSE`` is on. Without them, the retriever's ``retrieval_query`` records
+    are used instead, with any per-model focus clause removed. Questions are counted by
+    their normalized form, and the most recent wording is returned.
+    """
+
+    if limit <= 0:
+        return []
+    since = (now if now is not None else time.time()) - (
+        settings.warmup_replay_lookback_hours * 3600
+    )
+    records = recent_events(settings, QUESTION_EVENTS, LogQuery(since=since, limit=SCAN_LIMIT))
+    asked = [str(r.get("question") or "").strip() for r in records if r.get("event") == "chat_turn"]
+    if not any(asked):
+        asked = [
+            original_question(str(r.get("query") or "")).strip()
+            for r in records
+            if r.get("event") == "retrieval_query"
+        ]
+
+    counts: Counter[str] = Counter()
+    wording: dict[str, str] = {}
+    for question in asked:
+        if len(question) < _MIN_QUESTION_LEN:
+            continue
+        key = normalize_question(question)
+        counts[key] += 1
+        wording.setdefault(key, question)
+    return [wording[key] for key, _ in counts.most_common(limit)]
+
+
+def replay_question(question: str, *, settings: AppSettings, logger: logging.Logger) -> bool:
+    """Answer ``question`` the way a default ``/ask`` would, filling the same cache keys."""
+
+    resolution = resolve_models(question)
+    if resolution.needs_clarification:
+        return False
+    scopes = resolution.scopes or [ModelScope(family_id="", family_label="", model=None)]
+    run_rag_for_each(question, scopes, settings=settings, logger=logger, filters={})
+    return True
+
+
+class Warmup:
+    """Runs the warm-up steps once and records whether this process is ready."""
+
+    def __init__(self, settings: AppSettings, logger: logging.Logger) -> None:
+        self.settings = settings
+        self.logger = logger
+        self.steps: list[WarmupStep] = []
+        self.duration_ms: float | None = None
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> None:
+        if not self.settings.warmup_enabled:
+            self._ready.set()
+            return
+        self._thread = threading.Thread(target=self.run, name="atticus-warmup", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Abandon the remaining replay (on shutdown) and wait briefly for the thread."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        steps: tuple[tuple[str, Callable[[], str | None]], ...] = (
+            ("tokenizer", self._tokenizer),
+            ("model_catalog", self._model_catalog),
+            ("glossary", self._glossary),
+            ("manifest", self._manifest),
+            ("answer_cache", self._answer_cache),
+            ("retrieval", self._retrieval),
+            ("replay", self._replay),
+        )
+        try:
+            for name, step in steps:
+                if self._stop.is_set():
+                    break
+                self._run_step(name, step)
+        finally:
+            self.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            self._ready.set()
+        log_event(
+            self.logger,
+            "warmup_complete",
+            duration_ms=self.duration_ms,
+            steps={step.name: step.status for step in self.steps},
+        )
+
+    def _run_step(self, name: str, step: Callable[[], str | None]) -> None:
+        started = time.perf_counter()
+        status, detail = "ok", None
+        try:
+            detail = step()
+        except _Skipped as exc:
+            status, detail = "skipped", str(exc)
+        except Exception as exc:  # a failed step must not block readiness
+            status, detail = "error", f"{type(exc).__name__}: {exc}"
+            log_error(self.logger, "warmup_step_failed", step=name, error=detail)
+        elapsed = round((time.perf_counter() - started) * 1000, 2)
+        self.steps.append(WarmupStep(name=name, status=status, duration_ms=elapsed, detail=detail))
+
+    def _tokenizer(self) -> str | None:
+        count_tokens("warm-up")
+        return None
+
+    def _model_catalog(self) -> str | None:
+        catalog = load_model_catalog()
+        return f"{len(catalog.families)} families"
+
+    def _glossary(self) -> str | None:
+        matcher = load_glossary_matcher(self.settings)
+        if matcher is None:
+            raise _Skipped("no glossary entries")
+        return f"{len(matcher.entries)} entries"
+
+    def _manifest(self) -> str | None:
+        manifest = load_manifest_cached(self.settings.manifest_path)
+        if manifest is None:
+            raise _Skipped("manifest not found")
+        return f"{manifest.chunk_count} chunks"
+
+    def _answer_cache(self) -> str | None:
+        if get_answer_cache(self.settings) is None:
+            raise _Skipped("answer cache disabled")
+        return None
+
+    def _retrieval(self) -> str | None:
+        if not self.settings.database_url:
+            raise _Skipped("DATABASE_URL not set")
+        store = VectorStore(self.settings, self.logger)
+        return f"{len(store.table)} chunks"
+
+    def _replay(self) -> str | None:
+        limit = self.settings.warmup_replay_questions
+        if limit <= 0:
+            raise _Skipped("WARMUP_REPLAY_QUESTIONS=0")
+        if get_answer_cache(self.settings) is None:
+            raise _Skipped("answer cache disabled")
+        if not (self.settings.openai_api_key or "").strip():
+            raise _Skipped("OPENAI_API_KEY not set")
+        questions = recent_questions(self.settings, limit)
+        replayed = failed = 0
+        for question in questions:
+            if self._stop.is_set():
+                break
+            try:
+                replayed += replay_question(question, settings=self.settings, logger=self.logger)
+            except Exception as exc:  # one bad question must not stop the rest
+                failed += 1
+                log_error(self.logger, "warmup_replay_failed", error=str(exc))
+        return f"{replayed}/{len(questions)} questions replayed, {failed} failed"
@@ -96,6 +96,7 @@ export async function POST(request: Request) {
   const generatedId = randomUUID();
   const requestId = request.headers.get("x-request-id") ?? generatedId;
   const traceId = request.headers.get("x-trace-id") ?? requestId;
+  const lane = request.headers.get("x-atticus-lane");
 
   let parsed: AskRequest;
   try {
@@ -117,6 +118,7 @@ export async function POST(request: Request) {
         Accept: acceptsSse ? "text/event-stream" : "application/json",
         "X-Request-ID": requestId,
         "X-Trace-ID": traceId,
+        ...(lane ? { "X-Atticus-Lane": lane } : {}),
       },
       body: JSON.stringify({
         question: parsed.question,
@@ -0,0 +1,81 @@
+"""Pure-Python Aho-Corasick automaton for multi-pattern substring matching.
+
+Building is linear in the total pattern length; a scan is a single pass over the text
+whose cost does not depend on how many patterns were compiled, which keeps dictionary
+and catalog lookups flat as they grow to thousands of entries.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class AhoCorasick(Generic[T]):  # noqa: UP046
+    """Match many patterns at once; each pattern carries one or more payloads."""
+
+    __slots__ = ("_fail", "_goto", "_out", "pattern_count")
+
+    def __init__(self, patterns: Iterable[tuple[str, T]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Per state: (pattern length, payloads) for every pattern ending there,
+        # including those inherited through failure links.
+        self._out: list[list[tuple[int, tuple[T, ...]]]] = [[]]
+        payloads: dict[int, list[T]] = {}
+        for pattern, payload in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            bucket = payloads.setdefault(state, [])
+            if not bucket:
+                self._out[state].append((len(pattern), ()))
+            bucket.append(payload)
+        for state, values in payloads.items():
+            length, _ = self._out[state][0]
+            self._out[state][0] = (length, tuple(values))
+        self.pattern_count = len(payloads)
+        self._link()
+
+    def _link(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return self.pattern_count
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, tuple[T, ...]]]:
+        """Yield ``(start, end, payloads)`` for every (possibly overlapping) occurrence."""
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = index + 1
+                for length, values in out[state]:
+                    yield end - length, end, values
@@ -0,0 +1,176 @@
+"""Shared circuit breakers for upstream model APIs.
+
+A breaker tracks the failure rate of recent calls to one upstream (for example
+OpenAI embeddings). Once the rate crosses the configured threshold the breaker
+*opens* and callers skip the upstream entirely, falling back to their offline path
+in milliseconds instead of waiting for each request to time out. After a cooldown
+the breaker goes *half-open* and lets a single probe through: success closes it,
+failure re-opens it for another cooldown.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.config import AppSettings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+EMBEDDINGS_BREAKER = "openai_embeddings"
+GENERATION_BREAKER = "openai_generation"
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """Thread-safe failure-rate breaker with half-open probing."""
+
+    name: str
+    failure_rate_threshold: float = 0.5
+    min_calls: int = 5
+    window_seconds: float = 60.0
+    cooldown_seconds: float = 30.0
+    state: str = CLOSED
+    opened_at: float | None = None
+    trips: int = 0
+    short_circuited: int = 0
+    _outcomes: deque[tuple[float, bool]] = field(default_factory=deque)
+    _probe_in_flight: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def allow(self) -> bool:
+        """Return ``True`` when the caller may contact the upstream.
+
+        Every ``True`` must be followed by :meth:`record_success` or
+        :meth:`record_failure` so half-open probes are released.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                if self.opened_at is not None and now - self.opened_at >= self.cooldown_seconds:
+                    self.state = HALF_OPEN
+                else:
+                    self.short_circuited += 1
+                    return False
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    self.short_circuited += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._close()
+                return
+            self._record(True)
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open(now)
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            total = len(self._outcomes)
+            if total >= self.min_calls and failures / total >= self.failure_rate_threshold:
+                self._open(now)
+
+    def snapshot(self) -> dict[str, float | str]:
+        with self._lock:
+            self._prune(time.monotonic())
+            total = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self.state,
+                "calls": total,
+                "failures": failures,
+                "failure_rate": round(failures / total, 3) if total else 0.0,
+                "trips": self.trips,
+                "short_circuited": self.short_circuited,
+            }
+
+    def _record(self, ok: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, ok))
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] <= cutoff:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self.trips += 1
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._outcomes.clear()
+
+
+@dataclass(slots=True)
+class _BreakerRegistry:
+    """Process-wide breakers shared by every client instance."""
+
+    config: tuple[Any, ...] | None = None
+    breakers: dict[str, CircuitBreaker] = field(default_factory=dict)
+
+
+_BREAKERS = _BreakerRegistry()
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(name: str, settings: AppSettings) -> CircuitBreaker | None:
+    """Return the shared breaker for ``name``, or ``None`` when breakers are disabled."""
+
+    if not getattr(settings, "circuit_breaker_enabled", False):
+        return None
+    config = (
+        float(settings.circuit_breaker_failure_rate),
+        int(settings.circuit_breaker_min_calls),
+        float(settings.circuit_breaker_window_seconds),
+        float(settings.circuit_breaker_cooldown_seconds),
+    )
+    with _BREAKERS_LOCK:
+        if _BREAKERS.config != config:
+            _BREAKERS.breakers.clear()
+            _BREAKERS.config = config
+        breaker = _BREAKERS.breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name=name,
+                failure_rate_threshold=config[0],
+                min_calls=config[1],
+                window_seconds=config[2],
+                cooldown_seconds=config[3],
+            )
+            _BREAKERS.breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker_snapshot() -> dict[str, dict[str, float | str]]:
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state (primarily for tests)."""
+
+    with _BREAKERS_LOCK:
+        _BREAKERS.breakers.clear()
+        _BREAKERS.config = None
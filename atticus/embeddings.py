@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import hashlib
-import importlib
 import logging
 from collections.abc import Iterable
-from typing import Any, cast
+from typing import Any
 
 import numpy as np
 
+from .circuit_breaker import EMBEDDINGS_BREAKER, get_circuit_breaker
 from .config import AppSettings
+from .openai_client import get_openai_client
 
 
 class EmbeddingClient:
@@ -23,34 +24,12 @@ class EmbeddingClient:
         self.dimension = settings.embed_dimensions
         self.batch_size = max(1, int(getattr(settings, "embedding_batch_size", 32)))
 
-        # Resolve API key and record source for diagnostics
-        source = "none"
         api_key = getattr(settings, "openai_api_key", None)
-        if api_key:
-            source = "settings"
         self._client: Any | None = None
         if api_key:  # pragma: no cover - requires network
             try:
-                openai_module = importlib.import_module("openai")
-                openai_class = cast(Any, openai_module).OpenAI
-                # Pass the key explicitly so we don't rely on process env
-                self._client = openai_class(api_key=api_key)
-                # Safe fingerprint (sha256 prefix) for troubleshooting without leaking secrets
-                try:
-                    fp = hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:12]
-                except Exception:
-                    fp = "unknown"
-                self.logger.info(
-                    "openai_client_initialized",
-                    extra={
-                        "extra_payload": {
-                            "client": "embeddings",
-                            "source": source,
-                            "key_fp": fp,
-                            "model": self.model_name,
-                        }
-                    },
-                )
+                # Shared pooled client: connections are reused across requests.
+                self._client = get_openai_client(settings, self.logger)
             except Exception as exc:  # pragma: no cover - network path
                 self.logger.warning(
                     "OpenAI client initialization failed; using fallback embeddings",
@@ -66,7 +45,8 @@ class EmbeddingClient:
         if not payload:
             return []
 
-        if self._client is not None:  # pragma: no cover - requires network
+        breaker = get_circuit_breaker(EMBEDDINGS_BREAKER, self.settings)
+        if self._client is not None and (breaker is None or breaker.allow()):  # pragma: no cover
             try:
                 embeddings: list[list[float]] = []
                 for start in range(0, len(payload), self.batch_size):
@@ -75,6 +55,8 @@ class EmbeddingClient:
                         model=self.model_name, input=batch
                     )
                     embeddings.extend([list(map(float, item.embedding)) for item in response.data])
+                if breaker is not None:
+                    breaker.record_success()
                 if len(embeddings) == len(payload):
                     return embeddings
                 self.logger.warning(
@@ -88,6 +70,8 @@ class EmbeddingClient:
                     },
                 )
             except Exception as exc:
+                if breaker is not None:
+                    breaker.record_failure()
                 self.logger.error(
                     "OpenAI embedding request failed; falling back to deterministic embeddings",
                     extra={"extra_payload": {"error": str(exc), "model": self.model_name}},
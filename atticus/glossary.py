@@ -1,17 +1,25 @@
-"""Glossary enrichment helpers for inline answer annotations."""
+"""Glossary enrichment helpers for inline answer annotations.
+
+Entries and their :class:`GlossaryMatcher` are compiled once per dictionary file
+version (path, mtime, size). The matcher holds three Aho-Corasick automata (search
+terms, normalized aliases, normalized families), so matching is one pass over each
+form of the answer and question regardless of dictionary size.
+"""
 
 from __future__ import annotations
 
 import json
 import re
+import threading
 import unicodedata
 from dataclasses import dataclass
-from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Sequence
 
 from core.config import AppSettings
 
+from .aho_corasick import AhoCorasick
+
 _DIACRITIC_PATTERN = re.compile(r"[\u0300-\u036f]")
 
 
@@ -94,7 +102,6 @@ def _coerce_str_list(values: object) -> tuple[str, ...]:
     return tuple()
 
 
-@lru_cache(maxsize=16)
 def _load_entries_from_path(path: str) -> tuple[GlossaryEntry, ...]:
     raw_entries = _load_dictionary(Path(path))
     entries: list[GlossaryEntry] = []
@@ -137,16 +144,139 @@ def _load_entries_from_path(path: str) -> tuple[GlossaryEntry, ...]:
     return tuple(entries)
 
 
-def load_glossary_entries(settings: AppSettings | object) -> tuple[GlossaryEntry, ...]:
+def _fold_case(value: str) -> str:
+    """Lower-case ``value`` without changing its length, so match offsets stay valid."""
+
+    lowered = value.lower()
+    if len(lowered) == len(value):
+        return lowered
+    return "".join(char if len(char.lower()) != 1 else char.lower() for char in value)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class GlossaryMatcher:
+    """Compiled multi-pattern matcher over a fixed tuple of glossary entries."""
+
+    __slots__ = ("_aliases", "_families", "_terms", "entries")
+
+    def __init__(self, entries: Sequence[GlossaryEntry]) -> None:
+        self.entries = tuple(entries)
+        self._terms: AhoCorasick[int] = AhoCorasick(
+            (_fold_case(candidate), index)
+            for index, entry in enumerate(self.entries)
+            for candidate in entry.search_terms
+            if candidate
+        )
+        self._aliases: AhoCorasick[int] = AhoCorasick(
+            (token, index)
+            for index, entry in enumerate(self.entries)
+            for token in entry.normalized_aliases
+            if token
+        )
+        self._families: AhoCorasick[int] = AhoCorasick(
+            (family, index)
+            for index, entry in enumerate(self.entries)
+            for family in entry.normalized_families
+            if family
+        )
+
+    def _term_matches(self, haystack: str) -> dict[int, str]:
+        """First whole-word, case-insensitive search-term match per entry."""
+
+        matched: dict[int, str] = {}
+        folded = _fold_case(haystack)
+        limit = len(haystack)
+        for start, end, indices in self._terms.iter_matches(folded):
+            if start > 0 and _is_word_char(haystack[start - 1]):
+                continue
+            if end < limit and _is_word_char(haystack[end]):
+                continue
+            for index in indices:
+                matched.setdefault(index, haystack[start:end])
+        return matched
+
+    def match(self, haystack: str) -> dict[int, str]:
+        """Map entry index to matched value (terms first, then aliases, then families)."""
+
+        matched = self._term_matches(haystack)
+        if len(matched) < len(self.entries):
+            if len(self._aliases):
+                for _, _, indices in self._aliases.iter_matches(_normalize_token(haystack)):
+                    for index in indices:
+                        matched.setdefault(index, self.entries[index].term)
+            if len(self._families):
+                for _, _, indices in self._families.iter_matches(_normalize_family(haystack)):
+                    for index in indices:
+                        matched.setdefault(index, self.entries[index].term)
+        return matched
+
+
+@dataclass(slots=True)
+class _GlossaryCache:
+    version: tuple[str, int, int] | None = None
+    entries: tuple[GlossaryEntry, ...] = ()
+    matcher: GlossaryMatcher | None = None
+
+
+_GLOSSARY = _GlossaryCache()
+_GLOSSARY_LOCK = threading.Lock()
+
+
+def _dictionary_version(path: Path) -> tuple[str, int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (str(path), -1, -1)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _cached_glossary(settings: AppSettings | object) -> _GlossaryCache | None:
     dictionary_path = getattr(settings, "dictionary_path", None)
     if dictionary_path is None:
-        return tuple()
-    path = Path(dictionary_path)
-    return _load_entries_from_path(str(path.resolve()))
+        return None
+    path = Path(dictionary_path).resolve()
+    version = _dictionary_version(path)
+    with _GLOSSARY_LOCK:
+        if _GLOSSARY.version != version:
+            entries = _load_entries_from_path(str(path))
+            _GLOSSARY.entries = entries
+            _GLOSSARY.matcher = GlossaryMatcher(entries)
+            _GLOSSARY.version = version
+        return _GLOSSARY
+
+
+def load_glossary_entries(settings: AppSettings | object) -> tuple[GlossaryEntry, ...]:
+    cached = _cached_glossary(settings)
+    return cached.entries if cached is not None else tuple()
+
+
+def load_glossary_matcher(settings: AppSettings | object) -> GlossaryMatcher | None:
+    cached = _cached_glossary(settings)
+    return cached.matcher if cached is not None else None
+
+
+def reset_glossary_cache() -> None:
+    """Drop the compiled glossary (called after the dictionary is rewritten)."""
+
+    with _GLOSSARY_LOCK:
+        _GLOSSARY.version = None
+        _GLOSSARY.entries = ()
+        _GLOSSARY.matcher = None
 
 
 # Expose cache controls for tests.
-load_glossary_entries.cache_clear = _load_entries_from_path.cache_clear  # type: ignore[attr-defined]
+load_glossary_entries.cache_clear = reset_glossary_cache  # type: ignore[attr-defined]
+
+
+def _matcher_for(entries: Sequence[GlossaryEntry]) -> GlossaryMatcher:
+    with _GLOSSARY_LOCK:
+        matcher = _GLOSSARY.matcher
+    if matcher is not None and matcher.entries is entries:
+        return matcher
+    return GlossaryMatcher(entries)
 
 
 def find_glossary_hits(
@@ -154,38 +284,23 @@ def find_glossary_hits(
     answer: str,
     question: str | None,
     entries: Sequence[GlossaryEntry],
+    matcher: GlossaryMatcher | None = None,
 ) -> list[GlossaryHit]:
     haystack_parts = [answer or ""]
     if question:
         haystack_parts.append(question)
     haystack = " \n".join(haystack_parts)
-    if not haystack.strip():
+    if not haystack.strip() or not entries:
         return []
-    normalized_haystack = _normalize_token(haystack)
+    if matcher is None:
+        matcher = _matcher_for(entries)
+    matched = matcher.match(haystack)
     hits: list[GlossaryHit] = []
     seen_terms: set[str] = set()
-    for entry in entries:
+    for index, entry in enumerate(matcher.entries):
         if entry.term in seen_terms:
             continue
-        matched_value: str | None = None
-        for candidate in entry.search_terms:
-            if not candidate:
-                continue
-            pattern = re.compile(rf"(?<!\w){re.escape(candidate)}(?!\w)", re.IGNORECASE)
-            match = pattern.search(haystack)
-            if match:
-                matched_value = match.group(0)
-                break
-        if not matched_value and entry.normalized_aliases:
-            for token in entry.normalized_aliases:
-                if token and token in normalized_haystack:
-                    matched_value = entry.term
-                    break
-        if not matched_value and entry.normalized_families:
-            for family in entry.normalized_families:
-                if family and family in _normalize_family(haystack):
-                    matched_value = entry.term
-                    break
+        matched_value = matched.get(index)
         if matched_value:
             seen_terms.add(entry.term)
             hits.append(
@@ -0,0 +1,359 @@
+"""Indexed SQLite copy of the structured log for admin queries.
+
+``LogIndexHandler`` sits next to the JSON file handlers (on the queue listener
+thread when ``LOG_ASYNC`` is on) and inserts each record into a WAL-mode table
+indexed by timestamp, event, level, and request ID. ``/admin/sessions`` and
+``/admin/errors`` read through :class:`LogStore`, so their cost follows the page
+size and time range rather than the size of ``app.jsonl``. Records are retained
+across log rotation; rows older than ``LOG_INDEX_RETENTION_DAYS`` are pruned.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .config import AppSettings
+from .logging import JsonFormatter
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS log_records (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        levelno INTEGER NOT NULL,
+        event TEXT NOT NULL,
+        request_id TEXT,
+        record TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_log_records_ts ON log_records(ts)",
+    "CREATE INDEX IF NOT EXISTS idx_log_records_event_ts ON log_records(event, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_log_records_level_ts ON log_records(levelno, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_log_records_request_id ON log_records(request_id)",
+)
+
+SESSION_EVENT = "request_complete"
+_SESSION_METADATA: dict[str, tuple[str, ...]] = {
+    "ask_endpoint_complete": ("confidence", "escalate", "filters"),
+    "chat_turn": ("confidence", "tokens", "trace"),
+}
+_PRUNE_EVERY = 1_000
+_LEVELS = {name.lower(): level for name, level in logging.getLevelNamesMapping().items() if level}
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def _row(record: dict[str, Any], ts: float, levelno: int) -> tuple[Any, ...]:
+    request_id = record.get("request_id")
+    return (
+        ts,
+        levelno,
+        str(record.get("event") or record.get("message") or ""),
+        str(request_id) if request_id else None,
+        json.dumps(record, ensure_ascii=False, default=str),
+    )
+
+
+class LogIndexHandler(logging.Handler):
+    """Logging handler that appends every record to the indexed log store."""
+
+    def __init__(self, path: Path, *, retention_days: float) -> None:
+        super().__init__()
+        self.path = path
+        self.retention_seconds = retention_days * 86_400
+        self._conn = _connect(path)
+        self._since_prune = _PRUNE_EVERY
+        self._formatter = JsonFormatter(use_orjson=False)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            payload = self._formatter.to_payload(record)
+            self._conn.execute(
+                "INSERT INTO log_records (ts, levelno, event, request_id, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                _row(payload, record.created, record.levelno),
+            )
+            self._since_prune += 1
+            if self._since_prune >= _PRUNE_EVERY:
+                self._since_prune = 0
+                self._conn.execute(
+                    "DELETE FROM log_records WHERE ts < ?",
+                    (time.time() - self.retention_seconds,),
+                )
+        except Exception:  # pragma: no cover - mirrors logging.Handler semantics
+            self.handleError(record)
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        finally:
+            super().close()
+
+
+def _rotated_files(path: Path) -> list[Path]:
+    """Return ``path`` and its ``RotatingFileHandler`` backups, oldest first."""
+
+    backups = sorted(
+        (
+            candidate
+            for candidate in path.parent.glob(f"{path.name}.*")
+            if candidate.suffix[1:].isdigit()
+        ),
+        key=lambda candidate: int(candidate.suffix[1:]),
+        reverse=True,
+    )
+    return [*backups, path] if path.exists() else backups
+
+
+def _placeholders(values: list[str]) -> str:
+    return ",".join("?" for _ in values)
+
+
+def _parse_timestamp(value: object) -> float | None:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def iter_log_file_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield JSON records from ``path`` and its rotated backups in write order."""
+
+    for candidate in _rotated_files(path):
+        with candidate.open(encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+@dataclass(slots=True)
+class LogQuery:
+    since: float | None = None
+    until: float | None = None
+    limit: int = 50
+    offset: int = 0
+
+    def where(self) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if self.since is not None:
+            clauses.append("ts >= ?")
+            params.append(self.since)
+        if self.until is not None:
+            clauses.append("ts <= ?")
+            params.append(self.until)
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+
+class LogStore:
+    """Read side of the indexed log sink."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def count(self) -> int:
+        with self._lock:
+            (total,) = self._conn.execute("SELECT COUNT(*) FROM log_records").fetchone()
+        return int(total)
+
+    def backfill(self, log_path: Path) -> int:
+        """Import an existing JSON log (including rotated files) into an empty store.
+
+        The main log carries every level, so ``errors.jsonl`` needs no separate pass.
+        """
+
+        if self.count():
+            return 0
+
+        def rows() -> Iterator[tuple[Any, ...]]:
+            for record in iter_log_file_records(log_path):
+                ts = _parse_timestamp(record.get("timestamp") or record.get("time"))
+                if ts is None:
+                    continue
+                levelno = _LEVELS.get(str(record.get("level", "info")).lower(), logging.INFO)
+                yield _row(record, ts, levelno)
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            cursor = self._conn.executemany(
+                "INSERT INTO log_records (ts, levelno, event, request_id, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows(),
+            )
+            self._conn.execute("COMMIT")
+        return max(0, cursor.rowcount)
+
+    def errors(self, query: LogQuery) -> list[dict[str, Any]]:
+        """Return ERROR+ records in the window, newest page first, in chronological order."""
+
+        where, params = query.where()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM log_records WHERE levelno >= ?"
+                f"{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                [logging.ERROR, *params, query.limit, query.offset],
+            ).fetchall()
+        return [json.loads(record) for (record,) in reversed(rows)]
+
+    def events(self, names: Sequence[str], query: LogQuery) -> list[dict[str, Any]]:
+        """Return records of the named events in the window, newest first."""
+
+        where, params = query.where()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT record FROM log_records WHERE event IN ({_placeholders(list(names))})"
+                f"{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                [*names, *params, query.limit, query.offset],
+            ).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def sessions(self, query: LogQuery) -> list[dict[str, Any]]:
+        """Return ``request_complete`` sessions joined with their ask/chat metadata."""
+
+        where, params = query.where()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM log_records WHERE event = ?"
+                f"{where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                [SESSION_EVENT, *params, query.limit, query.offset],
+            ).fetchall()
+            completed = [json.loads(record) for (record,) in reversed(rows)]
+            request_ids = sorted(
+                {str(item["request_id"]) for item in completed if item.get("request_id")}
+            )
+            metadata_rows: list[tuple[str, str]] = []
+            if request_ids:
+                events = list(_SESSION_METADATA)
+                metadata_rows = self._conn.execute(
+                    "SELECT event, record FROM log_records "
+                    f"WHERE request_id IN ({_placeholders(request_ids)}) "
+                    f"AND event IN ({_placeholders(events)}) ORDER BY ts, id",
+                    [*request_ids, *events],
+                ).fetchall()
+
+        metadata: dict[str, dict[str, Any]] = {}
+        for event, raw in metadata_rows:
+            record = json.loads(raw)
+            meta = metadata.setdefault(str(record.get("request_id")), {})
+            for key in _SESSION_METADATA[event]:
+                if key in record and record[key] is not None:
+                    meta[key] = record[key]
+        return [session_entry(record, metadata) for record in completed]
+
+
+def session_entry(record: dict[str, Any], metadata: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    request_id = str(record.get("request_id", ""))
+    entry: dict[str, Any] = {
+        "request_id": request_id,
+        "method": record.get("method"),
+        "path": record.get("path"),
+        "status": record.get("status"),
+        "latency_ms": record.get("latency_ms"),
+        "timestamp": record.get("timestamp") or record.get("time"),
+    }
+    if request_id in metadata:
+        entry.update(metadata[request_id])
+    return entry
+
+
+@dataclass(slots=True)
+class _LogStoreHolder:
+    path: Path | None = None
+    store: LogStore | None = None
+
+
+_LOG_STORE = _LogStoreHolder()
+_LOG_STORE_LOCK = threading.Lock()
+
+
+def log_index_path(settings: AppSettings) -> Path | None:
+    if not getattr(settings, "log_index_enabled", False):
+        return None
+    return Path(settings.log_index_path).resolve()
+
+
+def build_log_index_handler(settings: AppSettings) -> LogIndexHandler | None:
+    """Create the sink handler, backfilling an empty store from existing log files."""
+
+    path = log_index_path(settings)
+    if path is None:
+        return None
+    store = get_log_store(settings)
+    if store is not None:
+        store.backfill(settings.logs_path)
+    return LogIndexHandler(path, retention_days=settings.log_index_retention_days)
+
+
+def get_log_store(settings: AppSettings) -> LogStore | None:
+    """Return the shared read-side store, or ``None`` when the index is disabled."""
+
+    path = log_index_path(settings)
+    if path is None:
+        return None
+    with _LOG_STORE_LOCK:
+        if _LOG_STORE.store is None or _LOG_STORE.path != path:
+            if _LOG_STORE.store is not None:
+                _LOG_STORE.store.close()
+            _LOG_STORE.store = LogStore(path)
+            _LOG_STORE.path = path
+        return _LOG_STORE.store
+
+
+def recent_events(
+    settings: AppSettings, names: Sequence[str], query: LogQuery
+) -> list[dict[str, Any]]:
+    """Records of the named events, newest first, from the index or else the JSON logs."""
+
+    store = get_log_store(settings)
+    if store is not None:
+        return store.events(names, query)
+    wanted = set(names)
+    matched: list[dict[str, Any]] = []
+    for record in iter_log_file_records(Path(settings.logs_path)):
+        if str(record.get("event") or record.get("message") or "") not in wanted:
+            continue
+        ts = _parse_timestamp(record.get("timestamp") or record.get("time"))
+        if ts is None:
+            continue
+        if (query.since is not None and ts < query.since) or (
+            query.until is not None and ts > query.until
+        ):
+            continue
+        matched.append(record)
+    matched.reverse()
+    return matched[query.offset : query.offset + query.limit]
+
+
+def reset_log_store() -> None:
+    with _LOG_STORE_LOCK:
+        if _LOG_STORE.store is not None:
+            _LOG_STORE.store.close()
+        _LOG_STORE.store = None
+        _LOG_STORE.path = None
@@ -1,20 +1,55 @@
-"""Structured logging utilities."""
+"""Structured logging utilities.
+
+With ``LOG_ASYNC`` enabled (the default) the ``atticus`` logger only carries a
+:class:`DroppingQueueHandler`; a :class:`~logging.handlers.QueueListener` thread owns
+the file and stream handlers, so JSON encoding and disk writes happen off the request
+path. The queue is bounded (``LOG_QUEUE_SIZE``); when it is full new records are
+dropped and counted rather than blocking the caller.
+"""
 
 from __future__ import annotations
 
+import atexit
+import copy
+import importlib
 import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Any
 
 from .config import AppSettings
 
+try:  # pragma: no cover - optional dependency
+    _orjson: Any | None = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    """Encode values JSON has no type for; shared so both encoders write the same line."""
+
+    if isinstance(value, Enum):
+        return value.value
+    tolist = getattr(value, "tolist", None)  # NumPy arrays and scalars
+    if callable(tolist):
+        return tolist()
+    return str(value)
+
 
 class JsonFormatter(logging.Formatter):
-    """Formats log records as JSON lines."""
+    """Formats log records as JSON lines, using orjson when it is installed."""
 
-    def format(self, record: logging.LogRecord) -> str:
+    def __init__(self, *, use_orjson: bool | None = None) -> None:
+        super().__init__()
+        self.use_orjson = (_orjson is not None) if use_orjson is None else use_orjson
+        if self.use_orjson and _orjson is None:
+            raise RuntimeError("orjson is not installed")
+
+    def to_payload(self, record: logging.LogRecord) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "level": record.levelname.lower(),
             "logger": record.name,
@@ -29,8 +64,61 @@ class JsonFormatter(logging.Formatter):
 
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return payload
 
-        return json.dumps(payload, ensure_ascii=False)
+    def format(self, record: logging.LogRecord) -> str:
+        payload = self.to_payload(record)
+        if self.use_orjson:
+            assert _orjson is not None
+            # Datetimes and dataclasses go through ``_json_default`` as in the stdlib path
+            # instead of orjson's native encodings.
+            encoded: bytes = _orjson.dumps(
+                payload,
+                default=_json_default,
+                option=_orjson.OPT_NON_STR_KEYS
+                | _orjson.OPT_PASSTHROUGH_DATETIME
+                | _orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+            return encoded.decode("utf-8")
+        return json.dumps(payload, ensure_ascii=False, default=_json_default)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that never blocks: records beyond the queue bound are counted."""
+
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]) -> None:
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+        self._count_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback text now (the listener thread cannot see
+        # the caller's frames), but leave JSON encoding to the listener's formatter.
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._count_lock:
+                self.dropped += 1
+            return
+        with self._count_lock:
+            self.enqueued += 1
+
+
+_LISTENER_LOCK = threading.Lock()
+_QUEUE_HANDLER: DroppingQueueHandler | None = None
+_LISTENER: QueueListener | None = None
 
 
 def _build_file_handler(path: Path) -> RotatingFileHandler:
@@ -39,39 +127,103 @@ def _build_file_handler(path: Path) -> RotatingFileHandler:
     return handler
 
 
+def _build_sink_handlers(settings: AppSettings) -> list[logging.Handler]:
+    formatter: logging.Formatter
+    if settings.log_format.lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s %(levelname)s [%(name)s] %(message)s",
+            datefmt="%Y-%m-%dT%H:%M:%S%z",
+        )
+
+    file_handler = _build_file_handler(settings.logs_path)
+    file_handler.setFormatter(formatter)
+
+    error_handler = _build_file_handler(settings.errors_path)
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [file_handler, error_handler, stream_handler]
+
+    # Imported lazily: the log store reuses JsonFormatter from this module.
+    from .log_store import build_log_index_handler  # noqa: PLC0415
+
+    index_handler = build_log_index_handler(settings)
+    if index_handler is not None:
+        handlers.append(index_handler)
+    return handlers
+
+
+def _start_listener(handlers: list[logging.Handler], queue_size: int) -> DroppingQueueHandler:
+    global _QUEUE_HANDLER, _LISTENER
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    with _LISTENER_LOCK:
+        _QUEUE_HANDLER, _LISTENER = queue_handler, listener
+    return queue_handler
+
+
 def configure_logging(settings: AppSettings) -> logging.Logger:
     """Return a configured root logger for the service."""
 
     logger = logging.getLogger("atticus")
     if not logger.handlers:
         logger.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
-        formatter: logging.Formatter
-        if settings.log_format.lower() == "json":
-            formatter = JsonFormatter()
+        handlers = _build_sink_handlers(settings)
+        if settings.log_async:
+            logger.addHandler(_start_listener(handlers, settings.log_queue_size))
         else:
-            formatter = logging.Formatter(
-                "%(asctime)s %(levelname)s [%(name)s] %(message)s",
-                datefmt="%Y-%m-%dT%H:%M:%S%z",
-            )
-
-        file_handler = _build_file_handler(settings.logs_path)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-
-        error_handler = _build_file_handler(settings.errors_path)
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(formatter)
-        logger.addHandler(error_handler)
-
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+            for handler in handlers:
+                logger.addHandler(handler)
 
         # Prevent propagation to root handlers (avoids console encoding issues on Windows)
         logger.propagate = False
     return logger
 
 
+def logging_queue_stats() -> dict[str, int] | None:
+    """Return queue depth and drop counters, or ``None`` when logging is synchronous."""
+
+    with _LISTENER_LOCK:
+        handler = _QUEUE_HANDLER
+    if handler is None:
+        return None
+    log_queue = handler.queue
+    assert isinstance(log_queue, queue.Queue)
+    return {
+        "capacity": log_queue.maxsize,
+        "depth": log_queue.qsize(),
+        "enqueued": handler.enqueued,
+        "dropped": handler.dropped,
+    }
+
+
+def flush_logging() -> None:
+    """Block until every queued record has been written by the listener."""
+
+    with _LISTENER_LOCK:
+        handler, listener = _QUEUE_HANDLER, _LISTENER
+    if handler is None or listener is None:
+        return
+    log_queue = handler.queue
+    assert isinstance(log_queue, queue.Queue)
+    log_queue.join()
+
+
+@atexit.register
+def _stop_listener() -> None:
+    global _LISTENER
+    with _LISTENER_LOCK:
+        listener, _LISTENER = _LISTENER, None
+    if listener is not None:
+        listener.stop()
+
+
 def log_event(logger: logging.Logger, event: str, **payload: Any) -> None:
     if "trace_id" not in payload and "request_id" in payload:
         payload["trace_id"] = payload["request_id"]
@@ -1,15 +1,90 @@
-"""Simple metrics aggregator for Atticus."""
+"""Simple metrics aggregator for Atticus.
+
+Latencies are kept in mergeable :class:`~atticus.sketch.QuantileSketch` instances:
+end-to-end ``/ask`` latency, every route, and every pipeline stage
+(:mod:`atticus.stages`). With ``METRICS_SHARED_DIR`` set, each worker periodically
+publishes its sketches to ``worker-<hostname>-<pid>-<token>.json`` there and
+:meth:`aggregate` merges the files of all live workers, so quantiles cover the whole
+host. The hostname and per-process token keep containers (where every worker may be
+PID 1) from overwriting each other's files. Liveness is checked by PID only for files
+from the same hostname; other hosts' files are removed by their own :meth:`withdraw`.
+"""
 
 from __future__ import annotations
 
 import csv
+import json
 import logging
+import os
+import secrets
+import socket
+import time
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from .config import AppSettings
 from .logging import log_event
+from .sketch import QuantileSketch
+
+_LATENCY_BUCKETS = (("0-250", 250.0), ("250-500", 500.0), ("500-1000", 1000.0))
+_PROMETHEUS_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+@dataclass(slots=True)
+class LatencySketches:
+    """Route and stage sketches; the unit that workers share and merge."""
+
+    routes: dict[str, QuantileSketch] = field(default_factory=dict)
+    stages: dict[str, QuantileSketch] = field(default_factory=dict)
+
+    def merge(self, other: LatencySketches) -> None:
+        for target, source in ((self.routes, other.routes), (self.stages, other.stages)):
+            for name, sketch in source.items():
+                target.setdefault(name, QuantileSketch()).merge(sketch)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "routes": {name: sketch.to_dict() for name, sketch in self.routes.items()},
+            "stages": {name: sketch.to_dict() for name, sketch in self.stages.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> LatencySketches:
+        return cls(
+            routes={
+                name: QuantileSketch.from_dict(data)
+                for name, data in (payload.get("routes") or {}).items()
+            },
+            stages={
+                name: QuantileSketch.from_dict(data)
+                for name, data in (payload.get("stages") or {}).items()
+            },
+        )
+
+
+_HOSTNAME = socket.gethostname()
+
+
+def _parse_worker_file(path: Path) -> tuple[str, int, str] | None:
+    """``(hostname, pid, token)`` from a ``worker-<hostname>-<pid>-<token>.json`` name."""
+
+    parts = path.stem.removeprefix("worker-").rsplit("-", 2)
+    if len(parts) != 3 or not parts[1].isdigit():
+        return None
+    return parts[0], int(parts[1]), parts[2]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:  # pragma: no cover - exists but owned by another user
+        return True
+    return True
 
 
 @dataclass(slots=True)
@@ -20,7 +95,11 @@ class MetricsRecorder:
     total_confidence: float = 0.0
     escalations: int = 0
     total_latency_ms: float = 0.0
-    latency_samples: list[float] = field(default_factory=list)
+    latency_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    latency_buckets: dict[str, int] = field(
+        default_factory=lambda: {"0-250": 0, "250-500": 0, "500-1000": 0, "1000+": 0}
+    )
+    sketches: LatencySketches = field(default_factory=LatencySketches)
     recent_trace_ids: list[str] = field(default_factory=list)
     trace_id_limit: int = 50
     prompt_tokens_total: int = 0
@@ -28,6 +107,8 @@ class MetricsRecorder:
     window_prompt_tokens: int = 0
     window_answer_tokens: int = 0
     window_queries: int = 0
+    _last_publish: float = 0.0
+    _token: str = field(default_factory=lambda: secrets.token_hex(4))
 
     def record(
         self,
@@ -43,9 +124,8 @@ class MetricsRecorder:
         self.queries += 1
         self.total_confidence += confidence
         self.total_latency_ms += latency_ms
-        self.latency_samples.append(latency_ms)
-        if len(self.latency_samples) > 500:
-            self.latency_samples = self.latency_samples[-500:]
+        self.latency_sketch.add(latency_ms)
+        self.latency_buckets[_latency_bucket(latency_ms)] += 1
         if escalated:
             self.escalations += 1
         if trace_id:
@@ -78,25 +158,120 @@ class MetricsRecorder:
             self.window_prompt_tokens = 0
             self.window_answer_tokens = 0
 
-    def _latency_percentile(self, percentile: float) -> float:
-        if not self.latency_samples:
-            return 0.0
-        ordered = sorted(self.latency_samples)
-        index = int(round((percentile / 100.0) * (len(ordered) - 1)))
-        return float(ordered[index])
+    def record_request(
+        self,
+        route: str,
+        latency_ms: float,
+        stages: Mapping[str, float] | None = None,
+    ) -> None:
+        """Add one request's latency to its route sketch and its stage timings."""
+
+        self.sketches.routes.setdefault(route, QuantileSketch()).add(latency_ms)
+        for name, elapsed_ms in (stages or {}).items():
+            self.sketches.stages.setdefault(name, QuantileSketch()).add(elapsed_ms)
+        interval = float(self.settings.metrics_publish_interval_seconds)
+        now = time.monotonic()
+        if self.settings.metrics_shared_dir is not None and now - self._last_publish >= interval:
+            self.publish(now=now)
+
+    def _worker_path(self) -> Path | None:
+        shared_dir = self.settings.metrics_shared_dir
+        if shared_dir is None:
+            return None
+        return Path(shared_dir) / f"worker-{_HOSTNAME}-{os.getpid()}-{self._token}.json"
+
+    def publish(self, *, now: float | None = None) -> None:
+        """Write this worker's sketches for other workers to merge (atomic replace)."""
+
+        path = self._worker_path()
+        self._last_publish = time.monotonic() if now is None else now
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.sketches.to_dict()), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def withdraw(self) -> None:
+        """Remove this worker's shared file (shutdown)."""
+
+        path = self._worker_path()
+        if path is not None:
+            path.unlink(missing_ok=True)
+
+    def aggregate(self) -> LatencySketches:
+        """Merge this worker's live sketches with the files of other live workers."""
+
+        merged = LatencySketches()
+        merged.merge(self.sketches)
+        own_path = self._worker_path()
+        if own_path is None or not own_path.parent.exists():
+            return merged
+        for path in own_path.parent.glob("worker-*.json"):
+            if path == own_path:
+                continue
+            owner = _parse_worker_file(path)
+            if owner is None:
+                continue
+            hostname, pid, _ = owner
+            # PIDs are only meaningful on this host; other containers withdraw their own.
+            if hostname == _HOSTNAME and not _pid_alive(pid):
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            merged.merge(LatencySketches.from_dict(payload))
+        return merged
+
+    def quantile_summary(self) -> dict[str, dict[str, dict[str, float]]]:
+        merged = self.aggregate()
+        return {
+            "routes": {name: sketch.summary() for name, sketch in sorted(merged.routes.items())},
+            "stages": {name: sketch.summary() for name, sketch in sorted(merged.stages.items())},
+        }
+
+    def prometheus_text(self) -> str:
+        """Render host-wide route/stage latency summaries in Prometheus text format."""
+
+        merged = self.aggregate()
+        lines: list[str] = []
+        for metric, label, sketches, help_text in (
+            (
+                "atticus_request_latency_ms",
+                "route",
+                merged.routes,
+                "Request latency by route in milliseconds.",
+            ),
+            (
+                "atticus_stage_latency_ms",
+                "stage",
+                merged.stages,
+                "Pipeline stage latency per request in milliseconds.",
+            ),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            for name, sketch in sorted(sketches.items()):
+                value = name.replace("\\", "\\\\").replace('"', '\\"')
+                for q in _PROMETHEUS_QUANTILES:
+                    lines.append(
+                        f'{metric}{{{label}="{value}",quantile="{q}"}} {sketch.quantile(q):.3f}'
+                    )
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {sketch.total:.3f}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {sketch.count}')
+        snapshot = self.snapshot()
+        lines.append("# HELP atticus_ask_queries_total Answered /ask queries in this worker.")
+        lines.append("# TYPE atticus_ask_queries_total counter")
+        lines.append(f"atticus_ask_queries_total {snapshot['queries']}")
+        lines.append("# HELP atticus_ask_escalations_total Escalated /ask answers in this worker.")
+        lines.append("# TYPE atticus_ask_escalations_total counter")
+        lines.append(f"atticus_ask_escalations_total {snapshot['escalations']}")
+        return "\n".join(lines) + "\n"
 
     def latency_histogram(self) -> dict[str, int]:
-        buckets = {"0-250": 0, "250-500": 0, "500-1000": 0, "1000+": 0}
-        for value in self.latency_samples:
-            if value < 250:
-                buckets["0-250"] += 1
-            elif value < 500:
-                buckets["250-500"] += 1
-            elif value < 1000:
-                buckets["500-1000"] += 1
-            else:
-                buckets["1000+"] += 1
-        return buckets
+        return dict(self.latency_buckets)
 
     def snapshot(self) -> dict[str, float | int]:
         if self.queries == 0:
@@ -115,7 +290,7 @@ class MetricsRecorder:
             "avg_confidence": round(self.total_confidence / self.queries, 3),
             "escalations": self.escalations,
             "avg_latency_ms": round(self.total_latency_ms / self.queries, 2),
-            "p95_latency_ms": round(self._latency_percentile(95), 2),
+            "p95_latency_ms": round(self.latency_sketch.quantile(0.95), 2),
             "prompt_tokens": self.prompt_tokens_total,
             "answer_tokens": self.answer_tokens_total,
             "estimated_cost_usd": round(
@@ -173,10 +348,20 @@ class MetricsRecorder:
         self.total_confidence = 0.0
         self.escalations = 0
         self.total_latency_ms = 0.0
-        self.latency_samples.clear()
+        self.latency_sketch = QuantileSketch()
+        self.sketches = LatencySketches()
+        for bucket in self.latency_buckets:
+            self.latency_buckets[bucket] = 0
         self.recent_trace_ids.clear()
         self.prompt_tokens_total = 0
         self.answer_tokens_total = 0
         self.window_prompt_tokens = 0
         self.window_answer_tokens = 0
         self.window_queries = 0
+
+
+def _latency_bucket(latency_ms: float) -> str:
+    for name, upper in _LATENCY_BUCKETS:
+        if latency_ms < upper:
+            return name
+    return "1000+"
@@ -0,0 +1,199 @@
+"""Process-wide OpenAI clients sharing one keep-alive connection pool.
+
+Constructing ``OpenAI(...)`` per request throws away the underlying HTTP pool, so
+every call pays DNS, TCP and TLS setup again. The embedding and generation clients
+instead borrow these singletons, which are rebuilt only when the API key or the
+pool/timeout settings change. A superseded client is not closed under requests that
+still hold it: its pool closes once the last reference is dropped.
+``reset_openai_clients`` closes the pools immediately (tests, shutdown).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, cast
+
+from core.config import AppSettings
+
+
+@dataclass(slots=True)
+class _OpenAIClients:
+    config: tuple[Any, ...] | None = None
+    sync_client: Any | None = None
+    async_client: Any | None = None
+    sync_http: Any | None = None
+    async_http: Any | None = None
+
+
+_CLIENTS = _OpenAIClients()
+_CLIENTS_LOCK = threading.Lock()
+# Pending ``aclose()`` tasks; the loop only keeps weak references to tasks.
+_CLOSE_TASKS: set[asyncio.Task[Any]] = set()
+
+
+def _client_config(settings: AppSettings) -> tuple[Any, ...] | None:
+    api_key = getattr(settings, "openai_api_key", None)
+    if not api_key:
+        return None
+    return (
+        str(api_key),
+        int(settings.openai_max_connections),
+        int(settings.openai_max_keepalive_connections),
+        float(settings.openai_keepalive_expiry_seconds),
+        float(settings.openai_timeout_seconds),
+        float(settings.openai_connect_timeout_seconds),
+        int(settings.openai_max_retries),
+    )
+
+
+def _pool_options(config: tuple[Any, ...]) -> dict[str, Any]:
+    httpx = cast(Any, importlib.import_module("httpx"))
+    _, max_connections, max_keepalive, keepalive_expiry, timeout, connect_timeout, _ = config
+    return {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(timeout, connect=connect_timeout),
+    }
+
+
+def _run_async_close(close: Any) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    try:
+        if loop is not None:
+            task = loop.create_task(close())
+            _CLOSE_TASKS.add(task)
+            task.add_done_callback(_CLOSE_TASKS.discard)
+        else:
+            asyncio.run(close())
+    except Exception:  # pragma: no cover - best effort cleanup
+        pass
+
+
+def _close_clients(sync_client: Any | None, async_client: Any | None) -> None:
+    if sync_client is not None:
+        try:
+            sync_client.close()
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
+    if async_client is not None:
+        _run_async_close(async_client.close)
+
+
+def _close_http(http_client: Any) -> None:
+    aclose = getattr(http_client, "aclose", None)
+    if aclose is not None:
+        _run_async_close(aclose)
+        return
+    try:
+        http_client.close()
+    except Exception:  # pragma: no cover - best effort cleanup
+        pass
+
+
+def _retire(client: Any | None, http_client: Any | None) -> None:
+    """Close ``client``'s pool once nothing references the client any more."""
+
+    if client is not None and http_client is not None:
+        weakref.finalize(client, _close_http, http_client)
+
+
+def _ensure_config(config: tuple[Any, ...]) -> None:
+    """Swap in a new configuration (lock held).
+
+    Requests may still be using the superseded clients, so they are retired (closed when
+    the last reference goes away) rather than closed here.
+    """
+
+    if _CLIENTS.config != config:
+        _retire(_CLIENTS.sync_client, _CLIENTS.sync_http)
+        _retire(_CLIENTS.async_client, _CLIENTS.async_http)
+        _CLIENTS.sync_client = _CLIENTS.sync_http = None
+        _CLIENTS.async_client = _CLIENTS.async_http = None
+        _CLIENTS.config = config
+
+
+def _log_initialized(logger: logging.Logger | None, kind: str, config: tuple[Any, ...]) -> None:
+    (logger or logging.getLogger("atticus")).info(
+        "openai_client_initialized",
+        extra={
+            "extra_payload": {
+                "client": kind,
+                "source": "settings",
+                "key_fp": hashlib.sha256(config[0].encode("utf-8")).hexdigest()[:12],
+                "max_connections": config[1],
+                "max_keepalive_connections": config[2],
+                "timeout_seconds": config[4],
+            }
+        },
+    )
+
+
+def get_openai_client(settings: AppSettings, logger: logging.Logger | None = None) -> Any | None:
+    """Return the shared synchronous client, or ``None`` without an API key."""
+
+    config = _client_config(settings)
+    if config is None:
+        return None
+    with _CLIENTS_LOCK:
+        _ensure_config(config)
+        if _CLIENTS.sync_client is None:
+            openai_module = cast(Any, importlib.import_module("openai"))
+            httpx = cast(Any, importlib.import_module("httpx"))
+            options = _pool_options(config)
+            _CLIENTS.sync_http = httpx.Client(**options)
+            _CLIENTS.sync_client = openai_module.OpenAI(
+                api_key=config[0],
+                timeout=options["timeout"],
+                max_retries=config[6],
+                http_client=_CLIENTS.sync_http,
+            )
+            _log_initialized(logger, "sync", config)
+        return _CLIENTS.sync_client
+
+
+def get_async_openai_client(
+    settings: AppSettings, logger: logging.Logger | None = None
+) -> Any | None:
+    """Return the shared ``AsyncOpenAI`` client, or ``None`` without an API key."""
+
+    config = _client_config(settings)
+    if config is None:
+        return None
+    with _CLIENTS_LOCK:
+        _ensure_config(config)
+        if _CLIENTS.async_client is None:
+            openai_module = cast(Any, importlib.import_module("openai"))
+            httpx = cast(Any, importlib.import_module("httpx"))
+            options = _pool_options(config)
+            _CLIENTS.async_http = httpx.AsyncClient(**options)
+            _CLIENTS.async_client = openai_module.AsyncOpenAI(
+                api_key=config[0],
+                timeout=options["timeout"],
+                max_retries=config[6],
+                http_client=_CLIENTS.async_http,
+            )
+            _log_initialized(logger, "async", config)
+        return _CLIENTS.async_client
+
+
+def reset_openai_clients() -> None:
+    """Close and forget the pooled clients so the next call rebuilds them."""
+
+    with _CLIENTS_LOCK:
+        sync_client, async_client = _CLIENTS.sync_client, _CLIENTS.async_client
+        _CLIENTS.sync_client = _CLIENTS.sync_http = None
+        _CLIENTS.async_client = _CLIENTS.async_http = None
+        _CLIENTS.config = None
+    _close_clients(sync_client, async_client)
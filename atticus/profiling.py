@@ -0,0 +1,309 @@
+"""On-demand profiling of a single query.
+
+:func:`profile_call` runs one callable (the ``/ask`` pipeline) under either a stack
+sampler or ``cProfile`` while capturing a trace (see :mod:`atticus.tracing`), and
+returns a :class:`ProfileReport` with per-stage timings, the retrieval span attributes
+(probes, vector rows, lexical candidates, filtered-out rows), memory footprints noted
+via :func:`note_memory_footprint`, the hottest functions, and a flamegraph-ready
+artifact: collapsed stacks (``flamegraph.pl``/speedscope) for the sampler, a
+``pstats`` dump (snakeviz/flameprof) for ``cProfile``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType, FunctionType, ModuleType
+from typing import Any, TypeVar
+
+from .tracing import capture_trace
+
+R = TypeVar("R")
+
+SAMPLE_PROFILER = "sample"
+CPROFILE_PROFILER = "cprofile"
+PROFILERS = (SAMPLE_PROFILER, CPROFILE_PROFILER)
+TOP_FUNCTIONS = 25
+
+_STAGE_SPAN_PREFIX = "stage."
+_RETRIEVAL_SPAN = "retriever.search"
+_PRIMITIVE_SIZES = {float: sys.getsizeof(0.0), int: sys.getsizeof(1), bool: 0}
+# cProfile hooks are process-wide on 3.12+ (sys.monitoring), so one session at a time.
+_CPROFILE_LOCK = threading.Lock()
+
+
+def deep_sizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Approximate retained size of ``obj`` in bytes, counting shared objects once.
+
+    Pass the same ``seen`` set across calls to attribute shared objects to the first
+    component that reaches them. Homogeneous lists of floats/ints (embeddings) are
+    sized arithmetically instead of element by element.
+    """
+
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, ModuleType, FunctionType)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            first = next(iter(current), None)
+            primitive = _PRIMITIVE_SIZES.get(type(first))
+            if primitive is not None and isinstance(current, list):
+                total += primitive * len(current)
+                continue
+            stack.extend(current)
+        else:
+            attributes = getattr(current, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for slot in getattr(type(current), "__slots__", ()):
+                value = getattr(current, slot, None)
+                if value is not None:
+                    stack.append(value)
+    return total
+
+
+@dataclass(slots=True)
+class QueryProfile:
+    memory: dict[str, dict[str, int]] = field(default_factory=dict)
+
+
+_CURRENT_PROFILE: ContextVar[QueryProfile | None] = ContextVar("atticus_profile", default=None)
+
+
+def note_memory_footprint(name: str, measure: Callable[[], dict[str, int]]) -> None:
+    """Record ``measure()`` under ``name`` when a profile is running (no-op otherwise)."""
+
+    profile = _CURRENT_PROFILE.get()
+    if profile is not None and name not in profile.memory:
+        profile.memory[name] = measure()
+
+
+def _frame_label(code: CodeType) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval into collapsed stacks.
+
+    Stacks are cut at ``anchor`` so only frames below the profiled call are kept.
+    Effective resolution is bounded by the interpreter's switch interval
+    (``sys.getswitchinterval()``, 5 ms by default) while the target holds the GIL.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float, anchor: CodeType) -> None:
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.anchor = anchor
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="atticus-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _collapse(self, frame: FrameType | None) -> str | None:
+        labels: list[str] = []
+        while frame is not None and frame.f_code is not self.anchor:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        return ";".join(reversed(labels)) or None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            key = self._collapse(sys._current_frames().get(self.thread_id))
+            if key is not None:
+                self.samples[key] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> list[dict[str, Any]]:
+        own: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            own[stack.rsplit(";", 1)[-1]] += count
+        return [
+            {
+                "function": function,
+                "samples": count,
+                "self_ms": round(count * self.interval_seconds * 1000, 2),
+            }
+            for function, count in own.most_common(limit)
+        ]
+
+
+def _cprofile_top_functions(profiler: cProfile.Profile, limit: int) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)  # type: ignore[attr-defined]
+    return [
+        {
+            "function": f"{name} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "self_ms": round(own_seconds * 1000, 3),
+            "cumulative_ms": round(cumulative_seconds * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, own_seconds, cumulative_seconds, _) in rows[:limit]
+    ]
+
+
+@dataclass(slots=True)
+class ProfileReport:
+    profile_id: str
+    profiler: str
+    wall_ms: float
+    stages_ms: dict[str, float]
+    retrieval: list[dict[str, Any]]
+    tokens: dict[str, int]
+    memory: dict[str, dict[str, int]]
+    top_functions: list[dict[str, Any]]
+    spans: list[dict[str, Any]]
+    artifact_path: str | None = None
+    artifact_format: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def write(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.profile_id}.json"
+        path.write_text(json.dumps(self.to_dict(), default=str, indent=2), encoding="utf-8")
+        return path
+
+
+@contextmanager
+def _profiling(profile: QueryProfile) -> Iterator[None]:
+    token = _CURRENT_PROFILE.set(profile)
+    try:
+        yield
+    finally:
+        _CURRENT_PROFILE.reset(token)
+
+
+def profile_call(  # noqa: UP047
+    func: Callable[[], R],
+    *,
+    profile_id: str,
+    trace_id: str,
+    profiler: str = SAMPLE_PROFILER,
+    sample_interval_ms: float = 5.0,
+    artifact_dir: Path | None = None,
+) -> tuple[R, ProfileReport]:
+    """Run ``func`` in the calling thread under ``profiler`` and report on it."""
+
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler!r}; expected one of {PROFILERS}")
+
+    if profiler == CPROFILE_PROFILER and not _CPROFILE_LOCK.acquire(blocking=False):
+        raise RuntimeError("Another cProfile session is already running")
+    try:
+        return _profile_call(
+            func,
+            profile_id=profile_id,
+            trace_id=trace_id,
+            profiler=profiler,
+            sample_interval_ms=sample_interval_ms,
+            artifact_dir=artifact_dir,
+        )
+    finally:
+        if profiler == CPROFILE_PROFILER:
+            _CPROFILE_LOCK.release()
+
+
+def _profile_call(  # noqa: UP047
+    func: Callable[[], R],
+    *,
+    profile_id: str,
+    trace_id: str,
+    profiler: str,
+    sample_interval_ms: float,
+    artifact_dir: Path | None,
+) -> tuple[R, ProfileReport]:
+    query_profile = QueryProfile()
+    sampler: StackSampler | None = None
+    deterministic: cProfile.Profile | None = None
+    start = time.perf_counter()
+    with _profiling(query_profile), capture_trace("profile", trace_id=trace_id) as trace:
+        if profiler == CPROFILE_PROFILER:
+            deterministic = cProfile.Profile()
+            deterministic.enable()
+        else:
+            sampler = StackSampler(
+                threading.get_ident(),
+                max(sample_interval_ms, 0.1) / 1000,
+                anchor=_profile_call.__code__,
+            )
+            sampler.start()
+        try:
+            result = func()
+        finally:
+            if deterministic is not None:
+                deterministic.disable()
+            if sampler is not None:
+                sampler.stop()
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    spans = [item.to_dict() for item in trace.spans]
+    stages_ms: dict[str, float] = {}
+    retrieval: list[dict[str, Any]] = []
+    for item in spans:
+        if item["name"].startswith(_STAGE_SPAN_PREFIX):
+            name = item["name"][len(_STAGE_SPAN_PREFIX) :]
+            stages_ms[name] = round(stages_ms.get(name, 0.0) + item["duration_ms"], 3)
+        elif item["name"] == _RETRIEVAL_SPAN:
+            retrieval.append(dict(item["attributes"], duration_ms=item["duration_ms"]))
+
+    artifact_path: Path | None = None
+    artifact_format: str | None = None
+    if deterministic is not None:
+        top_functions = _cprofile_top_functions(deterministic, TOP_FUNCTIONS)
+        if artifact_dir is not None:
+            artifact_dir.mkdir(parents=True, exist_ok=True)
+            artifact_path = artifact_dir / f"{profile_id}.prof"
+            deterministic.dump_stats(artifact_path)
+            artifact_format = "pstats"
+    else:
+        assert sampler is not None
+        top_functions = sampler.top_functions()
+        if artifact_dir is not None:
+            artifact_dir.mkdir(parents=True, exist_ok=True)
+            artifact_path = artifact_dir / f"{profile_id}.collapsed"
+            artifact_path.write_text(sampler.collapsed(), encoding="utf-8")
+            artifact_format = "collapsed"
+
+    report = ProfileReport(
+        profile_id=profile_id,
+        profiler=profiler,
+        wall_ms=round(wall_ms, 3),
+        stages_ms=stages_ms,
+        retrieval=retrieval,
+        tokens={},
+        memory=query_profile.memory,
+        top_functions=top_functions,
+        spans=spans,
+        artifact_path=str(artifact_path) if artifact_path is not None else None,
+        artifact_format=artifact_format,
+    )
+    return result, report
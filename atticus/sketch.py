@@ -0,0 +1,107 @@
+"""Mergeable streaming quantile sketch for latency metrics.
+
+Values are counted in logarithmic buckets (DDSketch/HDR style): each bucket spans a
+``1 ± relative_accuracy`` band, so any quantile is reported within that relative error
+using O(log(max/min)) memory, inserts are O(1), and two sketches merge by adding
+bucket counts, which lets workers combine their data through a shared file.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+# Values below this (in the recorded unit, milliseconds for latencies) count as zero.
+MIN_TRACKED_VALUE = 1e-3
+
+
+@dataclass(slots=True)
+class QuantileSketch:
+    relative_accuracy: float = 0.01
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = 0.0
+    zero_count: int = 0
+    buckets: dict[int, int] = field(default_factory=dict)
+    _gamma: float = field(init=False, repr=False)
+    _log_gamma: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self._gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def add(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if value < MIN_TRACKED_VALUE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other: QuantileSketch) -> None:
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.zero_count += other.zero_count
+        for key, bucket_count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + bucket_count
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                estimate = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(estimate, self.minimum), self.maximum)
+        return self.maximum
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, quantiles: tuple[float, ...] = (0.5, 0.9, 0.95, 0.99)) -> dict[str, float]:
+        payload: dict[str, float] = {"count": self.count, "mean": round(self.mean, 2)}
+        for q in quantiles:
+            payload[f"p{round(q * 100):d}"] = round(self.quantile(q), 2)
+        payload["max"] = round(self.maximum, 2)
+        return payload
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum if self.count else None,
+            "maximum": self.maximum,
+            "zero_count": self.zero_count,
+            "buckets": {str(key): value for key, value in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> QuantileSketch:
+        minimum = payload.get("minimum")
+        return cls(
+            relative_accuracy=float(payload.get("relative_accuracy", 0.01)),
+            count=int(payload.get("count", 0)),
+            total=float(payload.get("total", 0.0)),
+            minimum=math.inf if minimum is None else float(minimum),
+            maximum=float(payload.get("maximum", 0.0)),
+            zero_count=int(payload.get("zero_count", 0)),
+            buckets={int(key): int(value) for key, value in payload.get("buckets", {}).items()},
+        )
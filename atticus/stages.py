@@ -0,0 +1,93 @@
+"""Per-request pipeline stage timing.
+
+``RequestContextMiddleware`` opens a collector for each request with
+:func:`collect_stages`; retrieval and generation code wraps its hot sections in
+:func:`stage`. The collector travels in a context variable, so it follows the request
+into ``run_in_threadpool`` workers. Outside a request (CLI, eval) ``stage`` only reads
+the context variables and does nothing else. When a trace is active (see
+:mod:`atticus.tracing`) each stage is also recorded as a ``stage.<name>`` span.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from .tracing import record_span, span, tracing_active
+
+EMBEDDING_STAGE = "embedding"
+SQL_STAGE = "sql"
+VECTOR_STAGE = "vector"
+LEXICAL_STAGE = "lexical"
+FUZZ_STAGE = "fuzz"
+GENERATION_STAGE = "generation"
+FORMATTING_STAGE = "formatting"
+PIPELINE_STAGES = (
+    EMBEDDING_STAGE,
+    SQL_STAGE,
+    VECTOR_STAGE,
+    LEXICAL_STAGE,
+    FUZZ_STAGE,
+    GENERATION_STAGE,
+    FORMATTING_STAGE,
+)
+
+
+@dataclass(slots=True)
+class StageTimings:
+    """Milliseconds spent per stage during one request (summed across calls)."""
+
+    durations_ms: dict[str, float] = field(default_factory=dict)
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.durations_ms[name] = self.durations_ms.get(name, 0.0) + elapsed_ms
+
+
+_CURRENT_TIMINGS: ContextVar[StageTimings | None] = ContextVar(
+    "atticus_stage_timings", default=None
+)
+
+
+def current_stage_timings() -> StageTimings | None:
+    return _CURRENT_TIMINGS.get()
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimings]:
+    """Collect stage timings for everything executed inside the block."""
+
+    timings = StageTimings()
+    token = _CURRENT_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _CURRENT_TIMINGS.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time the block as ``name`` when a collector is active."""
+
+    timings = _CURRENT_TIMINGS.get()
+    if timings is None and not tracing_active():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        with span(f"stage.{name}"):
+            yield
+    finally:
+        if timings is not None:
+            timings.add(name, (time.perf_counter() - start) * 1000)
+
+
+def record_stage(name: str, elapsed_ms: float) -> None:
+    """Add an externally measured duration (e.g. summed inside a loop)."""
+
+    timings = _CURRENT_TIMINGS.get()
+    if timings is not None:
+        timings.add(name, elapsed_ms)
+    record_span(f"stage.{name}", elapsed_ms)
@@ -1,20 +1,99 @@
-"""Tokenization utilities for chunking."""
+"""Tokenization utilities for chunking.
+
+Token counts are memoized in a bounded LRU keyed by the string's hash and length (so
+lookups cost one hash, which ``str`` caches on the object, and the memo never keeps
+whole section texts alive after ingest), which makes repeated ``count_tokens`` and
+``truncate_text`` calls on the same question, answer, or context chunk free. Counts
+recorded at ingest can be seeded with :func:`remember_token_count` so the request path
+never re-tokenizes indexed chunks, and :func:`encode_batch` / :func:`count_tokens_batch`
+hand many strings to tiktoken's threaded batch encoder at once.
+"""
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from collections.abc import Iterable, Sequence
 from functools import lru_cache
 
 import tiktoken
 
+TOKEN_COUNT_CACHE_SIZE = 8192
+BATCH_THREADS = 8
+
 
 @lru_cache(maxsize=1)
 def _encoding() -> tiktoken.Encoding:
     return tiktoken.get_encoding("cl100k_base")
 
 
+def _text_key(text: str) -> tuple[int, int]:
+    return hash(text), len(text)
+
+
+class _TokenCountCache:
+    """Thread-safe LRU of ``(hash(text), len(text)) -> token count``."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> int | None:
+        key = _text_key(text)
+        with self._lock:
+            count = self._entries.get(key)
+            if count is not None:
+                self._entries.move_to_end(key)
+            return count
+
+    def put(self, text: str, count: int) -> None:
+        key = _text_key(text)
+        with self._lock:
+            self._entries[key] = count
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_TOKEN_COUNTS = _TokenCountCache(TOKEN_COUNT_CACHE_SIZE)
+
+
+def reset_token_count_cache() -> None:
+    _TOKEN_COUNTS.clear()
+
+
+def remember_token_count(text: str, count: int) -> None:
+    """Seed the memo with a count computed elsewhere (e.g. ``token_count`` at ingest)."""
+
+    if text and count >= 0:
+        _TOKEN_COUNTS.put(text, count)
+
+
 def encode(text: str) -> list[int]:
-    return _encoding().encode(text, disallowed_special=())
+    tokens = _encoding().encode(text, disallowed_special=())
+    if text:
+        _TOKEN_COUNTS.put(text, len(tokens))
+    return tokens
+
+
+def encode_batch(texts: Sequence[str], num_threads: int = BATCH_THREADS) -> list[list[int]]:
+    """Encode ``texts`` in one call using tiktoken's thread pool."""
+
+    if not texts:
+        return []
+    batches = _encoding().encode_batch(list(texts), num_threads=num_threads, disallowed_special=())
+    for text, tokens in zip(texts, batches, strict=True):
+        if text:
+            _TOKEN_COUNTS.put(text, len(tokens))
+    return batches
 
 
 def decode(tokens: Sequence[int]) -> str:
@@ -22,15 +101,32 @@ def decode(tokens: Sequence[int]) -> str:
 
 
 def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    cached = _TOKEN_COUNTS.get(text)
+    if cached is not None:
+        return cached
     return len(encode(text))
 
 
+def count_tokens_batch(texts: Sequence[str], num_threads: int = BATCH_THREADS) -> list[int]:
+    """Token counts for ``texts``; memo misses are encoded together in one batch."""
+
+    counts: list[int | None] = [_TOKEN_COUNTS.get(text) if text else 0 for text in texts]
+    missing = [index for index, count in enumerate(counts) if count is None]
+    if missing:
+        encoded = encode_batch([texts[index] for index in missing], num_threads=num_threads)
+        for index, tokens in zip(missing, encoded, strict=True):
+            counts[index] = len(tokens)
+    return [count or 0 for count in counts]
+
+
 def truncate_text(text: str, limit: int) -> str:
     if limit <= 0:
         return ""
-    tokens = encode(text)
-    if len(tokens) <= limit:
+    if count_tokens(text) <= limit:
         return text
+    tokens = encode(text)
     return decode(tokens[:limit]).rstrip()
 
 
@@ -0,0 +1,374 @@
+"""Lightweight span tracing for the retrieval, generation, and ingestion pipelines.
+
+A trace is opened per request by ``RequestContextMiddleware`` (and per run by
+``ingest_corpus``) when ``TRACING_ENABLED`` is set; it reuses the request's
+``trace_id``. Code marks sections with :func:`span` or :func:`traced`; pipeline
+stages from :mod:`atticus.stages` become spans automatically. When the root span ends
+every span is logged as a ``trace_span`` event and the whole trace is appended to
+``TRACING_EXPORT_PATH`` as one OTLP/JSON ``ExportTraceServiceRequest`` line, the
+format the OpenTelemetry Collector's file receiver and ``otlpjsonfile`` read.
+
+With tracing disabled (or the request not sampled) :func:`span` costs a single
+context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from logging.handlers import QueueListener
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from .config import AppSettings
+from .logging import DroppingQueueHandler, log_event
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_SCOPE = {"name": "atticus", "version": "1"}
+
+
+def _otel_trace_id(trace_id: str) -> str:
+    lowered = trace_id.lower()
+    if _TRACE_ID_PATTERN.match(lowered):
+        return lowered
+    return hashlib.sha256(trace_id.encode("utf-8")).hexdigest()[:32]
+
+
+def _span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def _attribute_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace: Trace
+    span_id: str
+    parent_span_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+    def to_otlp(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "traceId": self.trace.otel_trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if self.parent_span_id is None else 1,  # SERVER root, INTERNAL children
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": _attribute_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_span_id:
+            payload["parentSpanId"] = self.parent_span_id
+        return payload
+
+
+@dataclass(slots=True)
+class Trace:
+    trace_id: str
+    otel_trace_id: str
+    service_name: str
+    logger: logging.Logger | None
+    exporter: OtlpFileExporter | None
+    spans: list[Span] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start_span(self, name: str, parent: Span | None, attributes: dict[str, Any]) -> Span:
+        span_obj = Span(
+            name=name,
+            trace=self,
+            span_id=_span_id(),
+            parent_span_id=parent.span_id if parent is not None else None,
+            start_ns=time.time_ns(),
+            attributes=dict(attributes),
+        )
+        with self._lock:
+            self.spans.append(span_obj)
+        return span_obj
+
+    def export(self) -> None:
+        with self._lock:
+            spans = [item for item in self.spans if item.end_ns is not None]
+        if self.logger is not None:
+            for item in spans:
+                log_event(
+                    self.logger,
+                    "trace_span",
+                    trace_id=self.trace_id,
+                    span_id=item.span_id,
+                    parent_span_id=item.parent_span_id,
+                    span=item.name,
+                    duration_ms=round(item.duration_ms, 3),
+                    attributes=item.attributes,
+                    error=item.error,
+                )
+        if self.exporter is not None and spans:
+            self.exporter.export(
+                {
+                    "resourceSpans": [
+                        {
+                            "resource": {
+                                "attributes": [
+                                    {
+                                        "key": "service.name",
+                                        "value": {"stringValue": self.service_name},
+                                    }
+                                ]
+                            },
+                            "scopeSpans": [
+                                {"scope": _SCOPE, "spans": [item.to_otlp() for item in spans]}
+                            ],
+                        }
+                    ]
+                }
+            )
+
+
+class OtlpFileExporter:
+    """Append OTLP/JSON lines from a background thread behind a bounded queue."""
+
+    def __init__(self, path: Path, *, max_queue: int = 1_000) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=max_queue)
+        self._handler = DroppingQueueHandler(log_queue)
+        self._listener = QueueListener(log_queue, file_handler)
+        self._listener.start()
+        # Standalone logger so exported traces never reach the application log.
+        self._logger = logging.Logger("atticus.otel_exporter")
+        self._logger.addHandler(self._handler)
+
+    @property
+    def dropped(self) -> int:
+        return self._handler.dropped
+
+    def export(self, payload: dict[str, Any]) -> None:
+        self._logger.info(json.dumps(payload, separators=(",", ":"), default=str))
+
+    def flush(self) -> None:
+        queue_obj = self._handler.queue
+        assert isinstance(queue_obj, queue.Queue)
+        queue_obj.join()
+
+    def shutdown(self) -> None:
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+
+
+_CURRENT_TRACE: ContextVar[Trace | None] = ContextVar("atticus_trace", default=None)
+_CURRENT_SPAN: ContextVar[Span | None] = ContextVar("atticus_span", default=None)
+
+_EXPORTERS: dict[Path, OtlpFileExporter] = {}
+_EXPORTERS_LOCK = threading.Lock()
+
+
+def _exporter_for(path: Path) -> OtlpFileExporter:
+    resolved = path.resolve()
+    with _EXPORTERS_LOCK:
+        exporter = _EXPORTERS.get(resolved)
+        if exporter is None:
+            exporter = OtlpFileExporter(resolved)
+            _EXPORTERS[resolved] = exporter
+        return exporter
+
+
+@atexit.register
+def shutdown_exporters() -> None:
+    with _EXPORTERS_LOCK:
+        exporters = list(_EXPORTERS.values())
+        _EXPORTERS.clear()
+    for exporter in exporters:
+        exporter.shutdown()
+
+
+def tracing_active() -> bool:
+    return _CURRENT_TRACE.get() is not None
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    *,
+    trace_id: str,
+    settings: AppSettings,
+    logger: logging.Logger | None = None,
+    **attributes: Any,
+) -> Iterator[Span | None]:
+    """Open the root span for ``trace_id`` if tracing is enabled and the trace is sampled.
+
+    Inside an active trace (e.g. ingestion started from an API request) this opens a
+    child span instead, so the work stays under the caller's ``trace_id``.
+    """
+
+    if _CURRENT_TRACE.get() is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+    if not settings.tracing_enabled or random.random() >= settings.tracing_sample_rate:
+        yield None
+        return
+    export_path = settings.tracing_export_path
+    trace = Trace(
+        trace_id=trace_id,
+        otel_trace_id=_otel_trace_id(trace_id),
+        service_name=settings.tracing_service_name,
+        logger=logger,
+        exporter=_exporter_for(Path(export_path)) if export_path else None,
+    )
+    trace_token = _CURRENT_TRACE.set(trace)
+    root = trace.start_span(name, None, {"atticus.trace_id": trace_id, **attributes})
+    span_token = _CURRENT_SPAN.set(root)
+    try:
+        yield root
+    except BaseException as exc:
+        root.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        root.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(span_token)
+        _CURRENT_TRACE.reset(trace_token)
+        trace.export()
+
+
+@contextmanager
+def capture_trace(name: str, *, trace_id: str, **attributes: Any) -> Iterator[Trace]:
+    """Record spans for the block regardless of ``TRACING_ENABLED``, without exporting.
+
+    Used by on-demand profiling. When a request trace is already active the captured
+    spans are also attached to it under the current span.
+    """
+
+    outer = _CURRENT_TRACE.get()
+    outer_span = _CURRENT_SPAN.get()
+    trace = Trace(
+        trace_id=trace_id,
+        otel_trace_id=outer.otel_trace_id if outer is not None else _otel_trace_id(trace_id),
+        service_name=outer.service_name if outer is not None else "atticus",
+        logger=None,
+        exporter=None,
+    )
+    trace_token = _CURRENT_TRACE.set(trace)
+    root = trace.start_span(name, outer_span, attributes)
+    span_token = _CURRENT_SPAN.set(root)
+    try:
+        yield trace
+    finally:
+        root.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(span_token)
+        _CURRENT_TRACE.reset(trace_token)
+        if outer is not None:
+            with trace._lock:
+                captured = list(trace.spans)
+            with outer._lock:
+                outer.spans.extend(captured)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Record the block as a child of the current span (no-op without an active trace)."""
+
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield None
+        return
+    span_obj = trace.start_span(name, _CURRENT_SPAN.get(), attributes)
+    token = _CURRENT_SPAN.set(span_obj)
+    try:
+        yield span_obj
+    except BaseException as exc:
+        span_obj.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        span_obj.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(token)
+
+
+def record_span(name: str, elapsed_ms: float, **attributes: Any) -> None:
+    """Add an already-measured span ending now (e.g. time summed inside a loop)."""
+
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        return
+    end_ns = time.time_ns()
+    span_obj = trace.start_span(name, _CURRENT_SPAN.get(), attributes)
+    span_obj.start_ns = end_ns - int(elapsed_ms * 1_000_000)
+    span_obj.end_ns = end_ns
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Annotate the current span, if any."""
+
+    if _CURRENT_TRACE.get() is None:
+        return
+    current = _CURRENT_SPAN.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator form of :func:`span`."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _CURRENT_TRACE.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -417,20 +417,41 @@ class PgVectorRepository:
         *,
         limit: int,
         probes: int | None = None,
+        chunk_ids: Sequence[str] | None = None,
     ) -> list[dict[str, Any]]:
+        """Nearest chunks to ``embedding``, restricted to ``chunk_ids`` when given.
+
+        The ``chunk_ids`` restriction is applied to the ivfflat scan's output, so a scope
+        sparse in the probed lists can yield fewer than ``limit`` rows. Keep the list short;
+        ``VectorStore`` sends broad scopes unrestricted and filters the rows itself.
+        """
+
         with self.connection() as conn, conn.cursor() as cur:
             if probes and probes > 0:
                 cur.execute(f"SET LOCAL ivfflat.probes = {int(probes)}")
-            cur.execute(
-                """
-                SELECT chunk_id, document_id, source_path, text, metadata, page_number, section,
-                       embedding <=> %s AS distance
-                FROM atticus_chunks
-                ORDER BY distance
-                LIMIT %s
-                """,
-                (Vector(embedding), limit),
-            )
+            if chunk_ids is None:
+                cur.execute(
+                    """
+                    SELECT chunk_id, document_id, source_path, text, metadata, page_number,
+                           section, embedding <=> %s AS distance
+                    FROM atticus_chunks
+                    ORDER BY distance
+                    LIMIT %s
+                    """,
+                    (Vector(embedding), limit),
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT chunk_id, document_id, source_path, text, metadata, page_number,
+                           section, embedding <=> %s AS distance
+                    FROM atticus_chunks
+                    WHERE chunk_id = ANY(%s)
+                    ORDER BY distance
+                    LIMIT %s
+                    """,
+                    (Vector(embedding), list(chunk_ids), limit),
+                )
             rows = cur.fetchall()
         formatted: list[dict[str, Any]] = []
         for row in rows:
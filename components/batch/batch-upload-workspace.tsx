@@ -226,12 +226,12 @@ async function resolveQuestion(question: string, product?: string): Promise<AskR
     topK: undefined,
     models: explicitModels,
   };
-  const primary = await streamAsk(baseRequest);
+  const primary = await streamAsk(baseRequest, { lane: "batch" });
   if (!primary.clarification?.options?.length) {
     return primary;
   }
   for (const option of primary.clarification.options) {
-    const followUp = await streamAsk({ ...baseRequest, models: [option.id] });
+    const followUp = await streamAsk({ ...baseRequest, models: [option.id] }, { lane: "batch" });
     if (!followUp.clarification) {
       return followUp;
     }
@@ -7,6 +7,7 @@ import json
 import os
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import lru_cache
 from ipaddress import ip_network
 from pathlib import Path
 from typing import Any, Literal, cast
@@ -64,6 +65,18 @@ class AppSettings(BaseSettings):
     pgvector_index_build_mem_mb: int = Field(
         default=256, alias="PGVECTOR_INDEX_BUILD_MEM_MB", ge=16
     )
+    vector_backend: Literal["pgvector", "matrix"] = Field(
+        default="pgvector", alias="VECTOR_BACKEND"
+    )
+    embedding_matrix_dir: Path = Field(
+        default=Path("indices/embeddings"), alias="EMBEDDING_MATRIX_DIR"
+    )
+    embedding_matrix_dtype: Literal["float16", "float32"] = Field(
+        default="float32", alias="EMBEDDING_MATRIX_DTYPE"
+    )
+    embedding_matrix_ivf_lists: int = Field(default=0, alias="EMBEDDING_MATRIX_IVF_LISTS", ge=0)
+    embedding_matrix_ivf_probes: int = Field(default=8, alias="EMBEDDING_MATRIX_IVF_PROBES", ge=1)
+    lexical_index_dir_setting: Path | None = Field(default=None, alias="LEXICAL_INDEX_DIR")
     prompt_token_limit: int = Field(default=1500, alias="PROMPT_TOKEN_LIMIT", ge=1)
     answer_token_limit: int = Field(default=1000, alias="ANSWER_TOKEN_LIMIT", ge=1)
     embedding_batch_size: int = Field(default=32, alias="EMBEDDING_BATCH_SIZE", ge=1)
@@ -78,8 +91,23 @@ class AppSettings(BaseSettings):
     )
     max_context_chunks: int = Field(default=10, ge=1)
     enable_reranker: bool = Field(default=False, alias="ENABLE_RERANKER")
+    fuzz_weight: float = Field(default=0.2, alias="FUZZ_WEIGHT", ge=0.0, le=1.0)
+    fuzz_workers: int = Field(default=4, alias="FUZZ_WORKERS", ge=-1)
+    fuzz_max_chars: int = Field(default=0, alias="FUZZ_MAX_CHARS", ge=0)
     top_k: int = Field(default=20, ge=1)
     openai_api_key: str | None = Field(default=None, alias="OPENAI_API_KEY")
+    openai_max_connections: int = Field(default=20, alias="OPENAI_MAX_CONNECTIONS", ge=1)
+    openai_max_keepalive_connections: int = Field(
+        default=10, alias="OPENAI_MAX_KEEPALIVE_CONNECTIONS", ge=0
+    )
+    openai_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="OPENAI_KEEPALIVE_EXPIRY_SECONDS", ge=0.0
+    )
+    openai_timeout_seconds: float = Field(default=60.0, alias="OPENAI_TIMEOUT_SECONDS", gt=0.0)
+    openai_connect_timeout_seconds: float = Field(
+        default=5.0, alias="OPENAI_CONNECT_TIMEOUT_SECONDS", gt=0.0
+    )
+    openai_max_retries: int = Field(default=2, alias="OPENAI_MAX_RETRIES", ge=0)
     embed_model: str = Field(default="text-embedding-3-large", alias="EMBED_MODEL")
     embedding_model_version: str = Field(
         default="text-embedding-3-large@2025-01-15",
@@ -91,6 +119,27 @@ class AppSettings(BaseSettings):
     confidence_threshold: float = Field(default=0.70, alias="CONFIDENCE_THRESHOLD")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     log_format: str = Field(default="json", alias="LOG_FORMAT")
+    log_async: bool = Field(default=True, alias="LOG_ASYNC")
+    log_queue_size: int = Field(default=10_000, alias="LOG_QUEUE_SIZE", ge=1)
+    log_index_enabled: bool = Field(default=True, alias="LOG_INDEX_ENABLED")
+    log_index_path: Path = Field(default=Path("logs/log_index.sqlite3"), alias="LOG_INDEX_PATH")
+    log_index_retention_days: float = Field(default=30.0, alias="LOG_INDEX_RETENTION_DAYS", gt=0.0)
+    metrics_shared_dir: Path | None = Field(
+        default=Path("logs/metrics/workers"), alias="METRICS_SHARED_DIR"
+    )
+    metrics_publish_interval_seconds: float = Field(
+        default=10.0, alias="METRICS_PUBLISH_INTERVAL_SECONDS", ge=0.0
+    )
+    tracing_enabled: bool = Field(default=False, alias="TRACING_ENABLED")
+    tracing_sample_rate: float = Field(default=1.0, alias="TRACING_SAMPLE_RATE", ge=0.0, le=1.0)
+    tracing_export_path: Path | None = Field(
+        default=Path("logs/traces.otlp.jsonl"), alias="TRACING_EXPORT_PATH"
+    )
+    tracing_service_name: str = Field(default="atticus", alias="TRACING_SERVICE_NAME")
+    profile_output_dir: Path = Field(default=Path("logs/profiles"), alias="PROFILE_OUTPUT_DIR")
+    profile_sample_interval_ms: float = Field(
+        default=5.0, alias="PROFILE_SAMPLE_INTERVAL_MS", gt=0.0
+    )
     verbose_logging: bool = Field(default=False, alias="LOG_VERBOSE")
     trace_logging: bool = Field(default=False, alias="LOG_TRACE")
     timezone: str = Field(default="UTC", alias="TIMEZONE")
@@ -127,8 +176,52 @@ class AppSettings(BaseSettings):
     smtp_allow_list_raw: str | list[str] | None = Field(default=None, alias="SMTP_ALLOW_LIST")
     rate_limit_requests: int = Field(default=5, alias="RATE_LIMIT_REQUESTS", ge=1)
     rate_limit_window_seconds: int = Field(default=60, alias="RATE_LIMIT_WINDOW_SECONDS", ge=1)
+    rate_limit_store_path: Path | None = Field(default=None, alias="RATE_LIMIT_STORE_PATH")
     cors_allowed_origins_raw: str | list[str] | None = Field(default=None, alias="ALLOWED_ORIGINS")
     admin_api_token: str | None = Field(default=None, alias="ADMIN_API_TOKEN")
+    answer_cache_enabled: bool = Field(default=True, alias="ANSWER_CACHE_ENABLED")
+    answer_cache_max_entries: int = Field(default=512, alias="ANSWER_CACHE_MAX_ENTRIES", ge=1)
+    answer_cache_ttl_seconds: int = Field(default=3600, alias="ANSWER_CACHE_TTL_SECONDS", ge=1)
+    answer_cache_path: Path | None = Field(default=None, alias="ANSWER_CACHE_PATH")
+    answer_cache_semantic_threshold: float = Field(
+        default=0.0, alias="ANSWER_CACHE_SEMANTIC_THRESHOLD", ge=0.0, le=1.0
+    )
+    request_coalescing_enabled: bool = Field(default=True, alias="REQUEST_COALESCING_ENABLED")
+    answer_deadline_seconds: float = Field(default=20.0, alias="ANSWER_DEADLINE_SECONDS", ge=0.0)
+    warmup_enabled: bool = Field(default=True, alias="WARMUP_ENABLED")
+    warmup_replay_questions: int = Field(default=20, alias="WARMUP_REPLAY_QUESTIONS", ge=0)
+    warmup_replay_lookback_hours: float = Field(
+        default=24.0, alias="WARMUP_REPLAY_LOOKBACK_HOURS", gt=0.0
+    )
+    circuit_breaker_enabled: bool = Field(default=True, alias="CIRCUIT_BREAKER_ENABLED")
+    circuit_breaker_failure_rate: float = Field(
+        default=0.5, alias="CIRCUIT_BREAKER_FAILURE_RATE", gt=0.0, le=1.0
+    )
+    circuit_breaker_min_calls: int = Field(default=5, alias="CIRCUIT_BREAKER_MIN_CALLS", ge=1)
+    circuit_breaker_window_seconds: float = Field(
+        default=60.0, alias="CIRCUIT_BREAKER_WINDOW_SECONDS", gt=0.0
+    )
+    circuit_breaker_cooldown_seconds: float = Field(
+        default=30.0, alias="CIRCUIT_BREAKER_COOLDOWN_SECONDS", gt=0.0
+    )
+    admission_control_enabled: bool = Field(default=True, alias="ADMISSION_CONTROL_ENABLED")
+    admission_max_in_flight: int = Field(default=16, alias="ADMISSION_MAX_IN_FLIGHT", ge=1)
+    admission_interactive_max_in_flight: int = Field(
+        default=12, alias="ADMISSION_INTERACTIVE_MAX_IN_FLIGHT", ge=1
+    )
+    admission_interactive_max_queue: int = Field(
+        default=64, alias="ADMISSION_INTERACTIVE_MAX_QUEUE", ge=0
+    )
+    admission_interactive_queue_timeout_seconds: float = Field(
+        default=10.0, alias="ADMISSION_INTERACTIVE_QUEUE_TIMEOUT_SECONDS", gt=0.0
+    )
+    admission_batch_max_in_flight: int = Field(
+        default=4, alias="ADMISSION_BATCH_MAX_IN_FLIGHT", ge=1
+    )
+    admission_batch_max_queue: int = Field(default=32, alias="ADMISSION_BATCH_MAX_QUEUE", ge=0)
+    admission_batch_queue_timeout_seconds: float = Field(
+        default=30.0, alias="ADMISSION_BATCH_QUEUE_TIMEOUT_SECONDS", gt=0.0
+    )
     secrets_report: dict[str, dict[str, Any]] = Field(
         default_factory=dict, exclude=True, repr=False
     )
@@ -145,6 +238,12 @@ class AppSettings(BaseSettings):
             return max(0, self.chunk_overlap_tokens_setting)
         return max(0, int(self.chunk_size * self.chunk_overlap_ratio))
 
+    @property
+    def lexical_index_dir(self) -> Path:
+        if self.lexical_index_dir_setting is not None:
+            return self.lexical_index_dir_setting
+        return self.manifest_path.parent / "lexical"
+
     @property
     def evaluation_thresholds(self) -> dict[str, float]:
         return {"nDCG@10": self.eval_min_ndcg, "MRR": self.eval_min_mrr}
@@ -207,12 +306,27 @@ class AppSettings(BaseSettings):
             return [item.strip() for item in value.split(",") if item.strip()]
         return value
 
+    @field_validator(
+        "answer_cache_path",
+        "rate_limit_store_path",
+        "metrics_shared_dir",
+        "tracing_export_path",
+        mode="before",
+    )
+    @classmethod
+    def _blank_path_to_none(cls, value: Any) -> Any:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
     def model_post_init(
         self, __context: Any
     ) -> None:  # pragma: no cover - exercised via settings load
         super().model_post_init(__context)
         if self.pgvector_probes < 1:
             raise ValueError("pgvector_probes must be >= 1")
+        if self.fuzz_workers == 0:
+            raise ValueError("fuzz_workers must be >= 1, or -1 for all cores")
         spec = EMBEDDING_MODEL_SPECS.get(self.embed_model)
         if spec:
             expected_dimension = cast(int, spec.get("dimensions", self.embed_dimensions))
@@ -301,6 +415,36 @@ def load_manifest(path: Path) -> Manifest | None:
     )
 
 
+@dataclass(slots=True)
+class _ManifestCache:
+    """Mutable holder for the last manifest read keyed by file stat."""
+
+    key: tuple[str, int, int] | None = None
+    manifest: Manifest | None = None
+
+
+_MANIFEST_CACHE = _ManifestCache()
+
+
+def load_manifest_cached(path: Path) -> Manifest | None:
+    """Return the manifest at ``path``, re-reading it only when the file changes."""
+
+    absolute = path if path.is_absolute() else path.resolve()
+    try:
+        stat_result = absolute.stat()
+    except OSError:
+        _MANIFEST_CACHE.key = None
+        _MANIFEST_CACHE.manifest = None
+        return None
+    key = (str(absolute), stat_result.st_mtime_ns, stat_result.st_size)
+    if _MANIFEST_CACHE.key == key:
+        return _MANIFEST_CACHE.manifest
+    manifest = load_manifest(absolute)
+    _MANIFEST_CACHE.key = key
+    _MANIFEST_CACHE.manifest = manifest
+    return manifest
+
+
 def write_manifest(path: Path, manifest: Manifest) -> None:
     path.write_text(
         json.dumps(manifest.to_dict(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
@@ -316,11 +460,21 @@ def _load_yaml_config(path: Path) -> dict[str, Any]:
     raise ValueError(f"Configuration file {path} must contain a mapping")
 
 
+_StatSignature = tuple[int, int] | None
+
+
 @dataclass(slots=True)
 class _SettingsCache:
-    """Mutable holder for cached settings and their provenance."""
+    """Mutable holder for cached settings and their provenance.
+
+    ``key`` covers the ``.env`` file signature and the tracked environment variables;
+    ``config_signature`` covers the YAML file the cached settings were built from.
+    Both are compared with ``os.stat`` only, so cache hits never parse or validate.
+    """
 
-    key: tuple[float, float, str] | None = None
+    key: tuple[str, _StatSignature, tuple[Any, ...]] | None = None
+    config_path: Path | None = None
+    config_signature: _StatSignature = None
     settings: AppSettings | None = None
 
 
@@ -347,7 +501,8 @@ def _iter_alias_strings(value: Any) -> list[str]:
     return result
 
 
-def _env_variables_fingerprint() -> str:
+@lru_cache(maxsize=1)
+def _tracked_env_keys() -> tuple[str, ...]:
     keys: set[str] = set()
     for name, field in AppSettings.model_fields.items():
         keys.add(name.upper())
@@ -356,10 +511,26 @@ def _env_variables_fingerprint() -> str:
             keys.update(_iter_alias_strings(alias))
         validation_alias = getattr(field, "validation_alias", None)
         keys.update(_iter_alias_strings(validation_alias))
-    material = "|".join(f"{key}={os.environ.get(key, '')}" for key in sorted(keys))
+    return tuple(sorted(keys))
+
+
+def _env_variables_snapshot() -> tuple[str | None, ...]:
+    return tuple(map(os.environ.get, _tracked_env_keys()))
+
+
+def _env_variables_fingerprint() -> str:
+    material = "|".join(f"{key}={os.environ.get(key, '')}" for key in _tracked_env_keys())
     return hashlib.sha256(material.encode("utf-8")).hexdigest()
 
 
+def _stat_signature(path: Path) -> _StatSignature:
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+
 def _parse_env_file(path: Path) -> dict[str, str]:
     if not path.exists():
         return {}
@@ -423,27 +594,37 @@ def reset_settings_cache() -> None:
     """Clear the cached settings instance (primarily for tests)."""
 
     _SETTINGS_CACHE.key = None
+    _SETTINGS_CACHE.config_path = None
+    _SETTINGS_CACHE.config_signature = None
     _SETTINGS_CACHE.settings = None
 
 
 def load_settings() -> AppSettings:
-    env_path = (_resolve_env_file() or Path(".env")).resolve()
-    env_mtime = env_path.stat().st_mtime if env_path.exists() else -1.0
-    env_values = _parse_env_file(env_path)
-    env_fingerprint = _env_variables_fingerprint()
+    """Return the active settings, rebuilding them only when their sources change.
+
+    The fast path is two ``os.stat`` calls plus a scan of the tracked environment
+    variables; ``.env``/YAML parsing and pydantic validation only happen after an
+    edit, which keeps hot-reload semantics without per-request rebuilds.
+    """
+
+    env_path = Path(os.path.abspath(_resolve_env_file() or Path(".env")))
+    cache_key = (str(env_path), _stat_signature(env_path), _env_variables_snapshot())
+    cached = _SETTINGS_CACHE.settings
+    if (
+        cached is not None
+        and _SETTINGS_CACHE.key == cache_key
+        and _SETTINGS_CACHE.config_path is not None
+        and _stat_signature(_SETTINGS_CACHE.config_path) == _SETTINGS_CACHE.config_signature
+    ):
+        return cached
 
+    env_values = _parse_env_file(env_path)
     base = AppSettings(
         _env_file=str(env_path),
         _env_file_encoding="utf-8",
     )
     config_path = base.config_path
-    config_mtime = config_path.stat().st_mtime if config_path.exists() else -1.0
-
-    cache_key = (env_mtime, config_mtime, env_fingerprint)
-
-    if _SETTINGS_CACHE.key == cache_key and _SETTINGS_CACHE.settings is not None:
-        return _SETTINGS_CACHE.settings
-
+    config_signature = _stat_signature(config_path)
     config_data = _load_yaml_config(config_path)
 
     if config_data:
@@ -477,6 +658,8 @@ def load_settings() -> AppSettings:
         settings = base
 
     _SETTINGS_CACHE.key = cache_key
+    _SETTINGS_CACHE.config_path = config_path
+    _SETTINGS_CACHE.config_signature = config_signature
     _SETTINGS_CACHE.settings = settings
     return settings
 
@@ -6,7 +6,14 @@ import json
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 
-from atticus.tokenization import decode, encode, split_tokens
+from atticus.tokenization import (
+    count_tokens,
+    count_tokens_batch,
+    decode,
+    encode,
+    encode_batch,
+    split_tokens,
+)
 from atticus.utils import sha256_text
 from core.config import AppSettings
 
@@ -97,6 +104,20 @@ class CEDChunker:
         chunks: list[Chunk] = []
         dedupe: set[str] = set()
         breadcrumbs_root = [document.source_path.name]
+        # Encode every prose section of the document in one threaded batch.
+        prose_sections = [
+            section
+            for section in document.sections
+            if section.extra.get("is_table") != "true" and not self._is_footnote(section)
+        ]
+        prose_tokens = {
+            id(section): tokens
+            for section, tokens in zip(
+                prose_sections,
+                encode_batch([section.text for section in prose_sections]),
+                strict=True,
+            )
+        }
 
         for section in document.sections:
             breadcrumbs = breadcrumbs_root + list(section.breadcrumbs)
@@ -110,7 +131,9 @@ class CEDChunker:
             elif self._is_footnote(section):
                 factory = lambda: self._chunk_footnote(builder, section, breadcrumbs)
             else:
-                factory = lambda: self._chunk_prose(builder, section, breadcrumbs)
+                factory = lambda: self._chunk_prose(
+                    builder, section, breadcrumbs, prose_tokens.get(id(section))
+                )
 
             for chunk in factory():
                 if chunk.sha256 in dedupe:
@@ -125,8 +148,10 @@ class CEDChunker:
         builder: _ChunkBuilder,
         section: ParsedSection,
         breadcrumbs: list[str],
+        tokens: list[int] | None = None,
     ) -> Iterable[Chunk]:
-        tokens = encode(section.text)
+        if tokens is None:
+            tokens = encode(section.text)
         if not tokens:
             return []
         target_tokens = self.settings.chunk_target_tokens or self.settings.chunk_size
@@ -163,6 +188,7 @@ class CEDChunker:
             prev.extra.update(
                 {k: v for k, v in tail.extra.items() if k not in {"chunk_sha", "chunking"}}
             )
+            prev.extra["token_count"] = str(count_tokens(merged_text))
             new_hash = _hash_chunk_payload(merged_text, prev.extra)
             prev.sha256 = new_hash
             prev.extra["chunk_sha"] = new_hash
@@ -179,20 +205,26 @@ class CEDChunker:
         if not lines:
             return []
         headers = section.extra.get("table_headers") or ""
-        result: list[Chunk] = []
-        for index, line in enumerate(lines, start=1):
+        rows: list[tuple[str, dict[str, str]]] = []
+        for line in lines:
             cells = [cell.strip() for cell in line.split(TABLE_SPLIT_DELIMITER)]
             cell_payload = {f"col_{idx}": value for idx, value in enumerate(cells, start=1)}
             formatted_cells = " | ".join(cells)
             text = formatted_cells
             if headers:
                 text = f"{headers}\n{formatted_cells}".strip()
+            rows.append((text, cell_payload))
+        token_counts = count_tokens_batch([text for text, _ in rows])
+        result: list[Chunk] = []
+        for index, ((text, cell_payload), token_count) in enumerate(
+            zip(rows, token_counts, strict=True), start=1
+        ):
             chunk = builder.build_chunk(
                 section=section,
                 breadcrumbs=breadcrumbs,
                 text=text,
                 start=0,
-                end=len(encode(text)),
+                end=token_count,
                 chunking="table_row",
                 extra={
                     "table_headers": headers,
@@ -212,14 +244,15 @@ class CEDChunker:
         text = section.text.strip()
         if not text:
             return []
+        token_count = count_tokens(text)
         chunk = builder.build_chunk(
             section=section,
             breadcrumbs=breadcrumbs,
             text=text,
             start=0,
-            end=len(encode(text)),
+            end=token_count,
             chunking="footnote",
-            extra={"token_count": len(encode(text))},
+            extra={"token_count": token_count},
         )
         return [chunk]
 
@@ -1,36 +1,48 @@
-"""Document discovery and parsing utilities."""
+"""Document discovery and parsing utilities.
+
+Parser modules pull in PyMuPDF, camelot, tabula, pytesseract, Pillow, BeautifulSoup,
+python-docx and openpyxl, so each one is imported the first time a file of its type
+is parsed rather than whenever ``ingest`` is imported (the API only needs these in
+processes that actually ingest).
+"""
 
 from __future__ import annotations
 
+import importlib
 from collections.abc import Callable, Iterable
 from pathlib import Path
 
 from ..models import ParsedDocument
-from .docx import parse_docx
-from .html import parse_html
-from .image import parse_image
-from .pdf import parse_pdf
-from .text import parse_text
-from .xlsx import parse_xlsx
 
 Parser = Callable[[Path], ParsedDocument]
 
-PARSERS: dict[str, Parser] = {
-    ".txt": parse_text,
-    ".md": parse_text,
-    ".pdf": parse_pdf,
-    ".docx": parse_docx,
-    ".xlsx": parse_xlsx,
-    ".html": parse_html,
-    ".htm": parse_html,
-    ".png": parse_image,
-    ".jpg": parse_image,
-    ".jpeg": parse_image,
-    ".tif": parse_image,
-    ".tiff": parse_image,
+# Suffix -> (module in this package, parser function).
+PARSERS: dict[str, tuple[str, str]] = {
+    ".txt": ("text", "parse_text"),
+    ".md": ("text", "parse_text"),
+    ".pdf": ("pdf", "parse_pdf"),
+    ".docx": ("docx", "parse_docx"),
+    ".xlsx": ("xlsx", "parse_xlsx"),
+    ".html": ("html", "parse_html"),
+    ".htm": ("html", "parse_html"),
+    ".png": ("image", "parse_image"),
+    ".jpg": ("image", "parse_image"),
+    ".jpeg": ("image", "parse_image"),
+    ".tif": ("image", "parse_image"),
+    ".tiff": ("image", "parse_image"),
 }
 
 
+def get_parser(suffix: str) -> Parser | None:
+    target = PARSERS.get(suffix.lower())
+    if target is None:
+        return None
+    module_name, function_name = target
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    parser: Parser = getattr(module, function_name)
+    return parser
+
+
 def discover_documents(content_root: Path) -> Iterable[Path]:
     for path in sorted(content_root.rglob("*")):
         if path.is_file() and path.suffix.lower() in PARSERS:
@@ -38,7 +50,7 @@ def discover_documents(content_root: Path) -> Iterable[Path]:
 
 
 def parse_document(path: Path) -> ParsedDocument:
-    parser = PARSERS.get(path.suffix.lower())
+    parser = get_parser(path.suffix)
     if parser is None:
         raise ValueError(f"Unsupported file extension: {path.suffix}")
     return parser(path)
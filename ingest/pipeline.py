@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+import logging
 import shutil
 import time
+import uuid
 from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
@@ -12,9 +14,13 @@ from typing import Any
 
 from atticus.embeddings import EmbeddingClient
 from atticus.logging import configure_logging, log_event
+from atticus.tracing import set_span_attributes, span, start_trace
 from atticus.utils import sha256_file, sha256_text
 from atticus.vector_db import PgVectorRepository, StoredChunk, save_metadata
 from core.config import AppSettings, Manifest, load_manifest, load_settings, write_manifest
+from retriever.answer_cache import corpus_version
+from retriever.embedding_matrix import export_embedding_matrix
+from retriever.index_artifacts import write_index_artifacts
 from retriever.models import ModelCatalog, extract_models, load_model_catalog
 
 from .chunker import chunk_document
@@ -117,13 +123,26 @@ def _snapshot_directory(settings: AppSettings, timestamp: str) -> Path:
     return snapshot_dir
 
 
-def ingest_corpus(  # noqa: PLR0915, PLR0912
+def ingest_corpus(
     settings: AppSettings | None = None, options: IngestionOptions | None = None
 ) -> IngestionSummary:
     settings = settings or load_settings()
     options = options or IngestionOptions()
     settings.ensure_directories()
     logger = configure_logging(settings)
+    with start_trace(
+        "ingest.corpus",
+        trace_id=uuid.uuid4().hex,
+        settings=settings,
+        logger=logger,
+        full_refresh=options.full_refresh,
+    ):
+        return _ingest_corpus(settings, options, logger)
+
+
+def _ingest_corpus(  # noqa: PLR0915, PLR0912
+    settings: AppSettings, options: IngestionOptions, logger: logging.Logger
+) -> IngestionSummary:
     catalog = load_model_catalog()
 
     if not settings.database_url:
@@ -175,23 +194,27 @@ def ingest_corpus(  # noqa: PLR0915, PLR0912
                 document_lookup[str(file_path)] = str(manifest_entry.get("source_type", ""))
                 skipped += 1
                 continue
-        document = parse_document(file_path)
+        with span("ingest.parse", path=str(file_path)):
+            document = parse_document(file_path)
         document.sha256 = file_hash
         new_documents.append(document)
         document_lookup[str(document.source_path)] = document.source_type
 
     new_parsed_chunks: list[ParsedChunk] = []
-    for document in new_documents:
-        new_parsed_chunks.extend(chunk_document(document, settings))
+    with span("ingest.chunk", documents=len(new_documents)):
+        for document in new_documents:
+            new_parsed_chunks.extend(chunk_document(document, settings))
 
-    document_scope = _build_document_scope(new_documents, catalog)
-    for parsed_chunk in new_parsed_chunks:
-        _annotate_chunk_with_catalog(parsed_chunk, catalog, document_scope)
-    for reused_chunk in reused_chunks:
-        _annotate_chunk_with_catalog(reused_chunk, catalog, document_scope)
+    with span("ingest.annotate", chunks=len(new_parsed_chunks) + len(reused_chunks)):
+        document_scope = _build_document_scope(new_documents, catalog)
+        for parsed_chunk in new_parsed_chunks:
+            _annotate_chunk_with_catalog(parsed_chunk, catalog, document_scope)
+        for reused_chunk in reused_chunks:
+            _annotate_chunk_with_catalog(reused_chunk, catalog, document_scope)
 
-    embed_client = EmbeddingClient(settings, logger=logger)
-    embeddings = embed_client.embed_texts(chunk.text for chunk in new_parsed_chunks)
+    with span("ingest.embed", chunks=len(new_parsed_chunks)):
+        embed_client = EmbeddingClient(settings, logger=logger)
+        embeddings = embed_client.embed_texts(chunk.text for chunk in new_parsed_chunks)
 
     stored_chunks: list[StoredChunk] = list(reused_chunks)
     chunks_by_document: dict[str, list[StoredChunk]] = {}
@@ -235,31 +258,40 @@ def ingest_corpus(  # noqa: PLR0915, PLR0912
         stored_chunks.append(chunk_object)
         chunks_by_document.setdefault(parsed_chunk.document_id, []).append(chunk_object)
 
-    for info in reused_documents.values():
-        repo.replace_document(
-            document_id=info["document_id"],
-            source_path=info["source_path"],
-            sha256=info["sha256"],
-            source_type=info.get("source_type"),
-            chunks=info["chunks"],
-            ingest_time=ingest_time,
-        )
-
-    for document in new_documents:
-        repo.replace_document(
-            document_id=document.document_id,
-            source_path=str(document.source_path),
-            sha256=document.sha256 or "",
-            source_type=document.source_type,
-            chunks=chunks_by_document.get(document.document_id, []),
-            ingest_time=ingest_time,
+    with span("ingest.store", documents=len(reused_documents) + len(new_documents)):
+        for info in reused_documents.values():
+            repo.replace_document(
+                document_id=info["document_id"],
+                source_path=info["source_path"],
+                sha256=info["sha256"],
+                source_type=info.get("source_type"),
+                chunks=info["chunks"],
+                ingest_time=ingest_time,
+            )
+
+        for document in new_documents:
+            repo.replace_document(
+                document_id=document.document_id,
+                source_path=str(document.source_path),
+                sha256=document.sha256 or "",
+                source_type=document.source_type,
+                chunks=chunks_by_document.get(document.document_id, []),
+                ingest_time=ingest_time,
+            )
+
+    with span("ingest.save_metadata", chunks=len(stored_chunks)):
+        save_metadata(stored_chunks, settings.metadata_path)
+        snapshot_dir = _snapshot_directory(settings, ingest_time)
+        shutil.copy2(settings.metadata_path, snapshot_dir / "index_metadata.json")
+
+    with span("ingest.export_embeddings", chunks=len(stored_chunks)):
+        export_embedding_matrix(
+            stored_chunks,
+            settings.embedding_matrix_dir,
+            dtype=settings.embedding_matrix_dtype,
+            ivf_lists=settings.embedding_matrix_ivf_lists,
         )
 
-    save_metadata(stored_chunks, settings.metadata_path)
-
-    snapshot_dir = _snapshot_directory(settings, ingest_time)
-    shutil.copy2(settings.metadata_path, snapshot_dir / "index_metadata.json")
-
     document_records: dict[str, dict[str, Any]] = {}
     for chunk in stored_chunks:
         entry = document_records.setdefault(
@@ -325,6 +357,13 @@ def ingest_corpus(  # noqa: PLR0915, PLR0912
     write_manifest(settings.manifest_path, manifest)
     shutil.copy2(settings.manifest_path, snapshot_dir / "manifest.json")
 
+    with span("ingest.write_lexical_index", chunks=len(stored_chunks)):
+        write_index_artifacts(
+            stored_chunks,
+            settings.lexical_index_dir,
+            corpus_version=corpus_version(corpus_hash, ingest_time),
+        )
+
     elapsed = time.time() - start_time
     summary = IngestionSummary(
         documents_processed=len(new_documents),
@@ -339,6 +378,11 @@ def ingest_corpus(  # noqa: PLR0915, PLR0912
         embedding_model_version=settings.embedding_model_version,
     )
 
+    set_span_attributes(
+        documents_processed=summary.documents_processed,
+        documents_skipped=summary.documents_skipped,
+        chunks_indexed=summary.chunks_indexed,
+    )
     log_event(
         logger,
         "ingestion_complete",
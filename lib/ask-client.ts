@@ -15,6 +15,8 @@ import {
 interface StreamOptions {
   signal?: AbortSignal;
   onEvent?: (event: AskStreamEvent) => void;
+  /** Admission lane; batch traffic yields to interactive chat when the service is busy. */
+  lane?: "interactive" | "batch";
 }
 
 function parseSseChunk(chunk: string): AskStreamEvent | null {
@@ -58,6 +60,9 @@ export async function streamAsk(
     requestHeaders["X-Request-ID"] = generatedId;
     requestHeaders["X-Trace-ID"] = generatedId;
   }
+  if (options.lane) {
+    requestHeaders["X-Atticus-Lane"] = options.lane;
+  }
   const response = await fetch("/api/ask", {
     method: "POST",
     headers: requestHeaders,
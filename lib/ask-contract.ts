@@ -35,6 +35,7 @@ const askAnswerSchema = z.object({
   family: z.string().nullable().optional(),
   family_label: z.string().nullable().optional(),
   sources: z.array(askSourceSchema),
+  degraded: z.boolean().optional(),
 });
 
 export const askResponseSchema = z.preprocess(
@@ -56,6 +57,7 @@ export const askResponseSchema = z.preprocess(
     sources: z.array(askSourceSchema).optional(),
     answers: z.array(askAnswerSchema).optional(),
     clarification: clarificationPayloadSchema.nullish(),
+    degraded: z.boolean().nullish(),
     glossaryHits: z
       .array(glossaryHitSchema)
       .nullish()
@@ -0,0 +1,344 @@
+"""Full-answer cache for repeated questions.
+
+Entries are keyed by the normalized question plus everything that can change the
+generated answer: the resolved scope, metadata filters, retrieval window, context
+hints, the active corpus version (manifest ``corpus_hash`` plus ingest timestamp),
+and the generation model/prompt version. Every ingest rewrites the manifest, so
+stale entries can never be served after the corpus changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from core.config import AppSettings
+
+from .models import Answer, Citation
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.]+$")
+
+
+def normalize_question(question: str) -> str:
+    """Collapse whitespace, casing, and trailing punctuation for cache lookups."""
+
+    collapsed = re.sub(r"\s+", " ", question).strip().lower()
+    return _TRAILING_PUNCTUATION.sub("", collapsed)
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerCacheKey:
+    """Digest pair identifying a cached answer.
+
+    ``context`` covers everything except the question text so semantic lookups can
+    restrict near-duplicate matching to answers produced under the same scope.
+    """
+
+    digest: str
+    context: str
+    question: str
+
+
+def build_cache_key(
+    question: str,
+    *,
+    settings: AppSettings,
+    corpus_version: str,
+    filters: dict[str, str] | None = None,
+    top_k: int | None = None,
+    context_hints: Sequence[str] | None = None,
+    product_family: str | None = None,
+    family_label: str | None = None,
+    model: str | None = None,
+) -> AnswerCacheKey:
+    normalized = normalize_question(question)
+    context_material = json.dumps(
+        {
+            "scope": [product_family or "", family_label or "", model or ""],
+            "filters": sorted((str(k), str(v)) for k, v in (filters or {}).items()),
+            "top_k": top_k or settings.top_k,
+            "hints": list(context_hints or []),
+            "corpus_version": corpus_version,
+            "generation_model": settings.generation_model,
+            "generation_prompt_version": settings.generation_prompt_version,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    context = hashlib.sha256(context_material.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(f"{context}|{normalized}".encode()).hexdigest()
+    return AnswerCacheKey(digest=digest, context=context, question=normalized)
+
+
+def corpus_version(corpus_hash: str, created_at: str) -> str:
+    return f"{corpus_hash}@{created_at}"
+
+
+def clone_answer(answer: Answer) -> Answer:
+    return replace(answer, citations=[replace(item) for item in answer.citations])
+
+
+def _serialize_answer(answer: Answer) -> str:
+    return json.dumps(asdict(answer), ensure_ascii=False)
+
+
+def _deserialize_answer(payload: str) -> Answer:
+    data = json.loads(payload)
+    citations = [Citation(**item) for item in data.pop("citations", [])]
+    return Answer(citations=citations, **data)
+
+
+def _unit_vector(values: Iterable[float]) -> np.ndarray:
+    vector = np.asarray(list(values), dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    answer: Answer
+    context: str
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+class _PersistentTier:
+    """SQLite-backed second tier shared across restarts and workers."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answer_cache (
+                digest TEXT PRIMARY KEY,
+                context TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_answer_cache_expires ON answer_cache(expires_at)"
+        )
+
+    def get(self, digest: str, now: float) -> tuple[Answer, str, float] | None:
+        row = self._conn.execute(
+            "SELECT payload, context, expires_at FROM answer_cache WHERE digest = ?",
+            (digest,),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, context, expires_at = row
+        if float(expires_at) <= now:
+            self._conn.execute("DELETE FROM answer_cache WHERE digest = ?", (digest,))
+            return None
+        return _deserialize_answer(str(payload)), str(context), float(expires_at)
+
+    def put(self, key: AnswerCacheKey, answer: Answer, expires_at: float, now: float) -> None:
+        self._conn.execute("DELETE FROM answer_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO answer_cache (digest, context, expires_at, payload) "
+            "VALUES (?, ?, ?, ?)",
+            (key.digest, key.context, expires_at, _serialize_answer(answer)),
+        )
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM answer_cache")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+@dataclass(slots=True)
+class AnswerCacheStats:
+    hits: int = 0
+    semantic_hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+@dataclass(slots=True)
+class AnswerCache:
+    """Thread-safe TTL + LRU answer cache with optional persistent and semantic tiers."""
+
+    max_entries: int = 512
+    ttl_seconds: float = 3600.0
+    semantic_threshold: float = 0.0
+    persistent_path: Path | None = None
+    stats: AnswerCacheStats = field(default_factory=AnswerCacheStats)
+    _entries: OrderedDict[str, _CacheEntry] = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _persistent: _PersistentTier | None = None
+
+    def __post_init__(self) -> None:
+        if self.persistent_path is not None:
+            self._persistent = _PersistentTier(self.persistent_path)
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.semantic_threshold > 0.0
+
+    def get(
+        self,
+        key: AnswerCacheKey,
+        *,
+        embedding: Sequence[float] | None = None,
+    ) -> Answer | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key.digest)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key.digest)
+                    self.stats.hits += 1
+                    return clone_answer(entry.answer)
+                del self._entries[key.digest]
+
+            if self._persistent is not None:
+                stored = self._persistent.get(key.digest, now)
+                if stored is not None:
+                    answer, context, expires_at = stored
+                    self._insert(key.digest, _CacheEntry(answer, context, expires_at))
+                    self.stats.hits += 1
+                    self.stats.persistent_hits += 1
+                    return clone_answer(answer)
+
+            if embedding is not None and self.semantic_enabled:
+                match = self._semantic_match(key.context, _unit_vector(embedding), now)
+                if match is not None:
+                    self.stats.hits += 1
+                    self.stats.semantic_hits += 1
+                    return clone_answer(match.answer)
+
+            self.stats.misses += 1
+            return None
+
+    def put(
+        self,
+        key: AnswerCacheKey,
+        answer: Answer,
+        *,
+        embedding: Sequence[float] | None = None,
+    ) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        vector = _unit_vector(embedding) if embedding is not None else None
+        stored = clone_answer(answer)
+        with self._lock:
+            self._insert(key.digest, _CacheEntry(stored, key.context, expires_at, vector))
+            self.stats.stores += 1
+            if self._persistent is not None:
+                self._persistent.put(key, stored, expires_at, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._persistent is not None:
+                self._persistent.clear()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.stats.hits,
+                "semantic_hits": self.stats.semantic_hits,
+                "persistent_hits": self.stats.persistent_hits,
+                "misses": self.stats.misses,
+                "stores": self.stats.stores,
+                "evictions": self.stats.evictions,
+            }
+
+    def close(self) -> None:
+        if self._persistent is not None:
+            self._persistent.close()
+            self._persistent = None
+
+    def _insert(self, digest: str, entry: _CacheEntry) -> None:
+        self._entries[digest] = entry
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _semantic_match(self, context: str, vector: np.ndarray, now: float) -> _CacheEntry | None:
+        best: _CacheEntry | None = None
+        best_digest: str | None = None
+        best_score = self.semantic_threshold
+        for digest, entry in self._entries.items():
+            if entry.context != context or entry.embedding is None or entry.expires_at <= now:
+                continue
+            if entry.embedding.shape != vector.shape:
+                continue
+            score = float(np.dot(entry.embedding, vector))
+            if score >= best_score:
+                best, best_digest, best_score = entry, digest, score
+        if best_digest is not None:
+            self._entries.move_to_end(best_digest)
+        return best
+
+
+@dataclass(slots=True)
+class _AnswerCacheHolder:
+    """Process-wide cache instance rebuilt only when its configuration changes."""
+
+    config: tuple[Any, ...] | None = None
+    cache: AnswerCache | None = None
+
+
+_ANSWER_CACHE = _AnswerCacheHolder()
+_ANSWER_CACHE_LOCK = threading.Lock()
+
+
+def get_answer_cache(settings: AppSettings) -> AnswerCache | None:
+    """Return the shared answer cache, or ``None`` when caching is disabled."""
+
+    if not getattr(settings, "answer_cache_enabled", False):
+        return None
+    persistent = getattr(settings, "answer_cache_path", None)
+    config = (
+        int(settings.answer_cache_max_entries),
+        float(settings.answer_cache_ttl_seconds),
+        float(settings.answer_cache_semantic_threshold),
+        str(Path(persistent).resolve()) if persistent else None,
+    )
+    with _ANSWER_CACHE_LOCK:
+        if _ANSWER_CACHE.cache is None or _ANSWER_CACHE.config != config:
+            if _ANSWER_CACHE.cache is not None:
+                _ANSWER_CACHE.cache.close()
+            _ANSWER_CACHE.cache = AnswerCache(
+                max_entries=config[0],
+                ttl_seconds=config[1],
+                semantic_threshold=config[2],
+                persistent_path=Path(config[3]) if config[3] else None,
+            )
+            _ANSWER_CACHE.config = config
+        return _ANSWER_CACHE.cache
+
+
+def reset_answer_cache() -> None:
+    """Drop the shared answer cache (primarily for tests and config reloads)."""
+
+    with _ANSWER_CACHE_LOCK:
+        if _ANSWER_CACHE.cache is not None:
+            _ANSWER_CACHE.cache.close()
+        _ANSWER_CACHE.cache = None
+        _ANSWER_CACHE.config = None
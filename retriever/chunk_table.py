@@ -0,0 +1,178 @@
+"""Columnar, array-backed chunk storage for the retriever.
+
+Instead of one ``StoredChunk`` (and its ``extra`` dict) per chunk, the table keeps:
+
+* interned string pools for repeated values (document ids, source paths, sections and
+  every ``extra`` value, pooled per key), referenced by ``int32`` code columns where
+  ``-1`` means "absent";
+* NumPy columns for the numeric fields;
+* every chunk text in one UTF-8 buffer addressed by ``text_offsets``.
+
+Only chunk ids stay as Python strings, because search joins vector hits on them. A
+saved table is memory-mapped on load, so workers share its pages.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from atticus.profiling import deep_sizeof
+from atticus.vector_db import StoredChunk
+
+POOLS_FILENAME = "chunk_pools.json"
+TEXTS_FILENAME = "texts.bin"
+
+_INTERNED = ("document_id", "source_path", "section")
+_NUMERIC = ("start_token", "end_token", "page_number", "text_offsets")
+_EXTRA_PREFIX = "extra:"
+
+
+def _intern(values: Iterable[object]) -> tuple[np.ndarray, list[str]]:
+    pool: dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if value is None else pool.setdefault(str(value), len(pool)) for value in values),
+        dtype=np.int32,
+    )
+    return codes, list(pool)
+
+
+class ChunkTable:
+    """Chunk records for one corpus, addressed by position."""
+
+    def __init__(
+        self,
+        chunk_ids: list[str],
+        columns: dict[str, np.ndarray],
+        pools: dict[str, list[str]],
+        texts: bytes | mmap.mmap,
+    ) -> None:
+        self.chunk_ids = chunk_ids
+        self.positions: dict[str, int] = {chunk_id: idx for idx, chunk_id in enumerate(chunk_ids)}
+        self.columns = columns
+        self.pools = pools
+        self.extra_keys = [
+            key[len(_EXTRA_PREFIX) :] for key in pools if key.startswith(_EXTRA_PREFIX)
+        ]
+        self._texts = texts
+        if len(columns["text_offsets"]) != len(chunk_ids) + 1:
+            raise ValueError("Chunk table columns do not match its chunk ids")
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[StoredChunk]) -> ChunkTable:
+        columns: dict[str, np.ndarray] = {}
+        pools: dict[str, list[str]] = {}
+        for name in _INTERNED:
+            columns[name], pools[name] = _intern(getattr(chunk, name) for chunk in chunks)
+        extra_keys = list(dict.fromkeys(key for chunk in chunks for key in chunk.extra))
+        for key in extra_keys:
+            name = f"{_EXTRA_PREFIX}{key}"
+            columns[name], pools[name] = _intern(chunk.extra.get(key) for chunk in chunks)
+        count = len(chunks)
+        columns["start_token"] = np.fromiter((c.start_token for c in chunks), np.int64, count)
+        columns["end_token"] = np.fromiter((c.end_token for c in chunks), np.int64, count)
+        columns["page_number"] = np.fromiter(
+            (-1 if c.page_number is None else c.page_number for c in chunks), np.int32, count
+        )
+        columns["sha256"] = np.asarray([c.sha256.encode("utf-8") for c in chunks], dtype=bytes)
+        encoded = [chunk.text.encode("utf-8") for chunk in chunks]
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), np.int64, count), out=offsets[1:])
+        columns["text_offsets"] = offsets
+        return cls([chunk.chunk_id for chunk in chunks], columns, pools, b"".join(encoded))
+
+    def save(self, directory: Path) -> None:
+        for name, column in self.columns.items():
+            np.save(directory / f"chunk_{name.replace(':', '.')}.npy", column)
+        payload = {"chunk_ids": self.chunk_ids, "pools": self.pools}
+        (directory / POOLS_FILENAME).write_text(
+            json.dumps(payload, ensure_ascii=False), encoding="utf-8"
+        )
+        (directory / TEXTS_FILENAME).write_bytes(bytes(self._texts))
+
+    @classmethod
+    def load(cls, directory: Path) -> ChunkTable:
+        payload = json.loads((directory / POOLS_FILENAME).read_text(encoding="utf-8"))
+        pools: dict[str, list[str]] = payload["pools"]
+        names = [*_INTERNED, *(key for key in pools if key.startswith(_EXTRA_PREFIX))]
+        columns = {
+            name: np.load(directory / f"chunk_{name.replace(':', '.')}.npy", mmap_mode="r")
+            for name in [*names, *_NUMERIC, "sha256"]
+        }
+        texts: bytes | mmap.mmap = b""
+        with (directory / TEXTS_FILENAME).open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size:
+                texts = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(list(payload["chunk_ids"]), columns, pools, texts)
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def _pooled(self, name: str, idx: int) -> str | None:
+        code = int(self.columns[name][idx])
+        return None if code < 0 else self.pools[name][code]
+
+    def source_path(self, idx: int) -> str:
+        return self._pooled("source_path", idx) or ""
+
+    def section(self, idx: int) -> str | None:
+        return self._pooled("section", idx)
+
+    def page_number(self, idx: int) -> int | None:
+        page = int(self.columns["page_number"][idx])
+        return None if page < 0 else page
+
+    def text(self, idx: int) -> str:
+        offsets = self.columns["text_offsets"]
+        return self._texts[int(offsets[idx]) : int(offsets[idx + 1])].decode("utf-8")
+
+    def texts(self) -> Iterator[str]:
+        for idx in range(len(self)):
+            yield self.text(idx)
+
+    def extra(self, idx: int) -> dict[str, str]:
+        extra: dict[str, str] = {}
+        for key in self.extra_keys:
+            value = self._pooled(f"{_EXTRA_PREFIX}{key}", idx)
+            if value is not None:
+                extra[key] = value
+        return extra
+
+    def extra_codes(self, key: str) -> tuple[np.ndarray, list[str]] | None:
+        """Code column and value pool of one ``extra`` key, for vectorized scans."""
+
+        name = f"{_EXTRA_PREFIX}{key}"
+        if name not in self.columns:
+            return None
+        return self.columns[name], self.pools[name]
+
+    def chunk(self, idx: int) -> StoredChunk:
+        """Materialize one chunk as a ``StoredChunk`` (without its embedding)."""
+
+        return StoredChunk(
+            chunk_id=self.chunk_ids[idx],
+            document_id=self._pooled("document_id", idx) or "",
+            source_path=self.source_path(idx),
+            text=self.text(idx),
+            start_token=int(self.columns["start_token"][idx]),
+            end_token=int(self.columns["end_token"][idx]),
+            page_number=self.page_number(idx),
+            section=self.section(idx),
+            sha256=bytes(self.columns["sha256"][idx]).decode("utf-8"),
+            embedding=None,
+            extra=self.extra(idx),
+        )
+
+    def nbytes(self) -> dict[str, int]:
+        seen: set[int] = set()
+        return {
+            "chunk_ids": deep_sizeof((self.chunk_ids, self.positions), seen),
+            "string_pools": deep_sizeof(self.pools, seen),
+            "columns": sum(int(column.nbytes) for column in self.columns.values()),
+            "texts": len(self._texts),
+        }
@@ -0,0 +1,269 @@
+"""In-process vector search over a memory-mapped embedding matrix.
+
+Ingestion exports every chunk embedding, L2-normalized, to ``matrix.npy`` (float16 or
+float32) alongside ``chunk_ids.json``. With ``VECTOR_BACKEND=matrix`` the API maps the
+matrix read-only (``numpy.load(..., mmap_mode="r")``), so pages are shared between
+workers and faulted in on demand. Exact search is a BLAS matrix-vector product plus
+``argpartition``. When ``EMBEDDING_MATRIX_IVF_LISTS`` is set, ingest also trains
+k-means centroids (an IVF index) and queries only scan the closest lists.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from atticus.vector_db import StoredChunk
+
+MATRIX_FILENAME = "matrix.npy"
+IDS_FILENAME = "chunk_ids.json"
+IVF_FILENAME = "ivf.npz"
+MATRIX_DTYPES = ("float16", "float32")
+
+_BLOCK_ROWS = 32_768
+_IVF_ITERATIONS = 10
+_IVF_TRAINING_ROWS_PER_LIST = 256
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normalized: np.ndarray = matrix / norms
+    return normalized
+
+
+def _nearest_centroid(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(matrix), dtype=np.int32)
+    for start in range(0, len(matrix), _BLOCK_ROWS):
+        block = np.asarray(matrix[start : start + _BLOCK_ROWS], dtype=np.float32)
+        assignments[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_ivf(
+    matrix: np.ndarray, lists: int, *, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Spherical k-means over normalized rows.
+
+    Returns ``(centroids, offsets, rows)``, where the rows of list ``i`` are
+    ``rows[offsets[i]:offsets[i + 1]]``.
+    """
+
+    rng = np.random.default_rng(seed)
+    lists = max(1, min(lists, len(matrix)))
+    sample_size = min(len(matrix), lists * _IVF_TRAINING_ROWS_PER_LIST)
+    sample = np.asarray(
+        matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))], dtype=np.float32
+    )
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+    for _ in range(_IVF_ITERATIONS):
+        assignments = _nearest_centroid(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=lists)
+        filled = counts > 0
+        centroids[filled] = _normalize_rows(sums[filled])
+
+    assignments = _nearest_centroid(matrix, centroids)
+    rows = np.argsort(assignments, kind="stable").astype(np.int32)
+    offsets = np.zeros(lists + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assignments, minlength=lists), out=offsets[1:])
+    return centroids, offsets, rows
+
+
+def _atomic_write(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as handle:
+        write(handle)
+    os.replace(tmp_path, path)
+
+
+def export_embedding_matrix(
+    chunks: Sequence[StoredChunk],
+    directory: Path,
+    *,
+    dtype: str = "float32",
+    ivf_lists: int = 0,
+) -> int:
+    """Write normalized chunk embeddings (and optionally an IVF index) to ``directory``.
+
+    Returns the number of rows written. ``chunk_ids.json`` is replaced last, so readers
+    keyed on it never pair a new matrix with stale ids.
+    """
+
+    if dtype not in MATRIX_DTYPES:
+        raise ValueError(f"Unsupported embedding matrix dtype {dtype!r}")
+    directory.mkdir(parents=True, exist_ok=True)
+    embedded = [chunk for chunk in chunks if chunk.embedding is not None and len(chunk.embedding)]
+    if embedded:
+        matrix = _normalize_rows(np.asarray([chunk.embedding for chunk in embedded], np.float32))
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    stored = matrix.astype(dtype)
+    _atomic_write(directory / MATRIX_FILENAME, lambda handle: np.save(handle, stored))
+
+    ivf_path = directory / IVF_FILENAME
+    if ivf_lists > 0 and len(matrix) > ivf_lists:
+        centroids, offsets, rows = train_ivf(matrix, ivf_lists)
+        _atomic_write(
+            ivf_path,
+            lambda handle: np.savez(handle, centroids=centroids, offsets=offsets, rows=rows),
+        )
+    else:
+        ivf_path.unlink(missing_ok=True)
+
+    header = {
+        "chunk_ids": [chunk.chunk_id for chunk in embedded],
+        "dimensions": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "dtype": dtype,
+        "ivf_lists": ivf_lists if ivf_path.exists() else 0,
+    }
+    payload = json.dumps(header).encode("utf-8")
+    _atomic_write(directory / IDS_FILENAME, lambda handle: handle.write(payload))
+    return len(embedded)
+
+
+@dataclass(slots=True)
+class _IvfIndex:
+    centroids: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+
+
+class EmbeddingMatrix:
+    """Read-only view over an exported embedding matrix."""
+
+    def __init__(self, directory: Path) -> None:
+        header = json.loads((directory / IDS_FILENAME).read_text(encoding="utf-8"))
+        self.directory = directory
+        self.chunk_ids: list[str] = [str(item) for item in header.get("chunk_ids", [])]
+        self.row_of: dict[str, int] = {chunk_id: row for row, chunk_id in enumerate(self.chunk_ids)}
+        self._matrix: np.ndarray = np.load(directory / MATRIX_FILENAME, mmap_mode="r")
+        if len(self._matrix) != len(self.chunk_ids):
+            raise ValueError(f"Embedding matrix in {directory} does not match its chunk ids")
+        self._ivf: _IvfIndex | None = None
+        ivf_path = directory / IVF_FILENAME
+        if header.get("ivf_lists") and ivf_path.exists():
+            with np.load(ivf_path) as data:
+                self._ivf = _IvfIndex(data["centroids"], data["offsets"], data["rows"])
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The mapped, row-normalized matrix (read-only)."""
+
+        return self._matrix
+
+    @property
+    def has_ivf(self) -> bool:
+        return self._ivf is not None
+
+    def nbytes(self) -> dict[str, int]:
+        ivf = self._ivf
+        return {
+            "mapped_matrix": int(self._matrix.nbytes),
+            "ivf": 0
+            if ivf is None
+            else ivf.centroids.nbytes + ivf.offsets.nbytes + ivf.rows.nbytes,
+        }
+
+    def _similarities(self, query: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        if rows is not None:
+            selected: np.ndarray = np.asarray(self._matrix[rows], dtype=np.float32) @ query
+            return selected
+        scores = np.empty(len(self._matrix), dtype=np.float32)
+        for start in range(0, len(self._matrix), _BLOCK_ROWS):
+            block = np.asarray(self._matrix[start : start + _BLOCK_ROWS], dtype=np.float32)
+            scores[start : start + len(block)] = block @ query
+        return scores
+
+    def _probe_rows(self, query: np.ndarray, probes: int) -> np.ndarray:
+        ivf = self._ivf
+        assert ivf is not None
+        probes = min(probes, len(ivf.centroids))
+        nearest = np.argpartition(-(ivf.centroids @ query), probes - 1)[:probes]
+        return np.concatenate(
+            [ivf.rows[ivf.offsets[item] : ivf.offsets[item + 1]] for item in nearest]
+        )
+
+    def search(
+        self,
+        query: Sequence[float],
+        limit: int,
+        *,
+        rows: np.ndarray | None = None,
+        probes: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Top ``limit`` rows by cosine similarity as ``(row, similarity)``, best first.
+
+        ``rows`` restricts the search to those matrix rows. ``probes`` scans only that
+        many IVF lists when an IVF index was exported; otherwise the search is exact.
+        """
+
+        if limit <= 0 or not len(self._matrix):
+            return []
+        vector = np.asarray(query, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return []
+        vector = vector / norm
+
+        candidates = rows
+        if probes and self._ivf is not None:
+            probed = self._probe_rows(vector, probes)
+            if rows is not None:
+                allowed = np.zeros(len(self._matrix), dtype=bool)
+                allowed[rows] = True
+                probed = probed[allowed[probed]]
+            candidates = probed
+        if candidates is not None:
+            candidates = np.sort(candidates)
+            if not len(candidates):
+                return []
+
+        scores = self._similarities(vector, candidates)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        positions = top if candidates is None else candidates[top]
+        return [(int(row), float(scores[index])) for row, index in zip(positions, top, strict=True)]
+
+
+@dataclass(slots=True)
+class _MatrixCache:
+    key: tuple[str, int, int] | None = None
+    matrix: EmbeddingMatrix | None = None
+
+
+_MATRIX_CACHE = _MatrixCache()
+_MATRIX_LOCK = threading.Lock()
+
+
+def load_embedding_matrix(directory: Path) -> EmbeddingMatrix | None:
+    """Return the mapped matrix for ``directory``, reopened only after a new export."""
+
+    try:
+        stat = (directory / IDS_FILENAME).stat()
+    except FileNotFoundError:
+        return None
+    key = (str(directory.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _MATRIX_LOCK:
+        if _MATRIX_CACHE.key != key:
+            _MATRIX_CACHE.matrix = EmbeddingMatrix(directory)
+            _MATRIX_CACHE.key = key
+        return _MATRIX_CACHE.matrix
+
+
+def reset_embedding_matrix_cache() -> None:
+    with _MATRIX_LOCK:
+        _MATRIX_CACHE.key = None
+        _MATRIX_CACHE.matrix = None
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import hashlib
 import importlib
 import logging
 import re
@@ -11,9 +10,13 @@ from typing import Any, cast
 
 from rapidfuzz import fuzz
 
-from atticus.tokenization import count_tokens, decode, encode, truncate_text
+from atticus.circuit_breaker import GENERATION_BREAKER, get_circuit_breaker
+from atticus.openai_client import get_openai_client
+from atticus.tokenization import count_tokens, count_tokens_batch, decode, encode, truncate_text
+from atticus.tracing import set_span_attributes, span, traced
 from core.config import AppSettings
 
+from .deadline import Deadline
 from .prompts import get_prompt_template
 
 UNCERTAINTY_PATTERNS: tuple[str, ...] = (
@@ -35,6 +38,9 @@ NO_DATA_PATTERNS: tuple[str, ...] = (
     r"\bconsult\s+.*?representative\b",
 )
 
+# Below this much remaining budget an LLM call cannot realistically finish in time.
+MIN_GENERATION_BUDGET_SECONDS = 0.5
+
 
 class GeneratorClient:
     """Wrapper around OpenAI responses with offline fallback."""
@@ -45,41 +51,23 @@ class GeneratorClient:
         template_version = getattr(settings, "generation_prompt_version", "atticus-v1")
         self.prompt_token_limit = int(getattr(settings, "prompt_token_limit", 1500))
         self.answer_token_limit = int(getattr(settings, "answer_token_limit", 1000))
+        self.degraded = False
+        self.degraded_reason: str | None = None
+        self._timeout_errors: tuple[type[BaseException], ...] = ()
         try:
             self.prompt_template = get_prompt_template(template_version)
         except KeyError as exc:
             raise ValueError(
                 f"Prompt template version '{template_version}' is not registered"
             ) from exc
-        # Resolve API key and record source for diagnostics
-        source = "none"
         api_key = getattr(settings, "openai_api_key", None)
-        if api_key:
-            source = "settings"
         self._client: Any | None = None
         if api_key:  # pragma: no cover - requires network
             try:
+                # Shared pooled client: connections are reused across requests.
+                self._client = get_openai_client(settings, self.logger)
                 openai_module = importlib.import_module("openai")
-                openai_class = cast(Any, openai_module).OpenAI
-                # Pass the key explicitly so we don't rely on process env
-                self._client = openai_class(api_key=api_key)
-                # Safe fingerprint (sha256 prefix) for troubleshooting without leaking secrets
-                try:
-                    fp = hashlib.sha256(str(api_key).encode("utf-8")).hexdigest()[:12]
-                except Exception:
-                    fp = "unknown"
-                self.logger.info(
-                    "openai_client_initialized",
-                    extra={
-                        "extra_payload": {
-                            "client": "generator",
-                            "source": source,
-                            "key_fp": fp,
-                            "model": self.settings.generation_model,
-                            "prompt_version": self.prompt_template.version,
-                        }
-                    },
-                )
+                self._timeout_errors = (cast(Any, openai_module).APITimeoutError,)
             except Exception as exc:  # pragma: no cover - network path
                 self.logger.warning(
                     "OpenAI client unavailable; using offline summarizer",
@@ -95,38 +83,74 @@ class GeneratorClient:
                 },
             )
 
+    @traced("generator.trim_context_window")
     def _trim_context_window(self, contexts: list[str], available_tokens: int) -> list[str]:
         if available_tokens <= 0:
             return []
         trimmed: list[str] = []
         remaining = available_tokens
-        for block in contexts:
-            tokens = encode(block)
-            if not tokens:
+        # Counts come from the memo (seeded with ingest-time counts for retrieved chunks);
+        # only a block that has to be cut is actually encoded.
+        for block, token_count in zip(contexts, count_tokens_batch(contexts), strict=True):
+            if not token_count:
                 trimmed.append(block)
                 continue
-            if len(tokens) <= remaining:
+            if token_count <= remaining:
                 trimmed.append(block)
-                remaining -= len(tokens)
+                remaining -= token_count
             else:
                 if remaining > 0:
-                    trimmed.append(decode(tokens[:remaining]))
+                    trimmed.append(decode(encode(block)[:remaining]))
                 break
+        set_span_attributes(
+            available_tokens=available_tokens,
+            contexts=len(contexts),
+            retained_contexts=len(trimmed),
+        )
         return trimmed
 
     def _finalize_answer(self, text: str) -> str:
         return truncate_text(text, self.answer_token_limit)
 
+    def _mark_degraded(self, reason: str, budget_seconds: float | None) -> None:
+        self.degraded = True
+        self.degraded_reason = reason
+        set_span_attributes(degraded=reason)
+        self.logger.warning(
+            "Generation degraded; using offline summarizer",
+            extra={
+                "extra_payload": {
+                    "reason": reason,
+                    "budget_ms": round((budget_seconds or 0.0) * 1000, 2),
+                    "model": self.settings.generation_model,
+                }
+            },
+        )
+
+    @traced("generator.generate")
     def generate(  # noqa: PLR0912, PLR0915
         self,
         prompt: str,
         contexts: Iterable[str],
         citations: Iterable[str] | None = None,
         temperature: float = 0.2,
+        *,
+        deadline: Deadline | None = None,
     ) -> str:
+        """Generate a grounded answer, falling back to the offline summarizer.
+
+        When ``deadline`` is given the LLM call is bounded by the remaining budget: the
+        request is aborted at the deadline and the offline answer is returned instead,
+        with :attr:`degraded` set so callers can flag the response (and skip caching it).
+        Upstream errors and empty responses are marked degraded the same way.
+        """
+
+        self.degraded = False
+        self.degraded_reason = None
         context_list = list(contexts)
         prompt_tokens = count_tokens(prompt)
         available_tokens = max(self.prompt_token_limit - prompt_tokens, 0)
+        set_span_attributes(prompt_tokens=prompt_tokens, online=self._client is not None)
         trimmed_contexts = self._trim_context_window(context_list, available_tokens)
         if len(trimmed_contexts) < len(context_list):
             self.logger.info(
@@ -146,29 +170,57 @@ class GeneratorClient:
                 "I was unable to find supporting context for this question."
             )
 
-        if self._client is not None:  # pragma: no cover - requires network
+        budget = deadline.remaining() if deadline is not None else None
+        breaker = get_circuit_breaker(GENERATION_BREAKER, self.settings)
+        skip_reason: str | None = None
+        if self._client is not None:
+            if budget is not None and budget < MIN_GENERATION_BUDGET_SECONDS:
+                skip_reason = "deadline_exhausted"
+            elif breaker is not None and not breaker.allow():
+                skip_reason = "circuit_open"
+        if skip_reason is not None:
+            self._mark_degraded(skip_reason, budget)
+        elif self._client is not None:  # pragma: no cover - requires network
             try:
                 system_prompt = self.prompt_template.render_system()
                 user_prompt = self.prompt_template.render_user(prompt=prompt, context=context_text)
-                response: Any = self._client.responses.create(
-                    model=self.settings.generation_model,
-                    input=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=temperature,
-                    max_output_tokens=self.answer_token_limit,
-                )
+                client = self._client
+                if budget is not None:
+                    # A per-call timeout aborts the HTTP request at the deadline, which
+                    # cancels the upstream generation instead of leaving it running.
+                    client = client.with_options(timeout=budget, max_retries=0)
+                with span("generator.llm_call", model=self.settings.generation_model):
+                    response: Any = client.responses.create(
+                        model=self.settings.generation_model,
+                        input=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        temperature=temperature,
+                        max_output_tokens=self.answer_token_limit,
+                    )
+                if breaker is not None:
+                    breaker.record_success()
                 if getattr(response, "output", None):
                     first_output = response.output[0]
                     content = getattr(first_output, "content", None)
                     if content and getattr(content[0], "text", None):
                         return self._finalize_answer(str(content[0].text).strip())
+                self._mark_degraded("upstream_error", budget)
+            except self._timeout_errors:
+                if breaker is not None:
+                    breaker.record_failure()
+                self._mark_degraded(
+                    "deadline_exceeded" if budget is not None else "upstream_timeout", budget
+                )
             except Exception as exc:
+                if breaker is not None:
+                    breaker.record_failure()
                 self.logger.error(
                     "OpenAI generation failed; using offline summarizer",
                     extra={"extra_payload": {"error": str(exc)}},
                 )
+                self._mark_degraded("upstream_error", budget)
 
         # Offline: try Q/A matching first, then specialized heuristics, then summary
         lowered_prompt = prompt.lower()
@@ -0,0 +1,268 @@
+"""Versioned lexical index and chunk store written at ingest, memory-mapped at startup.
+
+Ingestion writes one directory per corpus version next to the manifest::
+
+    lexical/
+      CURRENT                  -> name of the live version directory
+      v2-<version hash>/
+        header.json            format version, corpus version, counts
+        vocab.json             term list; a term's id is its position
+        term_offsets.npy       postings of term ``t`` are ``[offsets[t], offsets[t + 1])``
+        postings_docs.npy      chunk positions, ascending within each term
+        postings_tf.npy        term frequency for each posting
+        doc_lengths.npy        token count per chunk (BM25 ``dl``)
+        chunk_pools.json       chunk ids and interned string pools
+        chunk_*.npy            chunk table columns (see ``retriever.chunk_table``)
+        texts.bin              UTF-8 chunk texts, concatenated
+
+``CURRENT`` is swapped atomically after a version is complete, so readers never see
+a half-written index. The retriever maps the arrays and texts read-only (shared
+between workers via the page cache) instead of downloading every chunk from Postgres
+and re-tokenizing the corpus, and caches the loaded index per process until the next
+ingest. Without a persisted index the same structures are built in memory.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import shutil
+import threading
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+from atticus.profiling import deep_sizeof
+from atticus.utils import sha256_text
+from atticus.vector_db import StoredChunk
+
+from .chunk_table import ChunkTable
+
+FORMAT_VERSION = 2
+CURRENT_FILENAME = "CURRENT"
+HEADER_FILENAME = "header.json"
+VOCAB_FILENAME = "vocab.json"
+KEEP_VERSIONS = 2
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+_ARRAYS = ("term_offsets", "postings_docs", "postings_tf", "doc_lengths")
+
+D = TypeVar("D")
+
+
+def lexical_tokens(text: str) -> list[str]:
+    """Tokenizer shared by the persisted index and query-time BM25."""
+
+    tokens = _TOKEN_SPLIT.split(text.lower())
+    return [t for t in tokens if t and (len(t) > 1 or t.isdigit())]
+
+
+class LexicalIndex:
+    """BM25 postings over a chunk list; terms and chunks are addressed by integer id."""
+
+    def __init__(self, arrays: dict[str, np.ndarray], terms: list[str]) -> None:
+        self.term_offsets = arrays["term_offsets"]
+        self.postings_docs = arrays["postings_docs"]
+        self.postings_tf = arrays["postings_tf"]
+        self.doc_lengths = arrays["doc_lengths"]
+        self.terms = terms
+        self._vocabulary: dict[str, int] = {term: index for index, term in enumerate(terms)}
+        lengths = self.doc_lengths
+        self.avgdl = float(int(lengths.sum()) / len(lengths)) if len(lengths) else 0.0
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> LexicalIndex:
+        vocabulary: dict[str, int] = {}
+        term_ids: array[int] = array("q")
+        docs: array[int] = array("i")
+        frequencies: array[int] = array("i")
+        lengths: array[int] = array("i")
+        for position, text in enumerate(texts):
+            tokens = lexical_tokens(text)
+            lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                docs.append(position)
+                frequencies.append(count)
+
+        term_array = np.frombuffer(term_ids, dtype=np.int64)
+        doc_array = np.frombuffer(docs, dtype=np.int32)
+        tf_array = np.frombuffer(frequencies, dtype=np.int32)
+        order = np.lexsort((doc_array, term_array))
+        term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_array, minlength=len(vocabulary)), out=term_offsets[1:])
+        arrays: dict[str, np.ndarray] = {
+            "term_offsets": term_offsets,
+            "postings_docs": doc_array[order],
+            "postings_tf": tf_array[order],
+            "doc_lengths": np.asarray(lengths, dtype=np.int32),
+        }
+        return cls(arrays, list(vocabulary))
+
+    def save(self, directory: Path) -> None:
+        for key in _ARRAYS:
+            np.save(directory / f"{key}.npy", getattr(self, key))
+        (directory / VOCAB_FILENAME).write_text(
+            json.dumps(self.terms, ensure_ascii=False), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, directory: Path) -> LexicalIndex:
+        arrays = {key: np.load(directory / f"{key}.npy", mmap_mode="r") for key in _ARRAYS}
+        terms = json.loads((directory / VOCAB_FILENAME).read_text(encoding="utf-8"))
+        return cls(arrays, terms)
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def nbytes(self) -> dict[str, int]:
+        return {
+            "postings": int(sum(getattr(self, key).nbytes for key in _ARRAYS)),
+            "vocabulary": deep_sizeof((self.terms, self._vocabulary)),
+        }
+
+    def bm25_scores(self, query: str, mask: np.ndarray | None = None) -> np.ndarray:
+        """Okapi BM25 of ``query`` against every chunk (``k1=1.5``, ``b=0.75``).
+
+        With ``mask``, postings of chunks outside it are dropped before scoring, so those
+        chunks score 0. IDF stays corpus-wide, so in-scope scores match the unmasked ones.
+        """
+
+        count = len(self.doc_lengths)
+        scores = np.zeros(count, dtype=np.float64)
+        avgdl = self.avgdl or 1.0
+        for token in lexical_tokens(query):
+            term = self._vocabulary.get(token)
+            if term is None:
+                continue
+            start, end = int(self.term_offsets[term]), int(self.term_offsets[term + 1])
+            df = end - start
+            idf = math.log((count - df + 0.5) / (df + 0.5) + 1.0)
+            docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end]
+            if mask is not None:
+                keep = mask[docs]
+                docs, tf = docs[keep], tf[keep]
+            tf = tf.astype(np.float64)
+            dl = self.doc_lengths[docs].astype(np.float64)
+            denom = tf + BM25_K1 * (1 - BM25_B + BM25_B * (dl / avgdl))
+            scores[docs] += idf * (tf * (BM25_K1 + 1)) / denom
+        return scores
+
+
+def write_index_artifacts(
+    chunks: Sequence[StoredChunk], root: Path, *, corpus_version: str
+) -> Path:
+    """Write the lexical index and chunk table for ``chunks`` and make it current."""
+
+    name = f"v{FORMAT_VERSION}-{sha256_text(corpus_version)[:16]}"
+    root.mkdir(parents=True, exist_ok=True)
+    staging = root / f".{name}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    table = ChunkTable.from_chunks(chunks)
+    table.save(staging)
+    lexical = LexicalIndex.build(table.texts())
+    lexical.save(staging)
+    header = {
+        "format_version": FORMAT_VERSION,
+        "corpus_version": corpus_version,
+        "chunk_count": len(table),
+        "vocabulary_size": len(lexical.terms),
+        "postings": len(lexical.postings_docs),
+    }
+    (staging / HEADER_FILENAME).write_text(json.dumps(header, indent=2), encoding="utf-8")
+
+    target = root / name
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    pointer = root / f".{CURRENT_FILENAME}.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    os.replace(pointer, root / CURRENT_FILENAME)
+    _prune_versions(root, keep=name)
+    return target
+
+
+def _prune_versions(root: Path, *, keep: str) -> None:
+    # Keep the newest superseded versions so workers still mapping them are not cut off.
+    superseded = sorted(
+        (
+            path
+            for path in root.iterdir()
+            if path.is_dir() and path.name.startswith("v") and path.name != keep
+        ),
+        key=lambda path: path.stat().st_mtime_ns,
+        reverse=True,
+    )
+    for path in superseded[KEEP_VERSIONS - 1 :]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class IndexArtifacts:
+    """A loaded index version: the mapped chunk table and its lexical index."""
+
+    def __init__(self, directory: Path) -> None:
+        header = json.loads((directory / HEADER_FILENAME).read_text(encoding="utf-8"))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported lexical index format in {directory}")
+        self.directory = directory
+        self.corpus_version: str = str(header["corpus_version"])
+        self.table = ChunkTable.load(directory)
+        self.lexical = LexicalIndex.load(directory)
+        if len(self.lexical) != len(self.table):
+            raise ValueError(f"Lexical index in {directory} does not match its chunk table")
+        self._derived: dict[Any, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, key: Any, factory: Callable[[], D]) -> D:
+        """Per-version memo for structures built from the chunks (metadata bitmaps etc.)."""
+
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = factory()
+            value: D = self._derived[key]
+            return value
+
+
+@dataclass(slots=True)
+class _ArtifactsCache:
+    key: tuple[str, str] | None = None
+    artifacts: IndexArtifacts | None = None
+
+
+_ARTIFACTS_CACHE = _ArtifactsCache()
+_ARTIFACTS_LOCK = threading.Lock()
+
+
+def load_index_artifacts(root: Path) -> IndexArtifacts | None:
+    """Return the current index version under ``root`` (cached until ``CURRENT`` moves)."""
+
+    try:
+        name = (root / CURRENT_FILENAME).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    key = (str(root.resolve()), name)
+    with _ARTIFACTS_LOCK:
+        if _ARTIFACTS_CACHE.key != key:
+            directory = root / name
+            if not (directory / HEADER_FILENAME).exists():
+                return None
+            _ARTIFACTS_CACHE.artifacts = IndexArtifacts(directory)
+            _ARTIFACTS_CACHE.key = key
+        return _ARTIFACTS_CACHE.artifacts
+
+
+def reset_index_artifacts_cache() -> None:
+    with _ARTIFACTS_LOCK:
+        _ARTIFACTS_CACHE.key = None
+        _ARTIFACTS_CACHE.artifacts = None
@@ -0,0 +1,159 @@
+"""Bitmap index over chunk metadata for scoping retrieval.
+
+One NumPy bool array per ``product_family``, ``source_type`` and model (plus the
+chunk positions of each source path) is built when the vector store loads. A filter
+dict resolves to the intersection of those bitmaps, so BM25 scoring and vector
+candidate generation only ever touch in-scope chunks instead of re-checking manifest
+entries chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+from .chunk_table import ChunkTable
+
+_PREFIX_CACHE_LIMIT = 256
+
+
+def _split_values(value: object) -> set[str]:
+    return {part.strip().lower() for part in str(value).split(",") if part.strip()}
+
+
+def parse_models(raw: object) -> list[str]:
+    """Normalized model names from a chunk's ``models`` metadata (a JSON list)."""
+
+    if not raw:
+        return []
+    try:
+        parsed = json.loads(raw) if isinstance(raw, str) else raw
+    except json.JSONDecodeError:
+        parsed = raw
+    models: list[object] = parsed if isinstance(parsed, list) else [parsed]
+    return [str(model).strip().lower() for model in models if str(model).strip()]
+
+
+def _label_bitmaps(keys: np.ndarray, labels: Sequence[str | None]) -> dict[str, np.ndarray]:
+    """One bitmap per distinct label, where chunk ``i`` carries ``labels[keys[i]]``."""
+
+    names = list(dict.fromkeys(label for label in labels if label is not None))
+    name_ids = {name: index for index, name in enumerate(names)}
+    lookup = np.fromiter(
+        (-1 if label is None else name_ids[label] for label in labels), np.int32, len(labels)
+    )
+    per_chunk = lookup[keys]
+    return {name: per_chunk == index for index, name in enumerate(names)}
+
+
+class MetadataIndex:
+    """Precomputed per-value bitmaps over a chunk table.
+
+    Bitmaps are derived from the table's interned code columns, so building the
+    index costs a few vectorized passes per distinct value rather than a Python
+    loop over every chunk.
+    """
+
+    def __init__(self, table: ChunkTable, documents: Mapping[str, Mapping[str, Any]]) -> None:
+        self.size = len(table)
+        path_codes = np.asarray(table.columns["source_path"], dtype=np.intp)
+        entries = [documents.get(path, {}) for path in table.pools["source_path"]]
+
+        # A chunk's family is its own metadata value when set, else its document's.
+        family_labels = [str(entry.get("product_family") or "").lower() for entry in entries]
+        family_keys = path_codes
+        own_families = table.extra_codes("product_family")
+        if own_families is not None:
+            codes, pool = own_families
+            codes = np.asarray(codes, dtype=np.intp)
+            set_values = np.fromiter((bool(value) for value in pool), bool, len(pool))
+            own = np.zeros(self.size, dtype=bool)
+            own[codes >= 0] = set_values[codes[codes >= 0]]
+            family_keys = np.where(own, codes + len(family_labels), path_codes)
+            family_labels.extend(value.lower() for value in pool)
+        self._families = _label_bitmaps(family_keys, family_labels)
+
+        source_types = [
+            value if isinstance(value := entry.get("source_type"), str) else None
+            for entry in entries
+        ]
+        self._source_types = _label_bitmaps(path_codes, source_types)
+
+        self._models: dict[str, np.ndarray] = {}
+        models = table.extra_codes("models")
+        if models is not None:
+            codes, pool = models
+            carriers: dict[str, list[int]] = {}
+            for code, raw in enumerate(pool):
+                for model in parse_models(raw):
+                    carriers.setdefault(model, []).append(code)
+            self._models = {model: np.isin(codes, value) for model, value in carriers.items()}
+
+        order = np.argsort(path_codes, kind="stable")
+        bounds = np.zeros(len(table.pools["source_path"]) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(path_codes, minlength=len(bounds) - 1), out=bounds[1:])
+        self._paths = {
+            path: order[bounds[code] : bounds[code + 1]]
+            for code, path in enumerate(table.pools["source_path"])
+        }
+        self._prefixes: dict[str, np.ndarray] = {}
+
+    def _bitmap(self, positions: Sequence[int] | np.ndarray) -> np.ndarray:
+        bitmap = np.zeros(self.size, dtype=bool)
+        bitmap[np.asarray(positions, dtype=np.intp)] = True
+        return bitmap
+
+    def _any_of(self, bitmaps: Mapping[str, np.ndarray], values: set[str]) -> np.ndarray:
+        result = np.zeros(self.size, dtype=bool)
+        for value in values:
+            bitmap = bitmaps.get(value)
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    def _prefix(self, prefix: str) -> np.ndarray:
+        bitmap = self._prefixes.get(prefix)
+        if bitmap is None:
+            matches = [
+                positions for path, positions in self._paths.items() if path.startswith(prefix)
+            ]
+            bitmap = self._bitmap(np.concatenate(matches) if matches else [])
+            if len(self._prefixes) >= _PREFIX_CACHE_LIMIT:
+                self._prefixes.clear()
+            self._prefixes[prefix] = bitmap
+        return bitmap
+
+    def mask(self, filters: Mapping[str, str] | None) -> np.ndarray | None:
+        """Bitmap of chunks allowed by ``filters``; ``None`` when nothing constrains them.
+
+        ``source_type`` is an exact match on the manifest entry, ``path_prefix`` a prefix of
+        the source path, and ``product_family``/``model`` comma-separated, case-insensitive
+        allow-lists.
+        """
+
+        if not filters:
+            return None
+        constraints: list[np.ndarray] = []
+        source_type = filters.get("source_type")
+        if source_type:
+            empty = np.zeros(self.size, dtype=bool)
+            constraints.append(self._source_types.get(source_type, empty))
+        prefix = filters.get("path_prefix")
+        if prefix:
+            constraints.append(self._prefix(prefix))
+        families = _split_values(filters.get("product_family") or "")
+        if families:
+            constraints.append(self._any_of(self._families, families))
+        models = _split_values(filters.get("model") or "")
+        if models:
+            constraints.append(self._any_of(self._models, models))
+        if not constraints:
+            return None
+        return np.logical_and.reduce(constraints) if len(constraints) > 1 else constraints[0]
+
+    def nbytes(self) -> int:
+        groups = (self._families, self._source_types, self._models, self._paths, self._prefixes)
+        return sum(array.nbytes for group in groups for array in group.values())
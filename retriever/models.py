@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import json
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
+from atticus.aho_corasick import AhoCorasick
 from core.config import load_settings
 
 
@@ -31,6 +32,7 @@ class Answer:
     model: str | None = None
     family: str | None = None
     family_label: str | None = None
+    degraded: bool = False
 
 
 @dataclass(frozen=True, slots=True)
@@ -56,6 +58,66 @@ class FamilyCatalogEntry:
     models: dict[str, ModelIdentifier]
 
 
+_MODEL_ALIAS = 0
+_FAMILY_ALIAS = 1
+_PHRASE_END = ""
+
+
+class CatalogMatcher:
+    """Precompiled alias lookup for :func:`extract_models`.
+
+    Multi-word aliases live in a token trie walked from each question token (the same
+    as a padded substring test on the normalized text); single-word aliases are found
+    by token lookup or by one Aho-Corasick pass over the compact text.
+    """
+
+    __slots__ = ("_compact", "_phrases", "_words")
+
+    def __init__(
+        self,
+        alias_to_model: dict[str, ModelIdentifier],
+        family_alias_to_id: dict[str, FamilyOption],
+    ) -> None:
+        self._phrases: dict[str, Any] = {}
+        self._words: dict[str, list[tuple[int, str]]] = {}
+        compact_patterns: list[tuple[str, tuple[int, str]]] = []
+        for kind, aliases in (
+            (_MODEL_ALIAS, alias_to_model),
+            (_FAMILY_ALIAS, family_alias_to_id),
+        ):
+            for alias in aliases:
+                if " " in alias:
+                    node = self._phrases
+                    for token in alias.split(" "):
+                        node = node.setdefault(token, {})
+                    node.setdefault(_PHRASE_END, []).append((kind, alias))
+                else:
+                    self._words.setdefault(alias, []).append((kind, alias))
+                    compact_alias = _compact(alias)
+                    if compact_alias:
+                        compact_patterns.append((compact_alias, (kind, alias)))
+        self._compact: AhoCorasick[tuple[int, str]] = AhoCorasick(compact_patterns)
+
+    def phrase_hits(self, tokens: list[str]) -> set[tuple[int, str]]:
+        hits: set[tuple[int, str]] = set()
+        for start in range(len(tokens)):
+            node = self._phrases
+            for token in tokens[start:]:
+                child = node.get(token)
+                if child is None:
+                    break
+                node = child
+                hits.update(node.get(_PHRASE_END, ()))
+        return hits
+
+    def word_hits(self, tokens: set[str]) -> set[tuple[int, str]]:
+        words = self._words
+        return {hit for token in tokens if token in words for hit in words[token]}
+
+    def compact_hits(self, compact_text: str) -> set[tuple[int, str]]:
+        return {hit for _, _, values in self._compact.iter_matches(compact_text) for hit in values}
+
+
 @dataclass(slots=True)
 class ModelCatalog:
     families: dict[str, FamilyCatalogEntry]
@@ -64,6 +126,13 @@ class ModelCatalog:
     compact_alias_to_model: dict[str, ModelIdentifier]
     family_alias_to_id: dict[str, FamilyOption]
     compact_family_alias_to_id: dict[str, FamilyOption]
+    _matcher: CatalogMatcher | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def matcher(self) -> CatalogMatcher:
+        if self._matcher is None:
+            self._matcher = CatalogMatcher(self.alias_to_model, self.family_alias_to_id)
+        return self._matcher
 
     def match_model(self, raw: str) -> ModelIdentifier | None:
         norm = _normalize(raw)
@@ -197,6 +266,7 @@ def load_model_catalog(path: str | Path | None = None) -> ModelCatalog:
         compact_alias_to_model=compact_alias_to_model,
         family_alias_to_id=family_alias_to_id,
         compact_family_alias_to_id=compact_family_alias_to_id,
+        _matcher=CatalogMatcher(alias_to_model, family_alias_to_id),
     )
 
 
@@ -221,46 +291,32 @@ def extract_models(question: str, catalog: ModelCatalog | None = None) -> ModelE
             families.add(identifier.family_id)
             confidences.append(0.95)
 
-    matched_aliases: set[str] = set()
+    matcher = catalog.matcher
+    word_hits = matcher.word_hits(tokens)
+    compact_hits = matcher.compact_hits(compact_question) - word_hits
+    scored_hits = (
+        (matcher.phrase_hits(normalized_question.split()), (0.85, 0.7)),
+        (word_hits, (0.8, 0.65)),
+        (compact_hits, (0.75, 0.6)),
+    )
 
-    for alias, identifier in catalog.alias_to_model.items():
-        if alias in matched_aliases:
-            continue
-        if " " in alias:
-            padded = f" {alias} "
-            if padded in f" {normalized_question} ":
-                models.add(identifier.canonical)
-                families.add(identifier.family_id)
-                confidences.append(0.85)
-                matched_aliases.add(alias)
-        elif alias in tokens:
+    matched_aliases: set[str] = set()
+    for hits, (model_confidence, _) in scored_hits:
+        for kind, alias in hits:
+            if kind != _MODEL_ALIAS:
+                continue
+            identifier = catalog.alias_to_model[alias]
             models.add(identifier.canonical)
             families.add(identifier.family_id)
-            confidences.append(0.8)
+            confidences.append(model_confidence)
             matched_aliases.add(alias)
-        else:
-            compact_alias = _compact(alias)
-            if compact_alias and compact_alias in compact_question:
-                models.add(identifier.canonical)
-                families.add(identifier.family_id)
-                confidences.append(0.75)
-                matched_aliases.add(alias)
-
-    for alias, option in catalog.family_alias_to_id.items():
-        if alias in matched_aliases:
-            continue
-        if " " in alias:
-            if f" {alias} " in f" {normalized_question} ":
-                families.add(option.id)
-                confidences.append(0.7)
-        elif alias in tokens:
-            families.add(option.id)
-            confidences.append(0.65)
-        else:
-            compact_alias = _compact(alias)
-            if compact_alias and compact_alias in compact_question:
-                families.add(option.id)
-                confidences.append(0.6)
+
+    for hits, (_, family_confidence) in scored_hits:
+        for kind, alias in hits:
+            if kind != _FAMILY_ALIAS or alias in matched_aliases:
+                continue
+            families.add(catalog.family_alias_to_id[alias].id)
+            confidences.append(family_confidence)
 
     confidence = max(confidences) if confidences else 0.0
     return ModelExtraction(models=models, families=families, confidence=confidence)
@@ -5,15 +5,24 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
+from functools import partial
 from typing import Iterable, Sequence
 
+from atticus.logging import log_event
 from core.config import AppSettings
 
+from .answer_cache import clone_answer
+from .deadline import Deadline
 from .models import Answer
 from .resolver import ModelScope
 from .service import answer_question
+from .singleflight import SingleFlight, SingleFlightTimeout, coalescing_key
 
 _MODEL_CODE_PATTERN = re.compile(r"\bC\d{4,5}\b", re.IGNORECASE)
+_FOCUS_PREFIX = "\n\nFocus only on information relevant to "
+
+# Process-wide in-flight registry so identical concurrent questions share one pipeline run.
+ANSWER_FLIGHTS: SingleFlight[Answer] = SingleFlight()
 
 
 @dataclass(slots=True)
@@ -73,15 +82,21 @@ def split_question(question: str, scopes: Sequence[ModelScope]) -> list[SplitQue
     for scope in scopes:
         focus = _format_focus(scope)
         focus_clause = (
-            f"Focus only on information relevant to {focus}. "
+            f"{_FOCUS_PREFIX}{focus}. "
             "If the original question mentions other models or families, do not reference them or note missing information in your answer. "
             "Answer as if the user only asked about this specific model or family."
         )
-        prompt = f"{question}\n\n{focus_clause}"
+        prompt = f"{question}{focus_clause}"
         split_queries.append(SplitQuery(prompt=prompt, scope=scope))
     return split_queries
 
 
+def original_question(prompt: str) -> str:
+    """Return the question a ``split_question`` prompt was built from."""
+
+    return prompt.split(_FOCUS_PREFIX, 1)[0]
+
+
 def run_rag_for_each(
     question: str,
     scopes: Sequence[ModelScope],
@@ -91,6 +106,7 @@ def run_rag_for_each(
     filters: dict[str, str] | None = None,
     top_k: int | None = None,
     context_hints: Iterable[str] | None = None,
+    deadline: Deadline | None = None,
 ) -> list[QueryAnswer]:
     """Execute retrieval and generation for each targeted query."""
 
@@ -99,9 +115,13 @@ def run_rag_for_each(
     hints = list(context_hints or [])
     results: list[QueryAnswer] = []
 
+    coalesce = bool(getattr(settings, "request_coalescing_enabled", False))
+
     for split in split_queries:
         scoped_filters = dict(base_filters)
-        answer = answer_question(
+
+        run = partial(
+            answer_question,
             split.prompt,
             settings=settings,
             filters=scoped_filters,
@@ -111,7 +131,36 @@ def run_rag_for_each(
             product_family=split.scope.family_id or None,
             family_label=split.scope.family_label or None,
             model=split.scope.model,
+            deadline=deadline,
         )
+
+        if coalesce:
+            key = coalescing_key(
+                split.prompt,
+                family_id=split.scope.family_id,
+                family_label=split.scope.family_label,
+                model=split.scope.model,
+                filters=scoped_filters,
+                top_k=top_k,
+                context_hints=hints,
+            )
+            timeout = deadline.remaining() if deadline is not None else None
+            try:
+                answer, shared = ANSWER_FLIGHTS.do(key, run, timeout=timeout)
+            except SingleFlightTimeout:
+                # The leader outlived this request's budget; with the deadline spent the
+                # pipeline skips generation and returns the degraded grounded summary.
+                log_event(
+                    logger, "request_coalesce_timeout", coalescing_key=key[:16], timeout=timeout
+                )
+                answer, shared = run(), False
+            if shared:
+                answer = clone_answer(answer)
+                log_event(
+                    logger, "request_coalesced", coalescing_key=key[:16], model=split.scope.model
+                )
+        else:
+            answer = run()
         results.append(QueryAnswer(scope=split.scope, answer=answer))
 
     return results
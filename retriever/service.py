@@ -5,11 +5,23 @@ from __future__ import annotations
 import logging
 import re
 
+from atticus.embeddings import EmbeddingClient
 from atticus.logging import configure_logging, log_event
-from core.config import AppSettings, load_settings
-
+from atticus.stages import EMBEDDING_STAGE, FORMATTING_STAGE, GENERATION_STAGE, stage
+from atticus.tokenization import remember_token_count
+from atticus.tracing import set_span_attributes, traced
+from core.config import AppSettings, load_manifest_cached, load_settings
+
+from .answer_cache import (
+    AnswerCache,
+    AnswerCacheKey,
+    build_cache_key,
+    corpus_version,
+    get_answer_cache,
+)
 from .answer_format import format_answer_markdown
 from .citation_utils import dedupe_citations
+from .deadline import Deadline
 from .generator import GeneratorClient
 from .models import Answer, Citation
 from .vector_store import RetrievalMode, SearchResult, VectorStore
@@ -164,6 +176,10 @@ def _format_contexts(results: list[SearchResult], limit: int) -> tuple[list[str]
         if page_value:
             descriptor += f" (page {page_value})"
         contexts.append(result.text)
+        # Reuse the ingest-time count so the generator never re-tokenizes indexed chunks.
+        stored_tokens = str(result.metadata.get("token_count") or "")
+        if stored_tokens.isdigit():
+            remember_token_count(result.text, int(stored_tokens))
         citations.append(
             Citation(
                 chunk_id=result.chunk_id,
@@ -183,6 +199,22 @@ def _format_contexts(results: list[SearchResult], limit: int) -> tuple[list[str]
 LLM_CONF_SWITCH = 0.80
 
 
+def _cache_lookup(
+    cache: AnswerCache,
+    key: AnswerCacheKey,
+    question: str,
+    settings: AppSettings,
+    logger: logging.Logger,
+) -> tuple[Answer | None, list[float] | None]:
+    embedding: list[float] | None = None
+    if cache.semantic_enabled:
+        with stage(EMBEDDING_STAGE):
+            vectors = EmbeddingClient(settings, logger=logger).embed_texts([question])
+        embedding = list(vectors[0]) if vectors else None
+    return cache.get(key, embedding=embedding), embedding
+
+
+@traced("service.answer_question")
 def answer_question(
     question: str,
     settings: AppSettings | None = None,
@@ -194,19 +226,55 @@ def answer_question(
     product_family: str | None = None,
     family_label: str | None = None,
     model: str | None = None,
+    deadline: Deadline | None = None,
 ) -> Answer:
     settings = settings or load_settings()
     logger = logger or configure_logging(settings)
-    store = VectorStore(settings, logger)
     window = top_k or settings.top_k
     merged_filters = dict(filters or {})
     if product_family:
         merged_filters["product_family"] = product_family
+
+    cache = get_answer_cache(settings)
+    manifest = load_manifest_cached(settings.manifest_path) if cache is not None else None
+    cache_key: AnswerCacheKey | None = None
+    query_embedding: list[float] | None = None
+    if cache is not None and manifest is not None:
+        cache_key = build_cache_key(
+            question,
+            settings=settings,
+            corpus_version=corpus_version(manifest.corpus_hash, manifest.created_at),
+            filters=merged_filters,
+            top_k=window,
+            context_hints=context_hints,
+            product_family=product_family,
+            family_label=family_label,
+            model=model,
+        )
+        cached, query_embedding = _cache_lookup(cache, cache_key, question, settings, logger)
+        if cached is not None:
+            # Exact hits match after normalization and semantic hits by similarity, so the
+            # stored wording can differ from what this caller asked.
+            cached.question = question
+            set_span_attributes(answer_cache_hit=True)
+            log_event(
+                logger,
+                "answer_cache_hit",
+                cache_key=cache_key.digest[:16],
+                confidence=cached.confidence,
+                citations=len(cached.citations),
+                filters=merged_filters,
+            )
+            return cached
+
+    store = VectorStore(settings, logger)
     results = store.search(
         question,
         top_k=window,
         filters=merged_filters,
         mode=RetrievalMode.HYBRID,
+        # A semantic cache miss already embedded the question; don't pay for it twice.
+        query_embedding=query_embedding,
     )
 
     if not results:
@@ -233,13 +301,14 @@ def answer_question(
         )
         return answer
 
-    contexts, citations = _format_contexts(results, settings.max_context_chunks)
-    ampv_context = _ampv_hint(
-        question,
-        results,
-        product_family=product_family,
-        model=model,
-    )
+    with stage(FORMATTING_STAGE):
+        contexts, citations = _format_contexts(results, settings.max_context_chunks)
+        ampv_context = _ampv_hint(
+            question,
+            results,
+            product_family=product_family,
+            model=model,
+        )
     if ampv_context:
         contexts.insert(0, ampv_context)
     if context_hints:
@@ -254,7 +323,9 @@ def answer_question(
             descriptor += f" — {item.heading}"
         citation_texts.append(descriptor)
 
-    response = generator.generate(question, contexts, citation_texts)
+    with stage(GENERATION_STAGE):
+        response = generator.generate(question, contexts, citation_texts, deadline=deadline)
+    degraded = bool(getattr(generator, "degraded", False))
 
     # Emphasize the head of the ranking when computing retrieval confidence
     head = min(5, settings.max_context_chunks)
@@ -267,8 +338,9 @@ def answer_question(
     confidence = round(w_r * retrieval_conf + w_l * llm_conf, 2)
     should_escalate = confidence < settings.confidence_threshold
 
-    citations = dedupe_citations(citations)
-    formatted_response = format_answer_markdown(response, citations)
+    with stage(FORMATTING_STAGE):
+        citations = dedupe_citations(citations)
+        formatted_response = format_answer_markdown(response, citations)
     answer = Answer(
         question=question,
         response=formatted_response,
@@ -278,8 +350,16 @@ def answer_question(
         model=model,
         family=product_family,
         family_label=family_label,
+        degraded=degraded,
     )
 
+    set_span_attributes(
+        results=len(results),
+        contexts=len(contexts),
+        confidence=confidence,
+        escalate=should_escalate,
+        degraded=degraded,
+    )
     log_event(
         logger,
         "answer_generated",
@@ -287,5 +367,10 @@ def answer_question(
         citations=len(citations),
         escalate=should_escalate,
         filters=merged_filters,
+        degraded=degraded,
+        degraded_reason=getattr(generator, "degraded_reason", None),
     )
+    # Degraded answers are not cached so the next ask can get the full LLM answer.
+    if cache is not None and cache_key is not None and not degraded:
+        cache.put(cache_key, answer, embedding=query_embedding)
     return answer
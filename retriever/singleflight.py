@@ -0,0 +1,136 @@
+"""Single-flight coalescing for identical concurrent retrieval requests.
+
+When several callers ask the same question under the same scope at the same time,
+only the first (the *leader*) runs the embed → search → generate pipeline. The
+others wait for the leader's result instead of repeating the work, but never past
+their own deadline: a follower that times out gets :class:`SingleFlightTimeout` and
+falls back to its own (degraded) run, so a hung leader cannot pin every waiter.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from .answer_cache import normalize_question
+
+T = TypeVar("T")
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised in a follower whose wait for the leader's result ran out."""
+
+
+@dataclass(slots=True)
+class _Call(Generic[T]):  # noqa: UP046
+    done: threading.Event = field(default_factory=threading.Event)
+    result: T | None = None
+    error: BaseException | None = None
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    max_waiters: int = 0
+
+
+class SingleFlight(Generic[T]):  # noqa: UP046
+    """Share one in-flight computation between callers using the same key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+        self.stats = SingleFlightStats()
+
+    def do(self, key: str, fn: Callable[[], T], *, timeout: float | None = None) -> tuple[T, bool]:
+        """Run ``fn`` once per concurrent ``key``; return ``(result, shared)``.
+
+        ``shared`` is ``True`` for callers that received a leader's result. Errors
+        raised by the leader are re-raised in every waiting caller. A follower waits at
+        most ``timeout`` seconds and then raises :class:`SingleFlightTimeout`.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats.coalesced += 1
+                self.stats.max_waiters = max(self.stats.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats.leaders += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                with self._lock:
+                    call.waiters -= 1
+                    self.stats.timeouts += 1
+                raise SingleFlightTimeout(f"Timed out after {timeout}s waiting for {key[:16]}")
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.stats.leaders,
+                "coalesced": self.stats.coalesced,
+                "errors": self.stats.errors,
+                "timeouts": self.stats.timeouts,
+                "max_waiters": self.stats.max_waiters,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = SingleFlightStats()
+
+
+def coalescing_key(
+    question: str,
+    *,
+    family_id: str | None,
+    family_label: str | None,
+    model: str | None,
+    filters: dict[str, str] | None,
+    top_k: int | None,
+    context_hints: Sequence[str] | None,
+) -> str:
+    """Identity for "the same request": normalized question, scope, filters and top_k."""
+
+    material = json.dumps(
+        {
+            "question": normalize_question(question),
+            "scope": [family_id or "", family_label or "", model or ""],
+            "filters": sorted((str(k), str(v)) for k, v in (filters or {}).items()),
+            "top_k": top_k,
+            "hints": list(context_hints or []),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
@@ -3,20 +3,47 @@
 from __future__ import annotations
 
 import logging
-import math
 import re
+import time
 from collections import OrderedDict
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any
+from typing import Any, TypeVar
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
 from atticus.embeddings import EmbeddingClient
 from atticus.logging import log_event
-from atticus.vector_db import PgVectorRepository, StoredChunk
+from atticus.profiling import deep_sizeof, note_memory_footprint
+from atticus.stages import (
+    EMBEDDING_STAGE,
+    FUZZ_STAGE,
+    LEXICAL_STAGE,
+    SQL_STAGE,
+    VECTOR_STAGE,
+    record_stage,
+    stage,
+)
+from atticus.tracing import set_span_attributes, traced
+from atticus.vector_db import PgVectorRepository
 from core.config import EMBEDDING_MODEL_SPECS, AppSettings, Manifest, load_manifest
 
+from .answer_cache import corpus_version
+from .chunk_table import ChunkTable
+from .embedding_matrix import EmbeddingMatrix, load_embedding_matrix
+from .index_artifacts import IndexArtifacts, LexicalIndex, load_index_artifacts
+from .metadata_index import MetadataIndex
+
+D = TypeVar("D")
+
+# Scopes up to this many chunks are sent to pgvector as a ``chunk_id`` list; broader ones
+# run an unscoped nearest-neighbour query, over-fetched by up to ``PGVECTOR_SCOPE_OVERFETCH``
+# times, and are filtered against the scope bitmap here.
+PGVECTOR_SCOPE_ID_LIMIT = 2_000
+PGVECTOR_SCOPE_OVERFETCH = 8
+
 
 class RetrievalMode(str, Enum):
     """Supported retrieval scoring strategies."""
@@ -45,6 +72,19 @@ class RetrievalMode(str, Enum):
         return cls.HYBRID if hybrid else cls.VECTOR
 
 
+def _top_positions(scores: np.ndarray, pool: np.ndarray, limit: int) -> list[int]:
+    """``pool`` positions with the highest scores, ties in pool order (like a stable sort)."""
+
+    values = scores[pool]
+    if limit < len(values):
+        threshold = np.partition(values, len(values) - limit)[len(values) - limit]
+        keep = values >= threshold
+        pool, values = pool[keep], values[keep]
+    order = np.argsort(-values, kind="stable")[:limit]
+    positions: list[int] = pool[order].tolist()
+    return positions
+
+
 @dataclass(slots=True)
 class SearchResult:
     chunk_id: str
@@ -60,6 +100,18 @@ class SearchResult:
     fuzz_score: float
 
 
+@dataclass(slots=True)
+class _Candidate:
+    """A scored chunk position, materialized as a ``SearchResult`` only if it ranks."""
+
+    idx: int
+    row: dict[str, Any]
+    score: float
+    vector_score: float
+    lexical_score: float
+    fuzz_score: float
+
+
 class VectorStore:
     """pgvector-backed vector search with optional hybrid re-ranking."""
 
@@ -77,21 +129,93 @@ class VectorStore:
             raise FileNotFoundError("Vector manifest not found. Run ingestion first.")
         self.manifest: Manifest = manifest
 
-        self.chunks: list[StoredChunk] = self.repository.load_all_chunk_metadata()
-        self.chunk_index_map: dict[str, int] = {
-            chunk.chunk_id: idx for idx, chunk in enumerate(self.chunks)
-        }
-        self.chunk_lookup: dict[str, StoredChunk] = {chunk.chunk_id: chunk for chunk in self.chunks}
+        # The index persisted at ingest replaces the chunk download and re-tokenization.
+        self._artifacts = self._load_artifacts()
+        self.table: ChunkTable
+        self.lexical: LexicalIndex
+        if self._artifacts is not None:
+            self.table = self._artifacts.table
+            self.lexical = self._artifacts.lexical
+        else:
+            self.table = ChunkTable.from_chunks(self.repository.load_all_chunk_metadata())
+            self.lexical = LexicalIndex.build(self.table.texts())
         self.embedding_client = EmbeddingClient(settings, logger=logger)
         self._cache_limit = 10
         self._query_cache: OrderedDict[str, list[SearchResult]] = OrderedDict()
 
-        self._lex_tokens: list[list[str]] = []
-        self._lex_df: dict[str, int] = {}
-        self._lex_len: list[int] = []
-        self._lex_avgdl: float = 0.0
-        self._lex_ready: bool = False
-        self._build_lexical_index()
+        self._metadata_index = self._derived(
+            "metadata_index", lambda: MetadataIndex(self.table, self.manifest.documents)
+        )
+        self._matrix: EmbeddingMatrix | None = None
+        self._matrix_rows: np.ndarray | None = None
+        if settings.vector_backend == "matrix":
+            matrix = load_embedding_matrix(settings.embedding_matrix_dir)
+            if matrix is None:
+                raise FileNotFoundError("Embedding matrix not found. Run ingestion first.")
+            self._matrix = matrix
+            # Matrix row of each loaded chunk (-1 when the export predates the chunk).
+            self._matrix_rows = self._derived(
+                ("matrix_rows", matrix),
+                lambda: np.fromiter(
+                    (matrix.row_of.get(chunk_id, -1) for chunk_id in self.table.chunk_ids),
+                    dtype=np.intp,
+                    count=len(self.table),
+                ),
+            )
+        note_memory_footprint("vector_store", self.memory_footprint)
+
+    def _load_artifacts(self) -> IndexArtifacts | None:
+        """The persisted index, if one was written for the corpus in the manifest."""
+
+        try:
+            artifacts = load_index_artifacts(self.settings.lexical_index_dir)
+        except (OSError, ValueError, KeyError) as exc:
+            log_event(
+                self.logger,
+                "lexical_index_unavailable",
+                path=str(self.settings.lexical_index_dir),
+                error=str(exc),
+            )
+            return None
+        expected = corpus_version(self.manifest.corpus_hash, self.manifest.created_at)
+        if artifacts is None or artifacts.corpus_version != expected:
+            return None
+        return artifacts
+
+    def _derived(self, key: Any, factory: Callable[[], D]) -> D:
+        """Build ``factory()`` once per index version when the index is persisted."""
+
+        if self._artifacts is None:
+            return factory()
+        return self._artifacts.derived(key, factory)
+
+    def memory_footprint(self) -> dict[str, int]:
+        """Approximate bytes held by each in-memory structure (shared objects counted once)."""
+
+        seen: set[int] = set()
+        table = self.table.nbytes()
+        lexical = self.lexical.nbytes()
+        footprint = {
+            "chunk_ids": table["chunk_ids"],
+            "chunk_string_pools": table["string_pools"],
+            "chunk_columns": table["columns"],
+            "chunk_texts": table["texts"],
+            "lexical_postings": lexical["postings"],
+            "lexical_vocabulary": lexical["vocabulary"],
+            "metadata_index": self._metadata_index.nbytes(),
+            "query_cache": deep_sizeof(self._query_cache, seen),
+            "manifest": deep_sizeof(self.manifest, seen),
+        }
+        footprint["total"] = sum(footprint.values())
+        # Arrays and texts of a persisted index are file-backed pages shared by workers.
+        footprint["mapped"] = (
+            0
+            if self._artifacts is None
+            else table["columns"] + table["texts"] + lexical["postings"]
+        )
+        footprint["chunk_count"] = len(self.table)
+        footprint["bytes_per_chunk"] = footprint["total"] // max(1, len(self.table))
+        return footprint
 
     def _cache_key(
         self,
@@ -151,87 +275,23 @@ class VectorStore:
 
         return max(1, min(dynamic, lists))
 
-    def _apply_filters(self, chunk: StoredChunk, filters: dict[str, str] | None) -> bool:
-        if not filters:
-            return True
-        manifest_entry: dict[str, Any] = self.manifest.documents.get(chunk.source_path, {})
-        source_type = manifest_entry.get("source_type")
-        if filters.get("source_type") and filters["source_type"] != source_type:
-            return False
-        prefix = filters.get("path_prefix")
-        if prefix and not chunk.source_path.startswith(prefix):
-            return False
-        family_filter = filters.get("product_family")
-        if family_filter:
-            allowed = {
-                part.strip().lower() for part in str(family_filter).split(",") if part.strip()
-            }
-            if allowed:
-                chunk_family = (
-                    chunk.extra.get("product_family") or manifest_entry.get("product_family") or ""
-                )
-                if str(chunk_family).lower() not in allowed:
-                    return False
-        return True
-
-    def _tokenize(self, text: str) -> list[str]:
-        text = text.lower()
-        tokens = re.split(r"[^a-z0-9]+", text)
-        return [t for t in tokens if t and (len(t) > 1 or t.isdigit())]
-
-    def _build_lexical_index(self) -> None:
-        tokens_per_doc: list[list[str]] = []
-        df: dict[str, int] = {}
-        lengths: list[int] = []
-        for chunk in self.chunks:
-            toks = self._tokenize(chunk.text)
-            tokens_per_doc.append(toks)
-            lengths.append(len(toks))
-            for tok in set(toks):
-                df[tok] = df.get(tok, 0) + 1
-        self._lex_tokens = tokens_per_doc
-        self._lex_df = df
-        self._lex_len = lengths
-        self._lex_avgdl = (sum(lengths) / len(lengths)) if lengths else 0.0
-        self._lex_ready = True
-
-    def _bm25_scores(self, query: str) -> list[float]:
-        if not self._lex_ready or not self._lex_tokens:
-            return [0.0] * len(self.chunks)
-        q_tokens = self._tokenize(query)
-        if not q_tokens:
-            return [0.0] * len(self.chunks)
-        k1 = 1.5
-        b = 0.75
-        N = len(self._lex_tokens)
-        scores = [0.0] * N
-        for i, doc_tokens in enumerate(self._lex_tokens):
-            if not doc_tokens:
-                continue
-            dl = self._lex_len[i]
-            tf_counts: dict[str, int] = {}
-            for t in doc_tokens:
-                tf_counts[t] = tf_counts.get(t, 0) + 1
-            s = 0.0
-            for qt in q_tokens:
-                df = self._lex_df.get(qt, 0)
-                if df == 0:
-                    continue
-                idf = math.log((N - df + 0.5) / (df + 0.5) + 1.0)
-                tf = tf_counts.get(qt, 0)
-                if tf == 0:
-                    continue
-                denom = tf + k1 * (1 - b + b * (dl / (self._lex_avgdl or 1.0)))
-                s += idf * (tf * (k1 + 1)) / denom
-            scores[i] = s
-        return scores
+    def _lexical_candidates(
+        self, query: str, scope_mask: np.ndarray | None, limit: int
+    ) -> tuple[np.ndarray, list[int]]:
+        """BM25 scores of the in-scope chunks and the top ``limit`` of their positions."""
+
+        scores = self.lexical.bm25_scores(query, scope_mask)
+        pool = np.arange(len(scores)) if scope_mask is None else np.flatnonzero(scope_mask)
+        return scores, _top_positions(scores, pool, limit)
 
-    def _rerank_results(self, results: list[SearchResult]) -> list[SearchResult]:
+    def _rerank_results(self, results: list[_Candidate]) -> list[_Candidate]:
         if not results:
             return results
-        vector_weight = 0.55
-        lexical_weight = 0.25
-        fuzz_weight = 0.20
+        # Vector and lexical keep their 55:25 ratio in whatever FUZZ_WEIGHT leaves over.
+        fuzz_weight = self.settings.fuzz_weight
+        scale = (1 - fuzz_weight) / 0.80
+        vector_weight = 0.55 * scale
+        lexical_weight = 0.25 * scale
         reranked = sorted(
             results,
             key=lambda item: (
@@ -249,7 +309,104 @@ class VectorStore:
             )
         return reranked
 
-    def search(
+    def _fuzz_text(self, idx: int) -> str:
+        """Text a chunk is fuzzy-scored against (optionally a bounded prefix)."""
+
+        limit = self.settings.fuzz_max_chars
+        text = self.table.text(idx)
+        return text[:limit] if limit else text
+
+    def _fuzz_scores(self, query: str, indices: list[int]) -> list[float]:
+        """``partial_ratio`` of ``query`` against each chunk, scored in one batched call."""
+
+        if not indices:
+            return []
+        matrix = process.cdist(
+            [query],
+            [self._fuzz_text(idx) for idx in indices],
+            scorer=fuzz.partial_ratio,
+            dtype=np.float64,
+            workers=self.settings.fuzz_workers,
+        )
+        scores: list[float] = (matrix[0] / 100.0).tolist()
+        return scores
+
+    def _pgvector_similar_chunks(
+        self, embedding: list[float], limit: int, probes: int, scope_mask: np.ndarray | None
+    ) -> list[dict[str, Any]]:
+        """Nearest in-scope chunks from pgvector.
+
+        A narrow scope is sent as its ``chunk_id`` list. A broad one would mean tens of
+        thousands of ids per query, so the query runs unscoped with ``limit`` scaled by the
+        inverse of the scope's share of the corpus (capped) and is filtered here. Either
+        way the ivfflat scan can return fewer than ``limit`` in-scope rows when the probed
+        lists hold few of them; the lexical candidates still fill the pool.
+        """
+
+        if scope_mask is None:
+            return self.repository.query_similar_chunks(embedding, limit=limit, probes=probes)
+        scope = np.flatnonzero(scope_mask)
+        if len(scope) <= PGVECTOR_SCOPE_ID_LIMIT:
+            return self.repository.query_similar_chunks(
+                embedding,
+                limit=limit,
+                probes=probes,
+                chunk_ids=[self.table.chunk_ids[idx] for idx in scope.tolist()],
+            )
+        overfetch = min(-(-len(scope_mask) // len(scope)), PGVECTOR_SCOPE_OVERFETCH)
+        rows = self.repository.query_similar_chunks(
+            embedding, limit=limit * overfetch, probes=probes
+        )
+        positions = self.table.positions
+        in_scope = [
+            row
+            for row in rows
+            if (position := positions.get(row["chunk_id"])) is not None and scope_mask[position]
+        ]
+        return in_scope[:limit]
+
+    def _matrix_similar_chunks(
+        self, embedding: list[float], limit: int, scope: list[int] | None
+    ) -> list[dict[str, Any]]:
+        """Nearest chunks from the mapped embedding matrix, shaped like pgvector rows."""
+
+        matrix = self._matrix
+        assert matrix is not None and self._matrix_rows is not None
+        rows: np.ndarray | None = None
+        if scope is not None:
+            rows = self._matrix_rows[scope]
+            rows = rows[rows >= 0]
+        probes = self.settings.embedding_matrix_ivf_probes if matrix.has_ivf else None
+        hits = matrix.search(embedding, limit, rows=rows, probes=probes)
+        return [
+            {"chunk_id": matrix.chunk_ids[row], "distance": 1.0 - similarity}
+            for row, similarity in hits
+        ]
+
+    def _materialize(self, candidate: _Candidate) -> SearchResult:
+        idx = candidate.idx
+        source_path = self.table.source_path(idx)
+        manifest_entry = self.manifest.documents.get(source_path, {})
+        metadata: dict[str, str] = {"source_type": str(manifest_entry.get("source_type", ""))}
+        metadata.update(self.table.extra(idx))
+        if "metadata" in candidate.row:
+            metadata.update(candidate.row["metadata"])
+        return SearchResult(
+            chunk_id=self.table.chunk_ids[idx],
+            source_path=source_path,
+            text=self.table.text(idx),
+            score=candidate.score,
+            page_number=self.table.page_number(idx),
+            heading=self.table.section(idx),
+            metadata=metadata,
+            chunk_index=idx,
+            vector_score=candidate.vector_score,
+            lexical_score=candidate.lexical_score,
+            fuzz_score=candidate.fuzz_score,
+        )
+
+    @traced("retriever.search")
+    def search(  # noqa: PLR0911
         self,
         query: str,
         top_k: int = 10,
@@ -257,8 +414,11 @@ class VectorStore:
         hybrid: bool | None = None,
         *,
         mode: RetrievalMode | str | None = None,
+        query_embedding: Sequence[float] | None = None,
     ) -> list[SearchResult]:
-        if not self.chunks:
+        """Rank chunks for ``query``; ``query_embedding`` reuses a vector the caller has."""
+
+        if not len(self.table):
             return []
 
         retrieval_mode = RetrievalMode.from_inputs(mode, hybrid)
@@ -266,6 +426,9 @@ class VectorStore:
         cache_key = self._cache_key(query, top_k, filters, retrieval_mode)
         cached_results = self._cache_get(cache_key)
         if cached_results is not None:
+            set_span_attributes(
+                mode=retrieval_mode.value, top_k=top_k, results=len(cached_results), cache_hit=True
+            )
             log_event(
                 self.logger,
                 "retrieval_query",
@@ -279,68 +442,88 @@ class VectorStore:
             )
             return cached_results
 
+        # Filters resolve to a bitmap up front; out-of-scope chunks are never scored.
+        scope_mask = self._metadata_index.mask(filters)
+        scope = None if scope_mask is None else np.flatnonzero(scope_mask).tolist()
+        if scope is not None and not scope:
+            set_span_attributes(mode=retrieval_mode.value, top_k=top_k, in_scope=0, results=0)
+            return []
+
         vector_rows: list[dict[str, Any]] = []
         if retrieval_mode is not RetrievalMode.LEXICAL:
-            query_embedding = self.embedding_client.embed_texts([query])
-            if not query_embedding:
-                return []
-            embedding_vector = list(query_embedding[0])
+            if query_embedding is None:
+                with stage(EMBEDDING_STAGE):
+                    embedded = self.embedding_client.embed_texts([query])
+                if not embedded:
+                    return []
+                query_embedding = embedded[0]
+            embedding_vector = list(query_embedding)
 
             candidate_limit = max(top_k * 4, top_k)
-            vector_rows = self.repository.query_similar_chunks(
-                embedding_vector,
-                limit=candidate_limit,
-                probes=probes,
-            )
+            if self._matrix is not None:
+                with stage(VECTOR_STAGE):
+                    vector_rows = self._matrix_similar_chunks(
+                        embedding_vector, candidate_limit, scope
+                    )
+            else:
+                with stage(SQL_STAGE):
+                    vector_rows = self._pgvector_similar_chunks(
+                        embedding_vector, candidate_limit, probes, scope_mask
+                    )
 
-        bm25_all = self._bm25_scores(query)
+        with stage(LEXICAL_STAGE):
+            bm25_all, top_lexical = self._lexical_candidates(query, scope_mask, max(top_k * 3, 30))
         candidates: dict[str, dict[str, Any]] = (
             {row["chunk_id"]: row for row in vector_rows} if vector_rows else {}
         )
 
-        top_lexical = sorted(range(len(bm25_all)), key=lambda i: bm25_all[i], reverse=True)[
-            : max(top_k * 3, 30)
-        ]
         for idx in top_lexical:
-            chunk_id = self.chunks[idx].chunk_id
+            chunk_id = self.table.chunk_ids[idx]
             candidates.setdefault(chunk_id, {"chunk_id": chunk_id})
 
         if not candidates:
             return []
 
         if retrieval_mode is RetrievalMode.LEXICAL:
-            candidate_indices = [idx for idx in top_lexical if idx < len(self.chunks)]
+            candidate_indices = [idx for idx in top_lexical if idx < len(self.table)]
         else:
-            candidate_indices = [
-                self.chunk_index_map[c_id] for c_id in candidates if c_id in self.chunk_index_map
-            ]
-        bm25_min = min((bm25_all[i] for i in candidate_indices), default=0.0)
-        bm25_max = max((bm25_all[i] for i in candidate_indices), default=0.0)
+            positions = self.table.positions
+            candidate_indices = [positions[c_id] for c_id in candidates if c_id in positions]
+        bm25_min = float(min((bm25_all[i] for i in candidate_indices), default=0.0))
+        bm25_max = float(max((bm25_all[i] for i in candidate_indices), default=0.0))
 
         def bm25_norm(idx: int) -> float:
             if bm25_max <= bm25_min:
                 return 0.0
-            return (bm25_all[idx] - bm25_min) / (bm25_max - bm25_min)
+            return (float(bm25_all[idx]) - bm25_min) / (bm25_max - bm25_min)
 
         # Weighting mirrors historical hybrid blend when reranker disabled
         alpha = 0.7 if self.embedding_client._client is not None else 0.35
 
-        results: list[SearchResult] = []
+        eligible: list[tuple[dict[str, Any], int]] = []
+        filtered_out = 0
         for chunk_id, row in candidates.items():
-            chunk = self.chunk_lookup.get(chunk_id)
-            if chunk is None:
+            position = self.table.positions.get(chunk_id)
+            if position is None:
                 continue
-            if not self._apply_filters(chunk, filters):
+            if scope_mask is not None and not scope_mask[position]:
+                filtered_out += 1
                 continue
-            manifest_entry = self.manifest.documents.get(chunk.source_path, {})
-            metadata: dict[str, str] = {"source_type": str(manifest_entry.get("source_type", ""))}
-            metadata.update(chunk.extra)
-            if "metadata" in row:
-                metadata.update(row["metadata"])
+            eligible.append((row, position))
+
+        # Vector-only ranking never reads the fuzzy signal, and a zero weight drops it.
+        fuzz_weight = self.settings.fuzz_weight
+        fuzz_start = time.perf_counter()
+        if retrieval_mode is RetrievalMode.VECTOR or fuzz_weight <= 0:
+            fuzz_scores = [0.0] * len(eligible)
+        else:
+            fuzz_scores = self._fuzz_scores(query, [idx for _, idx in eligible])
+        record_stage(FUZZ_STAGE, (time.perf_counter() - fuzz_start) * 1000)
 
-            idx = self.chunk_index_map.get(chunk_id, 0)
+        # Candidates are ranked on scores alone; only the final top_k become SearchResults.
+        scored: list[_Candidate] = []
+        for (row, idx), fuzz_score in zip(eligible, fuzz_scores, strict=True):
             lexical_score = bm25_norm(idx)
-            fuzz_score = fuzz.partial_ratio(query, chunk.text) / 100.0
 
             distance = row.get("distance") if row else None
             if retrieval_mode is RetrievalMode.LEXICAL:
@@ -357,44 +540,45 @@ class VectorStore:
             else:
                 base_score = alpha * vector_score + (1 - alpha) * lexical_score
                 if not self.settings.enable_reranker:
-                    combined_score = 0.8 * base_score + 0.2 * fuzz_score
+                    combined_score = (1 - fuzz_weight) * base_score + fuzz_weight * fuzz_score
                 else:
                     combined_score = base_score
 
-            results.append(
-                SearchResult(
-                    chunk_id=chunk.chunk_id,
-                    source_path=chunk.source_path,
-                    text=chunk.text,
-                    score=combined_score,
-                    page_number=chunk.page_number,
-                    heading=chunk.section,
-                    metadata=metadata,
-                    chunk_index=idx,
-                    vector_score=vector_score,
-                    lexical_score=lexical_score,
-                    fuzz_score=fuzz_score,
-                )
+            scored.append(
+                _Candidate(idx, row, combined_score, vector_score, lexical_score, fuzz_score)
             )
 
-        if not results:
+        if not scored:
             return []
 
         if self.settings.enable_reranker and retrieval_mode is RetrievalMode.HYBRID:
-            results = self._rerank_results(results)
+            scored = self._rerank_results(scored)
         elif retrieval_mode is RetrievalMode.LEXICAL:
-            results.sort(
+            scored.sort(
                 key=lambda result: (result.lexical_score, result.fuzz_score),
                 reverse=True,
             )
         elif retrieval_mode is RetrievalMode.VECTOR:
-            results.sort(key=lambda result: result.vector_score, reverse=True)
+            scored.sort(key=lambda result: result.vector_score, reverse=True)
         else:
-            results.sort(key=lambda result: result.score, reverse=True)
+            scored.sort(key=lambda result: result.score, reverse=True)
 
-        results = results[:top_k]
+        results = [self._materialize(candidate) for candidate in scored[:top_k]]
 
         self._cache_store(cache_key, results)
+        set_span_attributes(
+            mode=retrieval_mode.value,
+            top_k=top_k,
+            probes=probes,
+            vector_backend="matrix" if self._matrix is not None else "pgvector",
+            vector_rows=len(vector_rows),
+            lexical_candidates=len(top_lexical),
+            candidates=len(candidates),
+            in_scope=len(self.table) if scope is None else len(scope),
+            filtered_out=filtered_out,
+            results=len(results),
+            cache_hit=False,
+        )
         log_event(
             self.logger,
             "retrieval_query",
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Measure the per-request cost of the API rate limiter backends."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.rate_limit import RateLimiter, SharedRateLimiter  # noqa: E402
+
+
+def _bench(limiter: RateLimiter | SharedRateLimiter, requests: int, keys: int) -> dict[str, float]:
+    identifiers = [f"10.0.{index // 256}.{index % 256}" for index in range(keys)]
+    start = time.perf_counter()
+    for index in range(requests):
+        limiter.allow(identifiers[index % keys])
+    elapsed = time.perf_counter() - start
+    snapshot = limiter.snapshot()
+    return {
+        "requests": requests,
+        "keys": keys,
+        "us_per_request": round(elapsed / requests * 1_000_000, 2),
+        "blocked": snapshot["blocked"],
+        "active_keys": snapshot["active_keys"],
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--keys", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--window", type=int, default=60)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = {
+        "memory": _bench(
+            RateLimiter(limit=args.limit, window_seconds=args.window), args.requests, args.keys
+        )
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SharedRateLimiter(
+            limit=args.limit, window_seconds=args.window, path=Path(tmp) / "rate_limit.sqlite3"
+        )
+        try:
+            results["sqlite"] = _bench(shared, args.requests, args.keys)
+        finally:
+            shared.close()
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
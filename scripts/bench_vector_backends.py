@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Compare vector search backends for latency and recall@k.
+
+Queries are corpus embeddings with Gaussian noise added; ground truth is exact float32
+search over the exported embedding matrix. Reports the in-process matrix backend
+(exact, and IVF when ``--ivf-lists`` is set) and, when ``DATABASE_URL`` is configured,
+pgvector. ``--synthetic ROWSxDIMS`` benchmarks random vectors without a corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from atticus.vector_db import PgVectorRepository, StoredChunk  # noqa: E402
+from core.config import load_settings  # noqa: E402
+from retriever.embedding_matrix import (  # noqa: E402
+    EmbeddingMatrix,
+    export_embedding_matrix,
+    load_embedding_matrix,
+)
+
+
+def _synthetic_chunks(rows: int, dimensions: int) -> list[StoredChunk]:
+    vectors = np.random.default_rng(0).normal(size=(rows, dimensions)).astype(np.float32)
+    return [
+        StoredChunk(
+            chunk_id=f"synthetic-{index}",
+            document_id="synthetic",
+            source_path="synthetic",
+            text="",
+            start_token=0,
+            end_token=0,
+            page_number=None,
+            section=None,
+            sha256="",
+            embedding=vectors[index],
+        )
+        for index in range(rows)
+    ]
+
+
+def _queries(matrix: EmbeddingMatrix, count: int, noise: float) -> list[list[float]]:
+    rng = np.random.default_rng(1)
+    rows = rng.choice(len(matrix), size=min(count, len(matrix)), replace=False)
+    base = np.asarray(matrix.vectors[np.sort(rows)], dtype=np.float32)
+    return (base + rng.normal(scale=noise, size=base.shape)).tolist()
+
+
+def _measure(
+    name: str,
+    search: Callable[[list[float]], list[str]],
+    queries: Sequence[list[float]],
+    truth: Sequence[list[str]],
+) -> dict[str, float | str]:
+    latencies: list[float] = []
+    recalls: list[float] = []
+    for query, expected in zip(queries, truth, strict=True):
+        start = time.perf_counter()
+        found = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len(set(found) & set(expected)) / max(1, len(expected)))
+    return {
+        "backend": name,
+        "queries": len(queries),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "recall_at_k": round(float(np.mean(recalls)), 4),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--ivf-lists", type=int, default=0)
+    parser.add_argument("--ivf-probes", type=int, default=8)
+    parser.add_argument("--dtype", choices=("float16", "float32"), default="float32")
+    parser.add_argument("--synthetic", help="ROWSxDIMS of random vectors, e.g. 100000x256")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    settings = load_settings()
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            rows, dimensions = (int(part) for part in args.synthetic.lower().split("x"))
+            reference_dir = Path(tmp) / "exact"
+            export_embedding_matrix(_synthetic_chunks(rows, dimensions), reference_dir)
+            exact = EmbeddingMatrix(reference_dir)
+        else:
+            loaded = load_embedding_matrix(settings.embedding_matrix_dir)
+            if loaded is None:
+                print(f"No embedding matrix in {settings.embedding_matrix_dir}; run ingestion.")
+                return 1
+            exact = loaded
+
+        queries = _queries(exact, args.queries, args.noise)
+        k = args.top_k
+
+        def exact_search(query: list[float]) -> list[str]:
+            return [exact.chunk_ids[row] for row, _ in exact.search(query, k)]
+
+        truth = [exact_search(query) for query in queries]
+        results = [_measure("matrix_exact_float32", exact_search, queries, truth)]
+
+        if args.dtype == "float16" or args.ivf_lists:
+            # Re-export the same vectors with the requested dtype and IVF lists.
+            variant_dir = Path(tmp) / "variant"
+            vectors = np.asarray(exact.vectors, dtype=np.float32)
+            chunks = [
+                StoredChunk(
+                    chunk_id=chunk_id,
+                    document_id="",
+                    source_path="",
+                    text="",
+                    start_token=0,
+                    end_token=0,
+                    page_number=None,
+                    section=None,
+                    sha256="",
+                    embedding=vectors[row],
+                )
+                for row, chunk_id in enumerate(exact.chunk_ids)
+            ]
+            export_embedding_matrix(chunks, variant_dir, dtype=args.dtype, ivf_lists=args.ivf_lists)
+            variant = EmbeddingMatrix(variant_dir)
+            probes = args.ivf_probes if variant.has_ivf else None
+
+            def variant_search(query: list[float]) -> list[str]:
+                hits = variant.search(query, k, probes=probes)
+                return [variant.chunk_ids[row] for row, _ in hits]
+
+            label = f"matrix_{args.dtype}" + (
+                f"_ivf{args.ivf_lists}p{args.ivf_probes}" if variant.has_ivf else ""
+            )
+            results.append(_measure(label, variant_search, queries, truth))
+
+        if not args.synthetic and settings.database_url:
+            repository = PgVectorRepository(settings)
+
+            def pgvector_search(query: list[float]) -> list[str]:
+                rows = repository.query_similar_chunks(
+                    query, limit=k, probes=settings.pgvector_probes
+                )
+                return [row["chunk_id"] for row in rows]
+
+            results.append(_measure("pgvector", pgvector_search, queries, truth))
+
+    print(json.dumps({"rows": len(exact), "top_k": k, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
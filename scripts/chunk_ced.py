@@ -22,7 +22,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from atticus.logging_utils import get_logger  # noqa: E402
-from atticus.tokenization import decode, encode, split_tokens  # noqa: E402
+from atticus.tokenization import count_tokens, decode, encode, split_tokens  # noqa: E402
 from atticus.utils import sha256_file, sha256_text  # noqa: E402
 from core.config import load_settings  # noqa: E402
 
@@ -223,7 +223,7 @@ def extract_tables(path: Path) -> list[Chunk]:  # noqa: PLR0912
                     pages={int(getattr(table, "page", 1))},
                     headings={f"Table {index}"},
                     breadcrumbs=table_breadcrumbs,
-                    token_count=len(encode(text)),
+                    token_count=count_tokens(text),
                     is_table=True,
                     table_headers=header,
                 )
@@ -255,7 +255,7 @@ def extract_tables(path: Path) -> list[Chunk]:  # noqa: PLR0912
                     pages={1},
                     headings={f"Table {index}"},
                     breadcrumbs=table_breadcrumbs,
-                    token_count=len(encode(text)),
+                    token_count=count_tokens(text),
                     is_table=True,
                     table_headers=header,
                 )
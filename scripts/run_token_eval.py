@@ -185,6 +185,7 @@ def main(argv: Iterable[str] | None = None) -> int:
                 atticus_response = requests.post(
                     args.atticus_endpoint,
                     json=payload,
+                    headers={"X-Atticus-Lane": "batch"},
                     timeout=60,
                 )
                 atticus_response.raise_for_status()
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from api.admission import (
+    BATCH_LANE,
+    INTERACTIVE_LANE,
+    AdmissionController,
+    AdmissionRejected,
+    LaneLimits,
+)
+
+
+def _controller(**overrides: float) -> AdmissionController:
+    return AdmissionController(
+        max_in_flight=int(overrides.get("max_in_flight", 1)),
+        lanes={
+            INTERACTIVE_LANE: LaneLimits(
+                max_in_flight=1,
+                max_queue=int(overrides.get("interactive_queue", 4)),
+                queue_timeout_seconds=overrides.get("interactive_timeout", 1.0),
+            ),
+            BATCH_LANE: LaneLimits(
+                max_in_flight=1,
+                max_queue=int(overrides.get("batch_queue", 4)),
+                queue_timeout_seconds=overrides.get("batch_timeout", 1.0),
+            ),
+        },
+    )
+
+
+def test_interactive_waiters_are_dispatched_before_batch() -> None:
+    async def scenario() -> list[str]:
+        controller = _controller()
+        order: list[str] = []
+        await controller.acquire(BATCH_LANE)
+
+        async def worker(lane: str) -> None:
+            await controller.acquire(lane)
+            order.append(lane)
+            controller.release(lane)
+
+        batch_task = asyncio.create_task(worker(BATCH_LANE))
+        await asyncio.sleep(0)
+        interactive_task = asyncio.create_task(worker(INTERACTIVE_LANE))
+        await asyncio.sleep(0)
+        assert controller.snapshot()["total"]["queued"] == 2
+
+        controller.release(BATCH_LANE)
+        await asyncio.gather(batch_task, interactive_task)
+        return order
+
+    assert asyncio.run(scenario()) == [INTERACTIVE_LANE, BATCH_LANE]
+
+
+def test_lane_capped_interactive_waiters_do_not_stall_batch() -> None:
+    async def scenario() -> AdmissionController:
+        controller = _controller(max_in_flight=3)
+        await controller.acquire(INTERACTIVE_LANE)
+        queued = asyncio.create_task(controller.acquire(INTERACTIVE_LANE))
+        await asyncio.sleep(0)
+
+        # Interactive is at its own cap, but the global limit still has room.
+        assert await asyncio.wait_for(controller.acquire(BATCH_LANE), timeout=0.5) == 0.0
+        controller.release(INTERACTIVE_LANE)
+        await asyncio.wait_for(queued, timeout=0.5)
+        return controller
+
+    snapshot = asyncio.run(scenario()).snapshot()
+    assert snapshot[INTERACTIVE_LANE]["in_flight"] == 1
+    assert snapshot[BATCH_LANE]["in_flight"] == 1
+    assert snapshot["total"]["queued"] == 0
+
+
+def test_full_queue_sheds_immediately() -> None:
+    async def scenario() -> AdmissionController:
+        controller = _controller(batch_queue=0)
+        await controller.acquire(BATCH_LANE)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire(BATCH_LANE)
+        assert excinfo.value.reason == "queue_full"
+        assert excinfo.value.retry_after >= 1
+        return controller
+
+    snapshot = asyncio.run(scenario()).snapshot()
+    assert snapshot[BATCH_LANE]["rejected"] == 1
+    assert snapshot[BATCH_LANE]["in_flight"] == 1
+
+
+def test_queue_timeout_rejects_and_cleans_up() -> None:
+    async def scenario() -> AdmissionController:
+        controller = _controller(interactive_timeout=0.05)
+        await controller.acquire(INTERACTIVE_LANE)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            await controller.acquire(INTERACTIVE_LANE)
+        assert excinfo.value.reason == "queue_timeout"
+        controller.release(INTERACTIVE_LANE)
+        await controller.acquire(INTERACTIVE_LANE)
+        return controller
+
+    snapshot = asyncio.run(scenario()).snapshot()
+    assert snapshot[INTERACTIVE_LANE]["timed_out"] == 1
+    assert snapshot[INTERACTIVE_LANE]["queued"] == 0
+    assert snapshot[INTERACTIVE_LANE]["admitted"] == 2
+
+
+@pytest.mark.parametrize("path", ["/ask", "/admin/profile"])
+def test_ask_route_returns_503_when_shed(monkeypatch: pytest.MonkeyPatch, path: str) -> None:
+    api_main = pytest.importorskip("api.main")
+    TestClient = pytest.importorskip("fastapi.testclient").TestClient
+
+    controller = _controller(batch_queue=0)
+    controller._lanes[BATCH_LANE].in_flight = 1
+
+    from api import admission
+
+    monkeypatch.setattr(admission, "get_admission_controller", lambda request, settings: controller)
+    monkeypatch.setenv("ADMIN_API_TOKEN", "admin-token")
+    client = TestClient(api_main.app)
+    response = client.post(
+        path,
+        json={"question": "What is the AMPV?"},
+        headers={"X-Atticus-Lane": "batch", "X-Admin-Token": "admin-token"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers.get("Retry-After") == "1"
+    assert controller.snapshot()[BATCH_LANE]["rejected"] == 1
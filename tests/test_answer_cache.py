@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from atticus.circuit_breaker import reset_circuit_breakers
+from core.config import AppSettings, Manifest, write_manifest
+from retriever import answer_cache as cache_module
+from retriever import service
+from retriever.answer_cache import (
+    AnswerCache,
+    build_cache_key,
+    get_answer_cache,
+    normalize_question,
+)
+from retriever.generator import GeneratorClient
+from retriever.models import Answer, Citation
+
+
+def _answer(text: str = "Designed AMPV 20,000") -> Answer:
+    return Answer(
+        question="What is the AMPV of the C7070?",
+        response=text,
+        citations=[
+            Citation(
+                chunk_id="c1",
+                source_path="content/c7070.pdf",
+                page_number=2,
+                heading="Specs",
+                score=0.91,
+            )
+        ],
+        confidence=0.88,
+        should_escalate=False,
+        model="Apeos C7070",
+    )
+
+
+def _key(question: str, settings: AppSettings, corpus: str = "hash@1", **kwargs):
+    return build_cache_key(question, settings=settings, corpus_version=corpus, **kwargs)
+
+
+def test_normalize_question_ignores_case_spacing_and_punctuation() -> None:
+    assert normalize_question("  What is the AMPV   of the C7070?? ") == (
+        "what is the ampv of the c7070"
+    )
+
+
+def test_cache_key_varies_with_scope_filters_and_corpus() -> None:
+    settings = AppSettings()
+    base = _key("What is the AMPV?", settings, model="Apeos C7070")
+    assert base == _key("what is the ampv", settings, model="Apeos C7070")
+    assert base != _key("What is the AMPV?", settings, model="Apeos C8180")
+    assert base != _key("What is the AMPV?", settings, model="Apeos C7070", filters={"a": "b"})
+    assert base != _key("What is the AMPV?", settings, corpus="hash@2", model="Apeos C7070")
+
+
+def test_cache_hit_returns_independent_copy() -> None:
+    cache = AnswerCache(max_entries=4, ttl_seconds=60)
+    key = _key("q1", AppSettings())
+    cache.put(key, _answer())
+
+    first = cache.get(key)
+    assert first is not None
+    first.citations[0].score = 0.0
+    second = cache.get(key)
+    assert second is not None
+    assert second.citations[0].score == 0.91
+    assert cache.snapshot()["hits"] == 2
+
+
+def test_cache_expires_and_evicts_lru(monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = AppSettings()
+    clock = iter([100.0, 100.0, 100.0, 200.0])
+    monkeypatch.setattr(cache_module.time, "time", lambda: next(clock))
+    cache = AnswerCache(max_entries=1, ttl_seconds=50)
+
+    cache.put(_key("q1", settings), _answer())
+    cache.put(_key("q2", settings), _answer())
+    assert cache.get(_key("q1", settings)) is None
+    assert cache.snapshot()["evictions"] == 1
+    assert cache.get(_key("q2", settings)) is None
+
+
+def test_persistent_tier_survives_new_instance(tmp_path: Path) -> None:
+    path = tmp_path / "answers.sqlite"
+    key = _key("q1", AppSettings())
+    writer = AnswerCache(persistent_path=path)
+    writer.put(key, _answer())
+    writer.close()
+
+    reader = AnswerCache(persistent_path=path)
+    restored = reader.get(key)
+    reader.close()
+    assert restored is not None
+    assert restored.response == "Designed AMPV 20,000"
+    assert restored.citations[0].chunk_id == "c1"
+
+
+def test_semantic_lookup_matches_near_duplicates_in_same_context() -> None:
+    settings = AppSettings()
+    cache = AnswerCache(semantic_threshold=0.95)
+    cache.put(_key("What is the AMPV?", settings), _answer(), embedding=[1.0, 0.0, 0.0])
+
+    near = cache.get(_key("Tell me the AMPV", settings), embedding=[0.99, 0.05, 0.0])
+    assert near is not None
+    other_scope = cache.get(
+        _key("Tell me the AMPV", settings, model="Apeos C8180"), embedding=[0.99, 0.05, 0.0]
+    )
+    assert other_scope is None
+    assert cache.snapshot()["semantic_hits"] == 1
+
+
+def _write_manifest(path: Path) -> None:
+    write_manifest(
+        path,
+        Manifest(
+            embedding_model="text-embedding-3-large",
+            embedding_model_version="v1",
+            embedding_dimensions=3072,
+            chunk_size=512,
+            chunk_overlap_ratio=0.0,
+            corpus_hash="abc",
+            document_count=1,
+            chunk_count=1,
+            created_at="2025-01-01T00:00:00+00:00",
+            metadata_path=path.parent / "meta.json",
+            index_path=Path("pgvector"),
+            snapshot_path=path.parent / "snap.json",
+            documents={},
+        ),
+    )
+
+
+def _patch_pipeline(monkeypatch: pytest.MonkeyPatch, searches: list[tuple[str, object]]) -> None:
+    class _Store:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def search(self, query: str, **kwargs):
+            searches.append((query, kwargs.get("query_embedding")))
+            return [
+                SimpleNamespace(
+                    chunk_id="c1",
+                    source_path="content/c7070.pdf",
+                    text="Designed AMPV 20K",
+                    score=0.9,
+                    page_number=2,
+                    heading="Specs",
+                    metadata={},
+                )
+            ]
+
+    class _Generator:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def generate(self, *args, **kwargs) -> str:
+            return "Designed AMPV is 20,000."
+
+        def heuristic_confidence(self, response: str) -> float:
+            return 0.8
+
+    monkeypatch.setattr(service, "VectorStore", _Store)
+    monkeypatch.setattr(service, "GeneratorClient", _Generator)
+    monkeypatch.setattr(service, "format_answer_markdown", lambda response, citations: response)
+
+
+def test_answer_question_serves_repeat_from_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    _write_manifest(manifest_path)
+    settings = AppSettings(manifest_path=manifest_path)
+    cache_module.reset_answer_cache()
+    searches: list[tuple[str, object]] = []
+    _patch_pipeline(monkeypatch, searches)
+    logger = logging.getLogger("atticus.test.answer_cache")
+
+    try:
+        first = service.answer_question("What is the AMPV?", settings=settings, logger=logger)
+        second = service.answer_question("what is the ampv", settings=settings, logger=logger)
+    finally:
+        cache_module.reset_answer_cache()
+
+    assert searches == [("What is the AMPV?", None)]
+    assert second.response == first.response
+    assert second.citations == first.citations
+    assert second.question == "what is the ampv"
+
+
+def test_semantic_miss_embeds_the_question_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    _write_manifest(manifest_path)
+    settings = AppSettings(manifest_path=manifest_path, ANSWER_CACHE_SEMANTIC_THRESHOLD=0.95)
+    cache_module.reset_answer_cache()
+    searches: list[tuple[str, object]] = []
+    embedded: list[str] = []
+    _patch_pipeline(monkeypatch, searches)
+
+    class _Embeddings:
+        def __init__(self, *args, **kwargs) -> None:
+            pass
+
+        def embed_texts(self, texts: list[str]) -> list[list[float]]:
+            embedded.extend(texts)
+            return [[1.0, 0.0, 0.0] for _ in texts]
+
+    monkeypatch.setattr(service, "EmbeddingClient", _Embeddings)
+    logger = logging.getLogger("atticus.test.answer_cache")
+
+    try:
+        service.answer_question("What is the AMPV?", settings=settings, logger=logger)
+        near = service.answer_question("Tell me the AMPV", settings=settings, logger=logger)
+    finally:
+        cache_module.reset_answer_cache()
+
+    assert searches == [("What is the AMPV?", [1.0, 0.0, 0.0])]
+    assert embedded == ["What is the AMPV?", "Tell me the AMPV"]
+    assert near.question == "Tell me the AMPV"
+
+
+def test_answer_question_does_not_cache_fallback_after_upstream_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    _write_manifest(manifest_path)
+    settings = AppSettings(manifest_path=manifest_path)
+    cache_module.reset_answer_cache()
+    searches: list[tuple[str, object]] = []
+    _patch_pipeline(monkeypatch, searches)
+
+    def _rate_limited(**kwargs: object) -> object:
+        raise RuntimeError("429 Too Many Requests")
+
+    class _FailingGenerator(GeneratorClient):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            self._client = SimpleNamespace(responses=SimpleNamespace(create=_rate_limited))
+
+    monkeypatch.setattr(service, "GeneratorClient", _FailingGenerator)
+    logger = logging.getLogger("atticus.test.answer_cache")
+
+    try:
+        first = service.answer_question("What is the AMPV?", settings=settings, logger=logger)
+        service.answer_question("What is the AMPV?", settings=settings, logger=logger)
+        cache = get_answer_cache(settings)
+        assert cache is not None
+        assert cache.snapshot()["stores"] == 0
+    finally:
+        cache_module.reset_answer_cache()
+        reset_circuit_breakers()
+
+    assert first.degraded
+    assert len(searches) == 2
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from atticus import circuit_breaker as breaker_module
+from atticus.circuit_breaker import (
+    GENERATION_BREAKER,
+    CircuitBreaker,
+    circuit_breaker_snapshot,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from core.config import AppSettings
+from retriever.generator import GeneratorClient
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_via_probe(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    now = [100.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(name="test", min_calls=4, cooldown_seconds=10)
+
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow(), "only one probe at a time"
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    snapshot = breaker.snapshot()
+    assert snapshot["trips"] == 2
+    assert snapshot["short_circuited"] == 2
+
+
+def test_registry_shares_breakers_and_respects_disable() -> None:
+    settings = AppSettings()
+    first = get_circuit_breaker(GENERATION_BREAKER, settings)
+    assert first is get_circuit_breaker(GENERATION_BREAKER, settings)
+    assert circuit_breaker_snapshot()[GENERATION_BREAKER]["state"] == "closed"
+    disabled = settings.model_copy(update={"circuit_breaker_enabled": False})
+    assert get_circuit_breaker(GENERATION_BREAKER, disabled) is None
+
+
+def test_open_breaker_short_circuits_generation() -> None:
+    settings = AppSettings()
+    breaker = get_circuit_breaker(GENERATION_BREAKER, settings)
+    assert breaker is not None
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+
+    calls: list[dict] = []
+    generator = GeneratorClient(settings, logging.getLogger("atticus.test.breaker"))
+    generator._client = SimpleNamespace(
+        responses=SimpleNamespace(create=lambda **kwargs: calls.append(kwargs))
+    )
+    response = generator.generate("What is the AMPV?", ["Specs\nDesigned AMPV 20,000 pages"])
+
+    assert calls == []
+    assert generator.degraded_reason == "circuit_open"
+    assert response.startswith("I found the following grounded details:")
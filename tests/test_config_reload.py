@@ -9,6 +9,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 config_module = importlib.import_module("atticus.config")
+core_config = importlib.import_module("core.config")
 
 
 def test_load_settings_refreshes_env(tmp_path, monkeypatch):
@@ -73,3 +74,37 @@ def test_cors_allowed_origins_parsing(monkeypatch):
         "https://gw.example.com",
         "https://alt.example.com",
     )
+
+
+def test_load_settings_fast_path_skips_parsing(tmp_path, monkeypatch):
+    env_path = tmp_path / ".env"
+    env_path.write_text("TOP_K=11\n", encoding="utf-8")
+    (tmp_path / "config.yaml").write_text("{}\n", encoding="utf-8")
+    monkeypatch.delenv("TOP_K", raising=False)
+    monkeypatch.chdir(tmp_path)
+    core_config.reset_settings_cache()
+
+    parses: list[Path] = []
+    original_parse = core_config._parse_env_file
+
+    def counting_parse(path):
+        parses.append(path)
+        return original_parse(path)
+
+    monkeypatch.setattr(core_config, "_parse_env_file", counting_parse)
+    try:
+        first = core_config.load_settings()
+        assert core_config.load_settings() is first
+        assert len(parses) == 1
+
+        # Hot reload without an explicit cache reset: size/mtime change is enough.
+        env_path.write_text("TOP_K=12 \n", encoding="utf-8")
+        reloaded = core_config.load_settings()
+        assert reloaded is not first
+        assert reloaded.top_k == 12
+
+        monkeypatch.setenv("TOP_K", "13")
+        assert core_config.load_settings().top_k == 13
+        assert len(parses) == 3
+    finally:
+        core_config.reset_settings_cache()
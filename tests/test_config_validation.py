@@ -11,7 +11,13 @@ def _reset_settings():
         yield
     finally:
         config.reset_settings_cache()
-        for key in ("EMBED_MODEL", "EMBED_DIMENSIONS", "PGVECTOR_PROBES", "PGVECTOR_LISTS"):
+        for key in (
+            "EMBED_MODEL",
+            "EMBED_DIMENSIONS",
+            "PGVECTOR_PROBES",
+            "PGVECTOR_LISTS",
+            "FUZZ_WORKERS",
+        ):
             os.environ.pop(key, None)
 
 
@@ -33,3 +39,10 @@ def test_pgvector_probes_not_exceed_lists(monkeypatch):
     monkeypatch.setenv("PGVECTOR_LISTS", "8")
     with pytest.raises(ValueError, match="cannot exceed pgvector_lists"):
         config.load_settings()
+
+
+@pytest.mark.parametrize("workers", ["0", "-2"])
+def test_fuzz_workers_must_be_positive_or_all_cores(monkeypatch, workers):
+    monkeypatch.setenv("FUZZ_WORKERS", workers)
+    with pytest.raises(ValueError, match=r"(?i)fuzz_workers"):
+        config.load_settings()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from atticus.vector_db import StoredChunk
+from retriever.embedding_matrix import (
+    EmbeddingMatrix,
+    export_embedding_matrix,
+    load_embedding_matrix,
+    reset_embedding_matrix_cache,
+)
+
+
+def _chunks(count: int, dimensions: int, seed: int = 7) -> list[StoredChunk]:
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(count, dimensions))
+    return [
+        StoredChunk(
+            chunk_id=f"chunk-{index}",
+            document_id="doc-1",
+            source_path="content/manual.pdf",
+            text=f"chunk {index}",
+            start_token=0,
+            end_token=1,
+            page_number=None,
+            section=None,
+            sha256=f"sha-{index}",
+            embedding=vectors[index].tolist(),
+        )
+        for index in range(count)
+    ]
+
+
+def _brute_force(chunks: list[StoredChunk], query: np.ndarray, limit: int) -> list[str]:
+    matrix = np.asarray([chunk.embedding for chunk in chunks])
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    order = np.argsort(-(matrix @ (query / np.linalg.norm(query))))[:limit]
+    return [chunks[index].chunk_id for index in order]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_exact_search_matches_brute_force(tmp_path: Path, dtype: str) -> None:
+    chunks = _chunks(500, 64)
+    assert export_embedding_matrix(chunks, tmp_path, dtype=dtype) == 500
+    matrix = EmbeddingMatrix(tmp_path)
+    query = np.random.default_rng(1).normal(size=64)
+
+    hits = matrix.search(query.tolist(), 10)
+
+    expected = _brute_force(chunks, query, 10)
+    found = [matrix.chunk_ids[row] for row, _ in hits]
+    if dtype == "float32":
+        assert found == expected
+    else:
+        assert len(set(found) & set(expected)) >= 9
+    similarities = [similarity for _, similarity in hits]
+    assert similarities == sorted(similarities, reverse=True)
+
+
+def test_scoped_and_ivf_search(tmp_path: Path) -> None:
+    chunks = _chunks(800, 32)
+    export_embedding_matrix(chunks, tmp_path, ivf_lists=16)
+    matrix = EmbeddingMatrix(tmp_path)
+    assert matrix.has_ivf
+    query = np.random.default_rng(3).normal(size=32)
+    exact = [row for row, _ in matrix.search(query.tolist(), 20)]
+
+    # Probing every list is exact; probing a few keeps most of the true neighbours.
+    assert [row for row, _ in matrix.search(query.tolist(), 20, probes=16)] == exact
+    partial = [row for row, _ in matrix.search(query.tolist(), 20, probes=4)]
+    assert len(set(partial) & set(exact)) >= 10
+
+    ranking = [row for row, _ in matrix.search(query.tolist(), 800)]
+    in_scope = [row for row in ranking if row % 3 == 0][:5]
+    scope = np.arange(0, 800, 3)
+    assert [row for row, _ in matrix.search(query.tolist(), 5, rows=scope)] == in_scope
+    assert [row for row, _ in matrix.search(query.tolist(), 5, rows=scope, probes=16)] == in_scope
+
+
+def test_load_embedding_matrix_reopens_only_after_export(tmp_path: Path) -> None:
+    reset_embedding_matrix_cache()
+    assert load_embedding_matrix(tmp_path) is None
+    export_embedding_matrix(_chunks(10, 8), tmp_path)
+    first = load_embedding_matrix(tmp_path)
+    assert first is not None
+    assert load_embedding_matrix(tmp_path) is first
+    export_embedding_matrix(_chunks(12, 8), tmp_path)
+    second = load_embedding_matrix(tmp_path)
+    assert second is not first
+    assert second is not None and len(second) == 12
+    reset_embedding_matrix_cache()
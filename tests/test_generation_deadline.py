@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+from atticus.circuit_breaker import reset_circuit_breakers
+from core.config import AppSettings
+from retriever.deadline import Deadline
+from retriever.generator import GeneratorClient
+
+
+class _SlowUpstream(Exception):
+    pass
+
+
+class _FakeOpenAI:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error if error is not None else _SlowUpstream("request timed out")
+        self.calls: list[dict[str, Any]] = []
+        self.options: list[dict[str, Any]] = []
+        self.responses = SimpleNamespace(create=self._create)
+
+    def with_options(self, **options: Any) -> _FakeOpenAI:
+        self.options.append(options)
+        return self
+
+    def _create(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        raise self.error
+
+
+def _generator(client: _FakeOpenAI) -> GeneratorClient:
+    reset_circuit_breakers()
+    generator = GeneratorClient(AppSettings(), logging.getLogger("atticus.test.deadline"))
+    generator._client = client
+    generator._timeout_errors = (_SlowUpstream,)
+    return generator
+
+
+CONTEXTS = ["Apeos C7070 specs\nDesigned AMPV 20,000 pages"]
+
+
+def test_deadline_remaining_never_negative() -> None:
+    assert Deadline.after(-5).remaining() == 0.0
+    assert Deadline.after(-5).expired
+    assert 0.0 < Deadline.after(30).remaining() <= 30.0
+
+
+def test_generate_bounds_llm_call_by_remaining_budget() -> None:
+    client = _FakeOpenAI()
+    generator = _generator(client)
+
+    response = generator.generate("What is the AMPV?", CONTEXTS, deadline=Deadline.after(5))
+
+    assert generator.degraded
+    assert generator.degraded_reason == "deadline_exceeded"
+    assert client.options[0]["max_retries"] == 0
+    assert 0.0 < client.options[0]["timeout"] <= 5.0
+    assert response.startswith("I found the following grounded details:")
+
+
+def test_generate_skips_llm_when_budget_exhausted() -> None:
+    client = _FakeOpenAI()
+    generator = _generator(client)
+
+    generator.generate("What is the AMPV?", CONTEXTS, deadline=Deadline.after(0.01))
+
+    assert client.calls == []
+    assert generator.degraded_reason == "deadline_exhausted"
+
+    generator._client = None
+    generator.generate("What is the AMPV?", CONTEXTS, deadline=Deadline.after(5))
+    assert not generator.degraded
+
+
+def test_generate_marks_upstream_errors_and_empty_responses_degraded() -> None:
+    generator = _generator(_FakeOpenAI(RuntimeError("429 Too Many Requests")))
+
+    response = generator.generate("What is the AMPV?", CONTEXTS)
+
+    assert generator.degraded_reason == "upstream_error"
+    assert response.startswith("I found the following grounded details:")
+
+    empty = _FakeOpenAI()
+    empty.responses = SimpleNamespace(create=lambda **kwargs: SimpleNamespace(output=[]))
+    generator._client = empty
+    generator.generate("What is the AMPV?", CONTEXTS)
+    assert generator.degraded_reason == "upstream_error"
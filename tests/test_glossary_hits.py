@@ -46,3 +46,51 @@ def test_glossary_hits_detect_alias(tmp_path: Path, monkeypatch: pytest.MonkeyPa
     assert tuple(hit.aliases) == ("Managed Print",)
     assert tuple(hit.units) == ("fleets",)
     assert tuple(hit.product_families) == ("Enterprise Services",)
+
+
+def test_glossary_matcher_compiles_once_per_dictionary_version(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    glossary_module = pytest.importorskip("atticus.glossary")
+    dictionary_path = tmp_path / "dictionary.json"
+    entries = [
+        {"term": f"Option {index:04d}", "definition": f"Definition {index}."}
+        for index in range(2000)
+    ]
+    entries.append(
+        {
+            "term": "Duplex Unit",
+            "definition": "Two-sided printing module.",
+            "aliases": ["D-Unit"],
+            "productFamilies": ["Apeos C7070"],
+        }
+    )
+    dictionary_path.write_text(json.dumps(entries), encoding="utf-8")
+    settings = type("Settings", (), {"dictionary_path": dictionary_path})()
+    glossary_module.reset_glossary_cache()
+
+    matcher = glossary_module.load_glossary_matcher(settings)
+    assert matcher is glossary_module.load_glossary_matcher(settings)
+    hits = glossary_module.find_glossary_hits(
+        answer="Option 0012 ships with the duplex unit; option 0013x is a different kit.",
+        question="Does the APEOS-C7070 need a DUnit?",
+        entries=matcher.entries,
+        matcher=matcher,
+    )
+    assert [(hit.term, hit.matched_value) for hit in hits] == [
+        ("Option 0012", "Option 0012"),
+        ("Option 0013", "Option 0013"),
+        ("Duplex Unit", "duplex unit"),
+    ]
+    hits = glossary_module.find_glossary_hits(
+        answer="The DUnit is optional.", question=None, entries=matcher.entries
+    )
+    assert [(hit.term, hit.matched_value) for hit in hits] == [("Duplex Unit", "Duplex Unit")]
+
+    dictionary_path.write_text(
+        json.dumps([{"term": "Finisher", "definition": "Staples output."}]), encoding="utf-8"
+    )
+    glossary_module.reset_glossary_cache()
+    refreshed = glossary_module.load_glossary_matcher(settings)
+    assert refreshed is not matcher
+    assert [entry.term for entry in refreshed.entries] == ["Finisher"]
@@ -0,0 +1,76 @@
+"""Import-time budget for the chat-serving API process."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Document parsing stacks that only ingest and evaluation runs may load.
+PARSING_MODULES = {
+    "fitz",
+    "pymupdf",
+    "camelot",
+    "tabula",
+    "pytesseract",
+    "PIL",
+    "bs4",
+    "docx",
+    "openpyxl",
+    "pandas",
+}
+# Generous enough for slow CI runners; the parsing stack alone used to exceed it.
+IMPORT_BUDGET_MS = float(os.environ.get("ATTICUS_IMPORT_BUDGET_MS", "1500"))
+
+
+def _import(statement: str) -> tuple[dict[str, float], set[str]]:
+    """Run ``statement`` in a fresh interpreter.
+
+    Returns the cumulative import time in ms per module (from ``-X importtime``) and
+    every module loaded by the end, including those loaded through ``importlib``.
+    """
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{statement}; import sys; print(*sorted(sys.modules))",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        timings[name] = int(cumulative) / 1000
+    return timings, set(completed.stdout.split())
+
+
+def test_api_import_skips_parsing_dependencies_and_fits_budget() -> None:
+    timings, modules = _import("import api.main; import ingest.pipeline; import eval.runner")
+
+    assert not {name.split(".")[0] for name in modules} & PARSING_MODULES
+    assert not any(name.startswith("ingest.parsers.") for name in modules)
+    assert timings["api.main"] < IMPORT_BUDGET_MS
+
+
+def test_parsers_are_imported_on_first_use(tmp_path: Path) -> None:
+    document = tmp_path / "notes.txt"
+    document.write_text("Tray 1 holds 500 sheets.", encoding="utf-8")
+
+    _, modules = _import(
+        "from pathlib import Path; from ingest.parsers import parse_document; "
+        f"parse_document(Path({str(document)!r}))"
+    )
+
+    assert "ingest.parsers.text" in modules
+    assert "ingest.parsers.pdf" not in modules
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from atticus.profiling import deep_sizeof
+from atticus.vector_db import StoredChunk
+from retriever.chunk_table import ChunkTable
+from retriever.index_artifacts import (
+    CURRENT_FILENAME,
+    LexicalIndex,
+    lexical_tokens,
+    load_index_artifacts,
+    reset_index_artifacts_cache,
+    write_index_artifacts,
+)
+from retriever.vector_store import _top_positions
+
+_WORDS = ["toner", "tray", "duplex", "c7070", "1200", "dpi", "a", "x", "staple", "fuser"]
+
+
+def _chunks(count: int, seed: int = 3) -> list[StoredChunk]:
+    rng = random.Random(seed)
+    chunks = []
+    for index in range(count):
+        words = rng.choices(_WORDS, k=rng.randint(0, 40))
+        chunks.append(
+            StoredChunk(
+                chunk_id=f"chunk-{index}",
+                document_id=f"doc-{index % 3}",
+                source_path=f"content/manual-{index % 3}.pdf",
+                text=" ".join(words) + " — ünïcode",
+                start_token=index * 10,
+                end_token=index * 10 + len(words),
+                page_number=index % 5 or None,
+                section="Specs" if index % 2 else None,
+                sha256=f"sha-{index}",
+                embedding=[0.1, 0.2],
+                extra={"product_family": "C7070", "chunk_index": str(index)},
+            )
+        )
+    return chunks
+
+
+def _reference_bm25(texts: list[str], query: str) -> list[float]:
+    """Token-list BM25 as the retriever computed it before postings were introduced."""
+
+    docs = [lexical_tokens(text) for text in texts]
+    df = Counter(token for tokens in docs for token in set(tokens))
+    avgdl = (sum(map(len, docs)) / len(docs)) if docs else 0.0
+    scores = [0.0] * len(docs)
+    for i, tokens in enumerate(docs):
+        if not tokens:
+            continue
+        tf_counts = Counter(tokens)
+        s = 0.0
+        for qt in lexical_tokens(query):
+            if df[qt] == 0 or tf_counts[qt] == 0:
+                continue
+            idf = math.log((len(docs) - df[qt] + 0.5) / (df[qt] + 0.5) + 1.0)
+            denom = tf_counts[qt] + 1.5 * (1 - 0.75 + 0.75 * (len(tokens) / (avgdl or 1.0)))
+            s += idf * (tf_counts[qt] * (1.5 + 1)) / denom
+        scores[i] = s
+    return scores
+
+
+def test_bm25_postings_match_token_list_scoring(tmp_path: Path) -> None:
+    chunks = _chunks(120)
+    write_index_artifacts(chunks, tmp_path, corpus_version="hash@1")
+    reset_index_artifacts_cache()
+    artifacts = load_index_artifacts(tmp_path)
+    assert artifacts is not None
+    in_memory = LexicalIndex.build(chunk.text for chunk in chunks)
+
+    for query in ["toner tray", "duplex duplex 1200 dpi", "C7070 fuser x", "missing words", ""]:
+        expected = _reference_bm25([chunk.text for chunk in chunks], query)
+        assert artifacts.lexical.bm25_scores(query).tolist() == expected
+        assert in_memory.bm25_scores(query).tolist() == expected
+
+        pool = np.arange(len(chunks))
+        ranked = sorted(range(len(chunks)), key=lambda i: expected[i], reverse=True)[:30]
+        assert _top_positions(artifacts.lexical.bm25_scores(query), pool, 30) == ranked
+        mask = np.arange(len(chunks)) % 3 == 0
+        scope = np.flatnonzero(mask)
+        scoped = sorted(scope.tolist(), key=lambda i: expected[i], reverse=True)[:30]
+        scores = artifacts.lexical.bm25_scores(query, mask)
+        assert scores.tolist() == [expected[i] if mask[i] else 0.0 for i in range(len(chunks))]
+        assert _top_positions(scores, scope, 30) == scoped
+
+
+def test_chunks_round_trip_without_embeddings(tmp_path: Path) -> None:
+    chunks = _chunks(25)
+    write_index_artifacts(chunks, tmp_path, corpus_version="hash@1")
+    reset_index_artifacts_cache()
+    artifacts = load_index_artifacts(tmp_path)
+    assert artifacts is not None
+
+    table = artifacts.table
+    for position, original in enumerate(chunks):
+        loaded = table.chunk(position)
+        assert loaded.embedding is None
+        original_fields = original.to_dict()
+        original_fields.pop("embedding", None)
+        loaded_fields = loaded.to_dict()
+        loaded_fields.pop("embedding", None)
+        assert loaded_fields == original_fields
+    assert table.positions["chunk-7"] == 7
+    assert table.chunk_ids == [chunk.chunk_id for chunk in chunks]
+
+
+def test_chunk_table_is_smaller_than_chunk_objects() -> None:
+    chunks = _chunks(400)
+    for chunk in chunks:
+        chunk.embedding = None
+        chunk.extra.update({"embedding_model": "text-embedding-3-large", "chunking": "prose"})
+
+    table = ChunkTable.from_chunks(chunks)
+
+    assert len(table.pools["extra:embedding_model"]) == 1
+    assert len(table.pools["source_path"]) == 3
+    assert [table.chunk(index) for index in range(len(chunks))] == chunks
+    assert sum(table.nbytes().values()) < deep_sizeof(chunks) / 2
+
+
+def test_current_pointer_swaps_versions_and_prunes_old_ones(tmp_path: Path) -> None:
+    reset_index_artifacts_cache()
+    assert load_index_artifacts(tmp_path) is None
+
+    write_index_artifacts(_chunks(5), tmp_path, corpus_version="hash@1")
+    first = load_index_artifacts(tmp_path)
+    assert first is not None and first.corpus_version == "hash@1"
+    assert load_index_artifacts(tmp_path) is first
+    assert first.derived("key", lambda: ["built"]) is first.derived("key", lambda: ["rebuilt"])
+
+    write_index_artifacts(_chunks(8), tmp_path, corpus_version="hash@2")
+    write_index_artifacts(_chunks(9), tmp_path, corpus_version="hash@3")
+    current = load_index_artifacts(tmp_path)
+    assert current is not None and current is not first
+    assert current.corpus_version == "hash@3"
+    assert len(current.table) == 9
+    assert (tmp_path / CURRENT_FILENAME).read_text(encoding="utf-8") == current.directory.name
+    versions = sorted(path.name for path in tmp_path.iterdir() if path.is_dir())
+    assert len(versions) == 2
+    assert current.directory.name in versions
+    assert not any(name.startswith(".") for name in versions)
@@ -93,6 +93,7 @@ class InMemoryPgVectorRepository:
         *,
         limit: int,
         probes: int | None = None,
+        chunk_ids: Sequence[str] | None = None,
     ) -> list[dict[str, Any]]:
         def dot_product(lhs: Iterable[float], rhs: Iterable[float]) -> float:
             return sum(float(a) * float(b) for a, b in zip(lhs, rhs, strict=False))
@@ -101,6 +102,8 @@ class InMemoryPgVectorRepository:
         for chunk in self._chunks.values():
             if chunk.embedding is None:
                 continue
+            if chunk_ids is not None and chunk.chunk_id not in chunk_ids:
+                continue
             similarity = dot_product(chunk.embedding, embedding)
             distance = max(0.0, 1.0 - similarity)
             results.append(
@@ -152,6 +155,7 @@ def test_settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> AppSetting
         snapshots_dir=base / "indices" / "snapshots",
         manifest_path=base / "indices" / "manifest.json",
         metadata_path=base / "indices" / "index_metadata.json",
+        embedding_matrix_dir=base / "indices" / "embeddings",
         logs_path=base / "logs" / "app.jsonl",
         errors_path=base / "logs" / "errors.jsonl",
         evaluation_runs_dir=base / "eval",
@@ -229,3 +233,48 @@ def test_retrieval_pipeline_answers_question(test_settings: AppSettings) -> None
     assert answer.response
     assert answer.confidence >= 0.4
     assert answer.should_escalate is False
+
+
+def test_matrix_backend_returns_pgvector_neighbours(test_settings: AppSettings) -> None:
+    document_path = test_settings.content_dir / "catalog" / "capabilities.txt"
+    _write_sample_document(document_path)
+    ingest_corpus(settings=test_settings, options=IngestionOptions(paths=[document_path]))
+    logger = logging.getLogger("atticus.test")
+
+    pgvector_store = VectorStore(test_settings, logger)
+    matrix_store = VectorStore(
+        test_settings.model_copy(update={"vector_backend": "matrix"}), logger
+    )
+    (embedding,) = pgvector_store.embedding_client.embed_texts(["printer resolution"])
+
+    expected = pgvector_store._pgvector_similar_chunks(list(embedding), 5, 1, None)
+    actual = matrix_store._matrix_similar_chunks(list(embedding), 5, None)
+
+    assert [row["chunk_id"] for row in actual] == [row["chunk_id"] for row in expected]
+    for found, reference in zip(actual, expected, strict=True):
+        assert found["distance"] == pytest.approx(reference["distance"], abs=1e-5)
+    results = matrix_store.search("What resolution do printers support?", top_k=3)
+    assert results
+    assert results[0].source_path == str(document_path)
+
+
+def test_persisted_lexical_index_matches_database_fallback(test_settings: AppSettings) -> None:
+    document_path = test_settings.content_dir / "catalog" / "capabilities.txt"
+    _write_sample_document(document_path)
+    ingest_corpus(settings=test_settings, options=IngestionOptions(paths=[document_path]))
+    logger = logging.getLogger("atticus.test")
+
+    mapped_store = VectorStore(test_settings, logger)
+    assert mapped_store._artifacts is not None
+    fallback_store = VectorStore(
+        test_settings.model_copy(update={"lexical_index_dir_setting": test_settings.indices_dir}),
+        logger,
+    )
+    assert fallback_store._artifacts is None
+
+    query = "What resolution do printers support?"
+    mapped = mapped_store.search(query, top_k=3, mode=RetrievalMode.LEXICAL)
+    fallback = fallback_store.search(query, top_k=3, mode=RetrievalMode.LEXICAL)
+    assert [(item.chunk_id, item.text, item.score) for item in mapped] == [
+        (item.chunk_id, item.text, item.score) for item in fallback
+    ]
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+from atticus.log_store import LogIndexHandler, LogQuery, LogStore
+
+
+def _emit(
+    handler: LogIndexHandler, event: str, created: float, level: int = logging.INFO, **payload
+):
+    record = logging.LogRecord("atticus", level, __file__, 1, event, None, None)
+    record.created = created
+    record.extra_payload = payload
+    handler.handle(record)
+
+
+def test_sessions_join_metadata_with_time_range_and_pagination(tmp_path: Path) -> None:
+    path = tmp_path / "log_index.sqlite3"
+    handler = LogIndexHandler(path, retention_days=30)
+    for index in range(5):
+        request_id = f"req-{index}"
+        _emit(
+            handler,
+            "ask_endpoint_complete",
+            1_000.0 + index,
+            request_id=request_id,
+            confidence=0.5 + index / 10,
+            escalate=False,
+        )
+        _emit(
+            handler,
+            "request_complete",
+            1_000.5 + index,
+            request_id=request_id,
+            method="POST",
+            path="/ask",
+            status=200,
+            latency_ms=12.0,
+        )
+    _emit(handler, "retrieval_failed", 1_002.2, level=logging.ERROR, request_id="req-2")
+    handler.close()
+
+    store = LogStore(path)
+    try:
+        newest = store.sessions(LogQuery(limit=2))
+        assert [entry["request_id"] for entry in newest] == ["req-3", "req-4"]
+        assert newest[-1]["confidence"] == 0.9
+        older = store.sessions(LogQuery(limit=2, offset=2))
+        assert [entry["request_id"] for entry in older] == ["req-1", "req-2"]
+        window = store.sessions(LogQuery(since=1_001.0, until=1_002.9))
+        assert [entry["request_id"] for entry in window] == ["req-1", "req-2"]
+
+        errors = store.errors(LogQuery(limit=10))
+        assert [entry["event"] for entry in errors] == ["retrieval_failed"]
+        assert store.errors(LogQuery(since=1_003.0)) == []
+
+        recent = store.events(["ask_endpoint_complete"], LogQuery(since=1_002.0, limit=2))
+        assert [entry["request_id"] for entry in recent] == ["req-4", "req-3"]
+    finally:
+        store.close()
+
+
+def test_backfill_imports_rotated_files_once(tmp_path: Path) -> None:
+    log_path = tmp_path / "app.jsonl"
+
+    def _line(request_id: str, second: int) -> str:
+        return json.dumps(
+            {
+                "level": "info",
+                "message": "request_complete",
+                "event": "request_complete",
+                "timestamp": f"2025-01-01T10:00:{second:02d}+0000",
+                "request_id": request_id,
+            }
+        )
+
+    (tmp_path / "app.jsonl.2").write_text(_line("oldest", 1) + "\n", encoding="utf-8")
+    (tmp_path / "app.jsonl.1").write_text(_line("older", 2) + "\nnot json\n", encoding="utf-8")
+    log_path.write_text(_line("current", 3) + "\n", encoding="utf-8")
+
+    store = LogStore(tmp_path / "log_index.sqlite3")
+    try:
+        assert store.backfill(log_path) == 3
+        assert store.backfill(log_path) == 0
+        sessions = store.sessions(LogQuery())
+        assert [entry["request_id"] for entry in sessions] == ["oldest", "older", "current"]
+    finally:
+        store.close()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+from datetime import UTC, datetime
+from enum import Enum
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from atticus import logging as logging_module
+from atticus.logging import DroppingQueueHandler, JsonFormatter
+
+
+class _Mode(Enum):
+    HYBRID = "hybrid"
+
+
+def _record(message: str, **payload: object) -> logging.LogRecord:
+    record = logging.LogRecord("atticus.test", logging.INFO, __file__, 1, message, None, None)
+    record.extra_payload = payload
+    return record
+
+
+def test_queue_handler_drops_and_counts_when_full() -> None:
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+
+    for index in range(5):
+        handler.handle(_record("event_%s", index=index))
+
+    assert handler.enqueued == 2
+    assert handler.dropped == 3
+    assert log_queue.get_nowait().extra_payload == {"index": 0}
+
+
+def test_queue_handler_preserves_traceback_for_listener() -> None:
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue()
+    handler = DroppingQueueHandler(log_queue)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "atticus.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info()
+        )
+    handler.handle(record)
+
+    queued = log_queue.get_nowait()
+    assert queued.exc_info is None
+    payload = json.loads(JsonFormatter(use_orjson=False).format(queued))
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_orjson_formatter_matches_stdlib_payload() -> None:
+    if logging_module._orjson is None:
+        pytest.skip("orjson not installed")
+    record = _record(
+        "answer_generated",
+        request_id="req-1",
+        confidence=0.82,
+        models=["C7070"],
+        scores=np.asarray([0.5, 0.25], dtype=np.float32),
+        top=np.float32(0.1),
+        created=datetime(2025, 1, 2, 3, 4, 5, tzinfo=UTC),
+        path=Path("content/manual.pdf"),
+        mode=_Mode.HYBRID,
+    )
+
+    fast = json.loads(JsonFormatter(use_orjson=True).format(record))
+    slow = json.loads(JsonFormatter(use_orjson=False).format(record))
+
+    assert fast == slow
+    assert fast["created"] == "2025-01-02 03:04:05+00:00"
+    assert fast["mode"] == "hybrid"
+    assert fast["event"] == "answer_generated"
@@ -1,5 +1,7 @@
+import os
 from pathlib import Path
 
+import atticus.metrics as metrics_module
 from atticus.metrics import MetricsRecorder
 from core.config import AppSettings
 
@@ -42,3 +44,37 @@ def test_metrics_recorder_tracks_tokens_and_cost(tmp_path: Path):
     expected_cost = ((150 * 100) / 1000.0) * settings.prompt_token_cost_per_1k
     expected_cost += ((75 * 100) / 1000.0) * settings.answer_token_cost_per_1k
     assert extra["estimated_cost_usd"] == round(expected_cost, 6)
+
+
+def test_route_and_stage_sketches_merge_across_workers(tmp_path: Path) -> None:
+    settings = AppSettings().model_copy(
+        update={"metrics_shared_dir": tmp_path / "workers", "metrics_publish_interval_seconds": 0}
+    )
+    worker = MetricsRecorder(settings=settings, store_path=tmp_path / "metrics.csv")
+    for latency in (100.0, 200.0, 300.0):
+        worker.record_request("/ask", latency, {"generation": latency / 2, "sql": 4.0})
+    workers = tmp_path / "workers"
+    (published,) = workers.glob("worker-*.json")
+    assert published.name.startswith(f"worker-{metrics_module._HOSTNAME}-{os.getpid()}-")
+
+    # Pretend the published file belongs to another live worker on the host, plus one in
+    # another container (where every worker is PID 1) and a dead local one.
+    other = workers / f"worker-{metrics_module._HOSTNAME}-{os.getppid()}-abcd1234.json"
+    published.rename(other)
+    (workers / "worker-container-b-1-ffff0000.json").write_text(other.read_text())
+    (workers / f"worker-{metrics_module._HOSTNAME}-999999999-0.json").write_text("{}")
+    local = MetricsRecorder(settings=settings)
+    local.record_request("/ask", 400.0, {"generation": 200.0})
+
+    summary = local.quantile_summary()
+    assert summary["routes"]["/ask"]["count"] == 7
+    assert summary["stages"]["generation"]["count"] == 7
+    assert summary["stages"]["sql"]["count"] == 6
+    assert not (workers / f"worker-{metrics_module._HOSTNAME}-999999999-0.json").exists()
+
+    text = local.prometheus_text()
+    assert 'atticus_request_latency_ms{route="/ask",quantile="0.95"}' in text
+    assert 'atticus_stage_latency_ms_count{stage="generation"} 7' in text
+
+    local.reset()
+    assert local.sketches.routes == {}
@@ -48,3 +48,66 @@ def test_resolve_models_requests_clarification(monkeypatch, catalog):
     assert resolution.needs_clarification
     assert resolution.scopes == []
     assert {option.id for option in resolution.clarification_options} >= {"C7070", "C8180"}
+
+
+def _reference_extract(question: str, catalog) -> tuple[set[str], set[str], float]:
+    """Straightforward per-alias scan the compiled matcher must agree with."""
+
+    from retriever.models import STRICT_MODEL_PATTERN, _compact, _normalize
+
+    normalized_question = _normalize(question)
+    compact_question = _compact(question)
+    tokens = set(normalized_question.split())
+    models: set[str] = set()
+    families: set[str] = set()
+    confidences: list[float] = []
+    for match in STRICT_MODEL_PATTERN.finditer(question):
+        identifier = catalog.match_model(f"Apeos C{match.group(1)}")
+        if identifier:
+            models.add(identifier.canonical)
+            families.add(identifier.family_id)
+            confidences.append(0.95)
+    matched: set[str] = set()
+    for alias, identifier in catalog.alias_to_model.items():
+        if " " in alias:
+            score = 0.85 if f" {alias} " in f" {normalized_question} " else None
+        elif alias in tokens:
+            score = 0.8
+        else:
+            score = 0.75 if _compact(alias) in compact_question else None
+        if score is not None:
+            models.add(identifier.canonical)
+            families.add(identifier.family_id)
+            confidences.append(score)
+            matched.add(alias)
+    for alias, option in catalog.family_alias_to_id.items():
+        if alias in matched:
+            continue
+        if " " in alias:
+            score = 0.7 if f" {alias} " in f" {normalized_question} " else None
+        elif alias in tokens:
+            score = 0.65
+        else:
+            score = 0.6 if _compact(alias) and _compact(alias) in compact_question else None
+        if score is not None:
+            families.add(option.id)
+            confidences.append(score)
+    return models, families, max(confidences, default=0.0)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "Can the Apeos C7070 handle heavy cardstock?",
+        "Does the 6580 support stapling?",
+        "Compare apeos-c4570 with the C8180 series finisher",
+        "APEOSC3060 vs Apeos C 5570 toner yield",
+        "How do I replace the toner cartridge?",
+        "",
+    ],
+)
+def test_compiled_matcher_agrees_with_alias_scan(catalog, question: str) -> None:
+    result = extract_models(question, catalog=catalog)
+    assert (result.models, result.families, result.confidence) == _reference_extract(
+        question, catalog
+    )
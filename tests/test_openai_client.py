@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+
+import pytest
+
+from atticus import openai_client
+from atticus.embeddings import EmbeddingClient
+from core.config import AppSettings
+from retriever.generator import GeneratorClient
+
+
+@pytest.fixture(autouse=True)
+def _fresh_clients():
+    openai_client.reset_openai_clients()
+    yield
+    openai_client.reset_openai_clients()
+
+
+def test_no_api_key_means_no_client() -> None:
+    settings = AppSettings().model_copy(update={"openai_api_key": None})
+    assert openai_client.get_openai_client(settings) is None
+    assert openai_client.get_async_openai_client(settings) is None
+
+
+def test_clients_are_shared_and_pooled() -> None:
+    pytest.importorskip("openai")
+    settings = AppSettings().model_copy(
+        update={"openai_api_key": "sk-test", "openai_max_connections": 7}
+    )
+
+    client = openai_client.get_openai_client(settings)
+    assert client is openai_client.get_openai_client(settings)
+    assert GeneratorClient(settings)._client is client
+    assert EmbeddingClient(settings)._client is client
+    limits = openai_client._pool_options(openai_client._CLIENTS.config)["limits"]
+    assert limits.max_connections == 7
+
+    async_client = openai_client.get_async_openai_client(settings)
+    assert async_client is not None
+    assert async_client is openai_client.get_async_openai_client(settings)
+
+
+def test_config_change_and_reset_rebuild_clients() -> None:
+    pytest.importorskip("openai")
+    settings = AppSettings().model_copy(update={"openai_api_key": "sk-test"})
+    first = openai_client.get_openai_client(settings)
+
+    first_http = openai_client._CLIENTS.sync_http
+
+    tuned = settings.model_copy(update={"openai_timeout_seconds": 5.0})
+    second = openai_client.get_openai_client(tuned)
+    assert second is not first
+    assert second.timeout.read == 5.0
+    # A request still holding the superseded client can keep using its pool.
+    assert not first_http.is_closed
+    del first
+    gc.collect()
+    assert first_http.is_closed
+
+    openai_client.reset_openai_clients()
+    assert openai_client.get_openai_client(tuned) is not second
+
+
+def test_async_close_task_is_held_until_it_finishes() -> None:
+    closed: list[bool] = []
+
+    class _AsyncClient:
+        async def close(self) -> None:
+            await asyncio.sleep(0)
+            closed.append(True)
+
+    async def scenario() -> None:
+        openai_client._close_clients(None, _AsyncClient())
+        assert len(openai_client._CLOSE_TASKS) == 1
+        await asyncio.gather(*openai_client._CLOSE_TASKS)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert closed == [True]
+    assert not openai_client._CLOSE_TASKS
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import pstats
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from api.routes.chat import ask_endpoint
+from api.schemas import AskRequest
+from atticus.config import AppSettings
+from atticus.profiling import deep_sizeof, note_memory_footprint, profile_call
+from atticus.stages import LEXICAL_STAGE, stage
+from atticus.tracing import set_span_attributes, span
+from retriever.models import Answer
+from retriever.query_splitter import QueryAnswer
+from retriever.resolver import ModelResolution, ModelScope
+
+
+def _busy(milliseconds: float) -> None:
+    deadline = time.perf_counter() + milliseconds / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _fake_search() -> str:
+    with span("retriever.search"):
+        note_memory_footprint("engine", lambda: {"total": deep_sizeof([1.0] * 100)})
+        with stage(LEXICAL_STAGE):
+            _busy(40)
+        set_span_attributes(probes=4, vector_rows=12, lexical_candidates=30, filtered_out=2)
+    return "done"
+
+
+@pytest.mark.parametrize(
+    ("profiler", "artifact_format"), [("sample", "collapsed"), ("cprofile", "pstats")]
+)
+def test_profile_call_reports_stages_candidates_and_artifact(
+    tmp_path: Path, profiler: str, artifact_format: str
+) -> None:
+    result, report = profile_call(
+        _fake_search,
+        profile_id="a" * 32,
+        trace_id="req-1",
+        profiler=profiler,
+        sample_interval_ms=1.0,
+        artifact_dir=tmp_path,
+    )
+
+    assert result == "done"
+    assert report.stages_ms[LEXICAL_STAGE] >= 30
+    (retrieval,) = report.retrieval
+    assert retrieval["probes"] == 4
+    assert retrieval["filtered_out"] == 2
+    assert report.memory["engine"]["total"] >= 100 * 24
+    assert report.artifact_format == artifact_format
+    assert report.artifact_path is not None
+    artifact = Path(report.artifact_path)
+    assert artifact.exists()
+    assert any("_busy" in item["function"] for item in report.top_functions)
+    if profiler == "sample":
+        first_line = artifact.read_text(encoding="utf-8").splitlines()[0]
+        stack, count = first_line.rsplit(" ", 1)
+        assert stack.startswith("_fake_search (test_profiling.py")
+        assert int(count) > 0
+    else:
+        assert pstats.Stats(str(artifact)).total_calls > 0
+
+
+def test_ask_endpoint_profiles_only_for_admin_header(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scope = ModelScope(family_id="C7070", family_label="Apeos C7070 range", model="Apeos C4570")
+    seen_settings: list[AppSettings] = []
+
+    def fake_run_rag_for_each(question: str, scopes: list[ModelScope], **kwargs):
+        seen_settings.append(kwargs["settings"])
+        with stage(LEXICAL_STAGE):
+            _busy(5)
+        answer = Answer(
+            question=question,
+            response="The C4570 prints 45 ppm.",
+            citations=[],
+            confidence=0.9,
+            should_escalate=False,
+        )
+        return [QueryAnswer(scope=scope, answer=answer)]
+
+    monkeypatch.setattr(
+        "api.routes.chat.resolve_models",
+        lambda *args, **kwargs: ModelResolution(
+            scopes=[scope], confidence=0.9, needs_clarification=False, clarification_options=[]
+        ),
+    )
+    monkeypatch.setattr("api.routes.chat.run_rag_for_each", fake_run_rag_for_each)
+    monkeypatch.setattr("api.routes.chat.load_glossary_matcher", lambda settings: None)
+    settings = AppSettings(
+        ADMIN_API_TOKEN="admin-token",
+        PROFILE_OUTPUT_DIR=str(tmp_path),
+        ANSWER_DEADLINE_SECONDS=0,
+    )
+    logger = SimpleNamespace(info=lambda *args, **kwargs: None)
+    payload = AskRequest(question="How fast is the Apeos C4570?")
+
+    def ask(headers: dict[str, str]) -> SimpleNamespace:
+        request = SimpleNamespace(headers=headers, state=SimpleNamespace(request_id="req-p"))
+        asyncio.run(ask_endpoint(payload, request, settings, logger))
+        return request.state
+
+    state = ask({"X-Atticus-Profile": "cprofile", "X-Admin-Token": "wrong"})
+    assert not hasattr(state, "profile")
+    assert seen_settings[-1] is settings
+
+    state = ask({"X-Atticus-Profile": "cprofile", "X-Admin-Token": "admin-token"})
+    report = state.profile
+    assert state.profile_id == report.profile_id
+    assert report.profiler == "cprofile"
+    assert report.tokens["question"] > 0
+    assert LEXICAL_STAGE in report.stages_ms
+    assert (tmp_path / f"{report.profile_id}.json").exists()
+    assert seen_settings[-1].answer_cache_enabled is False
+    assert seen_settings[-1].request_coalescing_enabled is False
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from atticus.sketch import QuantileSketch
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1.2) for _ in range(20_000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.02)
+    assert sketch.count == len(values)
+    assert len(sketch.buckets) < 1_000
+
+
+def test_merge_matches_single_sketch_and_round_trips() -> None:
+    rng = random.Random(11)
+    first, second, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for index in range(5_000):
+        value = rng.uniform(0, 2_000) if index % 2 else 0.0
+        (first if index % 3 else second).add(value)
+        combined.add(value)
+
+    first.merge(QuantileSketch.from_dict(second.to_dict()))
+
+    assert first.count == combined.count
+    assert first.buckets == combined.buckets
+    assert first.quantile(0.95) == combined.quantile(0.95)
+    assert QuantileSketch().quantile(0.5) == 0.0
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(relative_accuracy=0.05))
@@ -46,6 +46,7 @@ def test_run_rag_for_each_generates_focus_prompts(monkeypatch: pytest.MonkeyPatc
         product_family,
         family_label,
         model,
+        deadline,
     ) -> Answer:
         prompts.append(prompt)
         return Answer(
@@ -1,4 +1,10 @@
-from api.rate_limit import RateLimiter
+from api.rate_limit import (
+    RateLimiter,
+    SharedRateLimiter,
+    build_rate_limiter,
+    rate_limiter_matches,
+)
+from core.config import AppSettings
 
 
 def test_rate_limiter_allows_and_blocks(monkeypatch) -> None:
@@ -31,3 +37,54 @@ def test_rate_limiter_allows_and_blocks(monkeypatch) -> None:
     limiter.reset()
     assert limiter.blocked == 0
     assert limiter._buckets == {}
+
+
+def test_rate_limiter_evicts_idle_keys(monkeypatch) -> None:
+    now = [0.0]
+    monkeypatch.setattr("api.rate_limit.time.monotonic", lambda: now[0])
+    limiter = RateLimiter(limit=5, window_seconds=10)
+
+    for index in range(100):
+        assert limiter.allow(f"client-{index}").allowed
+    assert limiter.snapshot()["active_keys"] == 100
+
+    now[0] = 11.0
+    limiter.allow("fresh")
+    snapshot = limiter.snapshot()
+    assert snapshot["active_keys"] == 1
+    assert snapshot["evicted"] == 100
+
+
+def test_shared_rate_limiter_enforces_limit_across_instances(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("api.rate_limit.time.time", lambda: 1_000.0)
+    path = tmp_path / "rate_limit.sqlite3"
+    worker_a = SharedRateLimiter(limit=3, window_seconds=60, path=path)
+    worker_b = SharedRateLimiter(limit=3, window_seconds=60, path=path)
+    try:
+        decisions = [worker.allow("user").allowed for worker in (worker_a, worker_b, worker_a)]
+        assert decisions == [True, True, True]
+        blocked = worker_b.allow("user")
+        assert not blocked.allowed
+        assert blocked.retry_after == 20
+        assert worker_a.snapshot()["active_keys"] == 1
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_build_rate_limiter_follows_store_path(tmp_path) -> None:
+    settings = AppSettings()
+    limiter = build_rate_limiter(settings)
+    assert isinstance(limiter, RateLimiter)
+    assert rate_limiter_matches(limiter, settings)
+
+    shared_settings = settings.model_copy(
+        update={"rate_limit_store_path": tmp_path / "limits.sqlite3"}
+    )
+    assert not rate_limiter_matches(limiter, shared_settings)
+    shared = build_rate_limiter(shared_settings)
+    try:
+        assert isinstance(shared, SharedRateLimiter)
+        assert rate_limiter_matches(shared, shared_settings)
+    finally:
+        shared.close()
@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+from starlette.datastructures import State
+
+from api.middleware import RequestContextMiddleware
+from api.rate_limit import RateLimiter
+
+
+def _scope(app_state: State, headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers or [],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+        "app": SimpleNamespace(state=app_state),
+    }
+
+
+async def _run(middleware: RequestContextMiddleware, scope: dict) -> list[dict]:
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await middleware(scope, receive, send)
+    return sent
+
+
+def test_streaming_chunks_pass_through_with_context_headers() -> None:
+    seen_state: dict[str, str] = {}
+
+    async def streaming_app(scope, receive, send) -> None:
+        seen_state["request_id"] = scope["state"]["request_id"]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in (b"data: one\n\n", b"data: two\n\n"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    app_state = State()
+    app_state.rate_limiter = RateLimiter(limit=100, window_seconds=60)
+    middleware = RequestContextMiddleware(streaming_app)
+    sent = asyncio.run(_run(middleware, _scope(app_state, [(b"x-request-id", b"req-123")])))
+
+    assert [message["type"] for message in sent] == [
+        "http.response.start",
+        "http.response.body",
+        "http.response.body",
+        "http.response.body",
+    ]
+    headers = dict(sent[0]["headers"])
+    assert headers[b"x-request-id"] == b"req-123"
+    assert headers[b"x-trace-id"] == b"req-123"
+    assert b"x-ratelimit-limit" in headers
+    assert seen_state["request_id"] == "req-123"
+
+
+def test_rate_limited_requests_short_circuit() -> None:
+    calls: list[str] = []
+
+    async def app(scope, receive, send) -> None:
+        calls.append(scope["path"])
+
+    app_state = State()
+    middleware = RequestContextMiddleware(app)
+    app_state.rate_limiter = None
+    first = asyncio.run(_run(middleware, _scope(app_state)))
+    limiter = app_state.rate_limiter
+    for _ in range(limiter.limit):
+        limiter.allow("127.0.0.1")
+    blocked = asyncio.run(_run(middleware, _scope(app_state)))
+
+    assert first == []
+    assert calls == ["/stream"]
+    assert blocked[0]["status"] == 429
+    assert dict(blocked[0]["headers"])[b"x-ratelimit-remaining"] == b"0"
@@ -1,7 +1,15 @@
 from collections import OrderedDict
 from types import SimpleNamespace
 
+import numpy as np
+import pytest
+
+from rapidfuzz import fuzz
+
 from atticus.vector_db import StoredChunk
+from retriever.chunk_table import ChunkTable
+from retriever.metadata_index import MetadataIndex, parse_models
+import retriever.vector_store as vector_store_module
 from retriever.vector_store import RetrievalMode, SearchResult, VectorStore
 
 
@@ -38,22 +46,49 @@ def _make_vector_store(manifest_overrides: dict | None = None) -> VectorStore:
     return vs
 
 
-def test_apply_filters_allows_matching_family():
-    vs = _make_vector_store()
-    chunk = _make_chunk("C7070")
-    assert vs._apply_filters(chunk, {"product_family": "C7070"})
+def _reference_filter(
+    chunk: StoredChunk, filters: dict[str, str] | None, documents: dict[str, dict]
+) -> bool:
+    """Per-chunk filter semantics that ``MetadataIndex.mask`` must reproduce."""
 
+    if not filters:
+        return True
+    manifest_entry = documents.get(chunk.source_path, {})
+    if filters.get("source_type") and filters["source_type"] != manifest_entry.get("source_type"):
+        return False
+    prefix = filters.get("path_prefix")
+    if prefix and not chunk.source_path.startswith(prefix):
+        return False
+    family_filter = filters.get("product_family")
+    if family_filter:
+        allowed = {part.strip().lower() for part in family_filter.split(",") if part.strip()}
+        family = chunk.extra.get("product_family") or manifest_entry.get("product_family") or ""
+        if allowed and str(family).lower() not in allowed:
+            return False
+    model_filter = filters.get("model")
+    if model_filter:
+        allowed = {part.strip().lower() for part in model_filter.split(",") if part.strip()}
+        if allowed and not allowed.intersection(parse_models(chunk.extra.get("models"))):
+            return False
+    return True
 
-def test_apply_filters_blocks_non_matching_family():
-    vs = _make_vector_store()
-    chunk = _make_chunk("C8180")
-    assert not vs._apply_filters(chunk, {"product_family": "C7070"})
 
+def _allowed(chunk: StoredChunk, filters: dict[str, str]) -> bool:
+    documents = {"content/model/manual.pdf": {"source_type": "ced"}}
+    mask = MetadataIndex(ChunkTable.from_chunks([chunk]), documents).mask(filters)
+    return mask is None or bool(mask[0])
+
+
+def test_filters_allow_matching_family():
+    assert _allowed(_make_chunk("C7070"), {"product_family": "C7070"})
 
-def test_apply_filters_passes_without_family_constraint():
-    vs = _make_vector_store()
-    chunk = _make_chunk("C7070")
-    assert vs._apply_filters(chunk, {"path_prefix": "content"})
+
+def test_filters_block_non_matching_family():
+    assert not _allowed(_make_chunk("C8180"), {"product_family": "C7070"})
+
+
+def test_filters_pass_without_family_constraint():
+    assert _allowed(_make_chunk("C7070"), {"path_prefix": "content"})
 
 
 def test_query_cache_returns_clones():
@@ -85,3 +120,96 @@ def test_resolve_probes_scales_with_query():
     long = vs._resolve_probes(RetrievalMode.HYBRID, top_k=5, query=long_query)
     assert short > vs.settings.pgvector_probes
     assert long >= vs.settings.pgvector_probes
+
+
+def test_fuzz_scores_are_batched_and_match_partial_ratio():
+    vs = _make_vector_store()
+    vs.settings.fuzz_workers = 2
+    vs.settings.fuzz_max_chars = 0
+    texts = ["Apeos C4570 prints 45 pages per minute in colour.", "Tray 1 holds 500 sheets.", ""]
+    chunks = []
+    for index, text in enumerate(texts):
+        chunk = _make_chunk("C4570")
+        chunk.chunk_id = f"chunk-{index}"
+        chunk.text = text
+        chunks.append(chunk)
+    vs.table = ChunkTable.from_chunks(chunks)
+    query = "C4570 pages per minute"
+
+    scores = vs._fuzz_scores(query, [2, 0, 1])
+
+    assert scores == [fuzz.partial_ratio(query, texts[idx]) / 100.0 for idx in (2, 0, 1)]
+    assert vs._fuzz_scores(query, []) == []
+
+
+def test_metadata_index_mask_matches_reference_filter():
+    documents = {
+        "content/model/manual.pdf": {"source_type": "ced"},
+        "content/model/faq.txt": {"source_type": "faq", "product_family": "C8180"},
+        "content/other/notes.txt": {"source_type": "text"},
+    }
+    chunks = []
+    for index, (path, family, models) in enumerate(
+        [
+            ("content/model/manual.pdf", "C7070", '["Apeos C4570", "Apeos C7070"]'),
+            ("content/model/manual.pdf", "c7070", '["Apeos C6580"]'),
+            ("content/model/faq.txt", "", ""),
+            ("content/other/notes.txt", "C8180", '["Apeos C8180"]'),
+        ]
+    ):
+        chunk = _make_chunk(family)
+        chunk.chunk_id = f"chunk-{index}"
+        chunk.source_path = path
+        if models:
+            chunk.extra["models"] = models
+        chunks.append(chunk)
+    index = MetadataIndex(ChunkTable.from_chunks(chunks), documents)
+
+    cases = [
+        None,
+        {},
+        {"product_family": "C7070"},
+        {"product_family": "c8180, C7070"},
+        {"source_type": "ced"},
+        {"source_type": "missing"},
+        {"path_prefix": "content/model"},
+        {"model": "apeos c4570,Apeos C8180"},
+        {"product_family": "C8180", "path_prefix": "content/other"},
+        {"product_family": " , "},
+    ]
+    for filters in cases:
+        mask = index.mask(filters)
+        expected = [_reference_filter(chunk, filters, documents) for chunk in chunks]
+        actual = [True] * len(chunks) if mask is None else mask.tolist()
+        assert actual == expected, filters
+
+
+def test_pgvector_scope_sends_ids_only_when_narrow(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(vector_store_module, "PGVECTOR_SCOPE_ID_LIMIT", 3)
+    vs = _make_vector_store()
+    chunks = []
+    for index in range(10):
+        chunk = _make_chunk("C7070")
+        chunk.chunk_id = f"chunk-{index}"
+        chunks.append(chunk)
+    vs.table = ChunkTable.from_chunks(chunks)
+    calls: list[dict] = []
+
+    def query_similar_chunks(embedding, **kwargs):
+        calls.append(kwargs)
+        ids = kwargs.get("chunk_ids") or [chunk.chunk_id for chunk in chunks]
+        return [{"chunk_id": chunk_id} for chunk_id in ids][: kwargs["limit"]]
+
+    vs.repository = SimpleNamespace(query_similar_chunks=query_similar_chunks)
+
+    narrow = np.zeros(10, dtype=bool)
+    narrow[[1, 4]] = True
+    rows = vs._pgvector_similar_chunks([0.0], 5, 4, narrow)
+    assert calls[-1]["chunk_ids"] == ["chunk-1", "chunk-4"]
+    assert [row["chunk_id"] for row in rows] == ["chunk-1", "chunk-4"]
+
+    broad = np.arange(10) % 2 == 0
+    rows = vs._pgvector_similar_chunks([0.0], 2, 4, broad)
+    assert "chunk_ids" not in calls[-1]
+    assert calls[-1]["limit"] == 4
+    assert [row["chunk_id"] for row in rows] == ["chunk-0", "chunk-2"]
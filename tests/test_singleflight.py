@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from retriever import query_splitter
+from retriever.models import Answer
+from retriever.resolver import ModelScope
+from retriever.deadline import Deadline
+from retriever.singleflight import SingleFlight, coalescing_key
+
+
+def test_single_flight_shares_one_computation() -> None:
+    group: SingleFlight[int] = SingleFlight()
+    release = threading.Event()
+    calls: list[int] = []
+    results: list[tuple[int, bool]] = []
+
+    def compute() -> int:
+        calls.append(1)
+        release.wait(timeout=5)
+        return 42
+
+    def worker() -> None:
+        results.append(group.do("same", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while group.snapshot()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert sorted(results) == [(42, False)] + [(42, True)] * 4
+    snapshot = group.snapshot()
+    assert snapshot["leaders"] == 1
+    assert snapshot["coalesced"] == 4
+    assert snapshot["in_flight"] == 0
+
+
+def test_single_flight_propagates_leader_error() -> None:
+    group: SingleFlight[int] = SingleFlight()
+
+    def boom() -> int:
+        raise RuntimeError("upstream failed")
+
+    with pytest.raises(RuntimeError):
+        group.do("key", boom)
+    assert group.snapshot()["errors"] == 1
+    assert group.do("key", lambda: 7) == (7, False)
+
+
+def test_coalescing_key_tracks_scope_filters_and_top_k() -> None:
+    base = dict(family_id="C7070", family_label="Apeos", model=None, context_hints=None)
+    key = coalescing_key("What is the AMPV?", filters={}, top_k=5, **base)
+    assert key == coalescing_key("what is the AMPV", filters={}, top_k=5, **base)
+    assert key != coalescing_key("What is the AMPV?", filters={}, top_k=6, **base)
+    assert key != coalescing_key("What is the AMPV?", filters={"a": "b"}, top_k=5, **base)
+
+
+def test_run_rag_for_each_coalesces_identical_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    scope = ModelScope(family_id="C7070", family_label="Apeos C7070", model="Apeos C7070")
+    release = threading.Event()
+    calls: list[str] = []
+
+    def fake_answer_question(prompt: str, **kwargs) -> Answer:
+        calls.append(prompt)
+        release.wait(timeout=5)
+        return Answer(
+            question=prompt,
+            response="shared",
+            citations=[],
+            confidence=0.9,
+            should_escalate=False,
+            model=kwargs.get("model"),
+        )
+
+    flights: SingleFlight[Answer] = SingleFlight()
+    monkeypatch.setattr(query_splitter, "answer_question", fake_answer_question)
+    monkeypatch.setattr(query_splitter, "ANSWER_FLIGHTS", flights)
+    settings = SimpleNamespace(request_coalescing_enabled=True)
+    answers: list[Answer] = []
+
+    def worker() -> None:
+        results = query_splitter.run_rag_for_each(
+            "What is the AMPV?",
+            [scope],
+            settings=settings,
+            logger=logging.getLogger("test"),
+            top_k=5,
+        )
+        answers.append(results[0].answer)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while flights.snapshot()["coalesced"] < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert [answer.response for answer in answers] == ["shared"] * 3
+    assert len({id(answer) for answer in answers}) == 3
+
+
+def test_follower_stops_waiting_at_its_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    scope = ModelScope(family_id="C7070", family_label="Apeos C7070", model="Apeos C7070")
+    release = threading.Event()
+    started = threading.Event()
+    deadlines: list[float | None] = []
+
+    def fake_answer_question(prompt: str, **kwargs) -> Answer:
+        deadline = kwargs.get("deadline")
+        deadlines.append(deadline.remaining() if deadline is not None else None)
+        if not started.is_set():
+            started.set()
+            release.wait(timeout=5)
+        return Answer(
+            question=prompt,
+            response="degraded" if deadline is not None else "leader",
+            citations=[],
+            confidence=0.2,
+            should_escalate=True,
+        )
+
+    flights: SingleFlight[Answer] = SingleFlight()
+    monkeypatch.setattr(query_splitter, "answer_question", fake_answer_question)
+    monkeypatch.setattr(query_splitter, "ANSWER_FLIGHTS", flights)
+    settings = SimpleNamespace(request_coalescing_enabled=True)
+    leader = threading.Thread(
+        target=query_splitter.run_rag_for_each,
+        args=("What is the AMPV?", [scope]),
+        kwargs={"settings": settings, "logger": logging.getLogger("test")},
+    )
+    leader.start()
+    assert started.wait(timeout=5)
+
+    try:
+        begin = time.monotonic()
+        results = query_splitter.run_rag_for_each(
+            "What is the AMPV?",
+            [scope],
+            settings=settings,
+            logger=logging.getLogger("test"),
+            deadline=Deadline.after(0.05),
+        )
+        waited = time.monotonic() - begin
+    finally:
+        release.set()
+        leader.join(timeout=5)
+
+    assert waited < 2
+    assert results[0].answer.response == "degraded"
+    assert deadlines[-1] == 0.0
+    assert flights.snapshot()["timeouts"] == 1
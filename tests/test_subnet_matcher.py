@@ -0,0 +1,45 @@
+from ipaddress import ip_address, ip_network
+
+from api.subnets import ALLOW, TRUSTED, GatewayPolicy, SubnetTrie
+
+
+def _networks(*subnets: str):
+    return [ip_network(subnet, strict=False) for subnet in subnets]
+
+
+def test_trie_matches_same_addresses_as_linear_scan() -> None:
+    networks = _networks("10.0.0.0/8", "10.1.0.0/16", "192.168.4.0/22", "2001:db8::/32", "::1/128")
+    trie = SubnetTrie(networks)
+    samples = [
+        "10.200.3.4",
+        "11.0.0.1",
+        "192.168.5.9",
+        "192.168.8.1",
+        "2001:db8:ffff::1",
+        "2001:db9::1",
+        "::1",
+        "::2",
+        "::ffff:10.0.0.1",
+    ]
+    for sample in samples:
+        address = ip_address(sample)
+        assert trie.contains(address) == any(address in network for network in networks), sample
+    assert SubnetTrie(_networks("0.0.0.0/0")).contains(ip_address("8.8.8.8"))
+    assert not SubnetTrie().contains(ip_address("8.8.8.8"))
+
+
+def test_policy_classifies_hosts_and_bounds_decision_cache() -> None:
+    policy = GatewayPolicy(_networks("10.0.0.0/8"), allow_loopback=True, cache_size=2)
+
+    assert policy.classify("10.0.0.5") == TRUSTED
+    assert policy.classify("10.0.0.5") == TRUSTED
+    assert policy.classify("127.0.0.1") == ALLOW
+    assert policy.classify("testclient") == ALLOW
+    assert policy.classify("203.0.113.7") == "untrusted_source"
+    assert policy.classify("not-an-ip") == "invalid_client_ip"
+    assert policy.hits == 1
+    assert list(policy._decisions) == ["203.0.113.7", "not-an-ip"]
+
+    strict = GatewayPolicy([], allow_loopback=False)
+    assert strict.classify("127.0.0.1") == "no_trusted_networks"
+    assert strict.classify("localhost") == "invalid_client_ip"
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from atticus import tokenization
+from core.config import AppSettings
+from retriever.generator import GeneratorClient
+
+
+class _CountingEncoding:
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+        self.encoded: list[str] = []
+        self.batches = 0
+
+    def encode(self, text: str, **kwargs: Any) -> list[int]:
+        self.encoded.append(text)
+        return self.inner.encode(text, **kwargs)
+
+    def encode_batch(self, texts: list[str], **kwargs: Any) -> list[list[int]]:
+        self.batches += 1
+        self.encoded.extend(texts)
+        return self.inner.encode_batch(texts, **kwargs)
+
+    def decode(self, tokens: list[int]) -> str:
+        return self.inner.decode(tokens)
+
+
+@pytest.fixture
+def encoding(monkeypatch: pytest.MonkeyPatch) -> Iterator[_CountingEncoding]:
+    counting = _CountingEncoding(tokenization._encoding())
+    monkeypatch.setattr(tokenization, "_encoding", lambda: counting)
+    tokenization.reset_token_count_cache()
+    yield counting
+    tokenization.reset_token_count_cache()
+
+
+def test_token_counts_are_memoized_and_batched(encoding: _CountingEncoding) -> None:
+    question = "How many pages per minute does the Apeos C4570 print?"
+    expected = len(encoding.inner.encode(question, disallowed_special=()))
+
+    assert tokenization.count_tokens(question) == expected
+    assert tokenization.count_tokens(question) == expected
+    assert tokenization.truncate_text(question, expected) == question
+    assert encoding.encoded == [question]
+    # The memo is keyed by digest, so it does not keep the texts it has counted alive.
+    assert all(
+        not isinstance(part, str) for key in tokenization._TOKEN_COUNTS._entries for part in key
+    )
+
+    texts = [question, "Designed AMPV 20,000 pages", "", "Tray 1 holds 500 sheets"]
+    counts = tokenization.count_tokens_batch(texts)
+    assert counts == [len(encoding.inner.encode(text, disallowed_special=())) for text in texts]
+    assert encoding.batches == 1
+    assert encoding.encoded[1:] == ["Designed AMPV 20,000 pages", "Tray 1 holds 500 sheets"]
+
+
+def test_trim_context_window_reuses_ingest_token_counts(encoding: _CountingEncoding) -> None:
+    generator = GeneratorClient(AppSettings(), logging.getLogger("atticus.test.tokenization"))
+    first, second = "Apeos C7070 specs\nDesigned AMPV 20,000 pages", "Duplex scanning " * 40
+    tokenization.remember_token_count(first, 5)
+    tokenization.remember_token_count(second, 100)
+
+    trimmed = generator._trim_context_window([first, second], available_tokens=10)
+
+    assert trimmed[0] == first
+    assert len(trimmed) == 2
+    assert len(encoding.inner.encode(trimmed[1], disallowed_special=())) <= 5
+    # Only the block that had to be cut was tokenized.
+    assert encoding.encoded == [second]
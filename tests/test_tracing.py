@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+from atticus.config import AppSettings
+from atticus.stages import LEXICAL_STAGE, stage
+from atticus.tracing import _exporter_for, set_span_attributes, span, start_trace, traced
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@traced("test.search")
+def _search() -> int:
+    set_span_attributes(results=3)
+    with stage(LEXICAL_STAGE):
+        pass
+    return 3
+
+
+def test_spans_are_logged_and_exported_as_otlp_json(tmp_path: Path) -> None:
+    export_path = tmp_path / "traces.otlp.jsonl"
+    settings = AppSettings(
+        TRACING_ENABLED=True, TRACING_EXPORT_PATH=str(export_path), TRACING_SAMPLE_RATE=1.0
+    )
+    logger = logging.getLogger("atticus.test_tracing")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    try:
+        with start_trace("GET /ask", trace_id="req-123", settings=settings, logger=logger) as root:
+            assert root is not None
+            assert _search() == 3
+    finally:
+        logger.removeHandler(handler)
+    _exporter_for(export_path).flush()
+
+    logged = [record.extra_payload for record in handler.records]  # type: ignore[attr-defined]
+    assert {item["span"] for item in logged} == {"GET /ask", "test.search", "stage.lexical"}
+    assert all(item["trace_id"] == "req-123" for item in logged)
+
+    (line,) = export_path.read_text(encoding="utf-8").splitlines()
+    spans = {
+        item["name"]: item
+        for item in json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    }
+    root_span, search_span, stage_span = (
+        spans["GET /ask"],
+        spans["test.search"],
+        spans["stage.lexical"],
+    )
+    assert len({item["traceId"] for item in spans.values()}) == 1
+    assert len(root_span["traceId"]) == 32
+    assert "parentSpanId" not in root_span
+    assert search_span["parentSpanId"] == root_span["spanId"]
+    assert stage_span["parentSpanId"] == search_span["spanId"]
+    assert {"key": "results", "value": {"intValue": "3"}} in search_span["attributes"]
+    assert int(search_span["endTimeUnixNano"]) >= int(search_span["startTimeUnixNano"])
+
+
+def test_disabled_tracing_records_nothing(tmp_path: Path) -> None:
+    export_path = tmp_path / "traces.otlp.jsonl"
+    settings = AppSettings(TRACING_ENABLED=False, TRACING_EXPORT_PATH=str(export_path))
+
+    with start_trace("GET /ask", trace_id="req-1", settings=settings) as root:
+        assert root is None
+        with span("retriever.search") as child:
+            assert child is None
+        assert _search() == 3
+
+    assert not export_path.exists()
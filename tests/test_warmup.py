@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.warmup as warmup_module
+from api.main import app
+from api.warmup import Warmup, recent_questions
+from atticus.config import AppSettings
+from atticus.logging import configure_logging
+
+NOW = datetime(2025, 10, 20, 12, 0, tzinfo=UTC).timestamp()
+
+
+def _write_log(path: Path, records: list[tuple[float, dict[str, object]]]) -> None:
+    lines = [
+        json.dumps(
+            {"timestamp": datetime.fromtimestamp(ts, UTC).isoformat(), "message": event} | record
+        )
+        for ts, record in records
+        for event in [str(record["event"])]
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _settings(tmp_path: Path, **overrides: object) -> AppSettings:
+    return AppSettings().model_copy(
+        update={
+            "logs_path": tmp_path / "app.jsonl",
+            "log_index_enabled": False,
+            "openai_api_key": None,
+            "database_url": None,
+            **overrides,
+        }
+    )
+
+
+def test_recent_questions_rank_chat_turns_within_the_lookback(tmp_path: Path) -> None:
+    hour = 3600.0
+    _write_log(
+        tmp_path / "app.jsonl",
+        [
+            (NOW - 30 * hour, {"event": "chat_turn", "question": "What is the AMPV?"}),
+            (NOW - 30 * hour, {"event": "chat_turn", "question": "What is the AMPV?"}),
+            (NOW - 5 * hour, {"event": "chat_turn", "question": "How many sheets in Tray 1?"}),
+            (NOW - 4 * hour, {"event": "retrieval_query", "query": "Unrelated query text"}),
+            (NOW - 3 * hour, {"event": "chat_turn", "question": "What toner fits the C7070?"}),
+            (NOW - 2 * hour, {"event": "chat_turn", "question": "how many sheets in tray 1"}),
+            (NOW - 1 * hour, {"event": "chat_turn", "question": "hi?"}),
+        ],
+    )
+    settings = _settings(tmp_path)
+
+    assert recent_questions(settings, 5, now=NOW) == [
+        "how many sheets in tray 1",
+        "What toner fits the C7070?",
+    ]
+    assert recent_questions(settings, 1, now=NOW) == ["how many sheets in tray 1"]
+    assert recent_questions(settings, 0, now=NOW) == []
+
+
+def test_recent_questions_fall_back_to_retrieval_queries(tmp_path: Path) -> None:
+    focus = "\n\nFocus only on information relevant to C7070. Answer as if the user asked."
+    _write_log(
+        tmp_path / "app.jsonl",
+        [
+            (NOW - 60, {"event": "retrieval_query", "query": "Compare C7070 and C8180" + focus}),
+            (NOW - 50, {"event": "retrieval_query", "query": "Compare C7070 and C8180"}),
+            (NOW - 40, {"event": "retrieval_query", "query": "Duplex speed?"}),
+        ],
+    )
+
+    assert recent_questions(_settings(tmp_path), 5, now=NOW) == [
+        "Compare C7070 and C8180",
+        "Duplex speed?",
+    ]
+
+
+def test_warmup_runs_every_step_and_replays_recent_questions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write_log(
+        tmp_path / "app.jsonl",
+        [(0.0, {"event": "chat_turn", "question": "How many sheets in Tray 1?"})],
+    )
+    settings = _settings(tmp_path, openai_api_key="sk-test", warmup_replay_lookback_hours=1e9)
+    replayed: list[str] = []
+
+    def fake_replay(question: str, **_: object) -> bool:
+        replayed.append(question)
+        return True
+
+    monkeypatch.setattr(warmup_module, "replay_question", fake_replay)
+    warmup = Warmup(settings, configure_logging(settings))
+    assert not warmup.ready
+    warmup.run()
+
+    assert warmup.ready
+    statuses = {step.name: step.status for step in warmup.steps}
+    assert list(statuses) == [
+        "tokenizer",
+        "model_catalog",
+        "glossary",
+        "manifest",
+        "answer_cache",
+        "retrieval",
+        "replay",
+    ]
+    assert statuses["tokenizer"] == statuses["model_catalog"] == "ok"
+    assert statuses["retrieval"] == "skipped"
+    assert statuses["replay"] == "ok"
+    assert replayed == ["How many sheets in Tray 1?"]
+
+
+def test_ready_returns_503_until_warmup_completes() -> None:
+    with TestClient(app) as client:
+        warmup = client.app.state.warmup
+        assert warmup.wait(timeout=30)
+        ready = client.get("/ready")
+        assert ready.status_code == 200
+        body = ready.json()
+        assert body["ready"] is True
+        assert body["steps"][0]["name"] == "tokenizer"
+        assert client.get("/health").json()["status"] == "ok"
+
+        client.app.state.warmup = Warmup(warmup.settings, warmup.logger)
+        pending = client.get("/ready")
+        assert pending.status_code == 503
+        assert pending.json() == {
+            "status": "warming",
+            "ready": False,
+            "duration_ms": None,
+            "steps": [],
+        }